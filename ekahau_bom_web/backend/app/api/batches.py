@@ -5,11 +5,14 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import os
+from array import array
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 from uuid import UUID
-from collections import defaultdict
+from collections import Counter
 
 from fastapi import (
     APIRouter,
@@ -34,6 +37,7 @@ from app.models import (
     DirectoryScanResponse,
     ProcessingRequest,
     ScannedFile,
+    utc_now,
 )
 from app.services.batch_service import batch_service
 from app.services.storage_service import StorageService
@@ -41,6 +45,7 @@ from app.services.index import index_service
 from app.services.watch_service import get_watch_service, WatchConfig
 from app.services.report_schedule_service import get_report_schedule_service, TimeRange
 from app.services.batch_archive_service import get_batch_archive_service
+from app.utils.scan import scan_files
 from app.websocket import connection_manager
 
 logger = logging.getLogger(__name__)
@@ -127,6 +132,9 @@ async def upload_batch(
     files_uploaded = []
     files_failed = []
 
+    # One upload timestamp for every file in this request
+    upload_date = utc_now()
+
     # Upload each file and add to batch
     for file in files:
         if not file.filename or not file.filename.endswith(".esx"):
@@ -164,12 +172,11 @@ async def upload_batch(
                 )
 
                 # Update metadata
-                from datetime import UTC, datetime
                 from app.models import ProcessingStatus
 
                 metadata.filename = file.filename
                 metadata.file_size = len(file_content)
-                metadata.upload_date = datetime.now(UTC)
+                metadata.upload_date = upload_date
                 metadata.processing_status = ProcessingStatus.PENDING
                 metadata.processing_started = None
                 metadata.processing_completed = None
@@ -227,6 +234,7 @@ async def upload_batch(
                     original_file=file_path,  # Already a string path
                     processing_status=ProcessingStatus.PENDING,
                     project_name=project_name,
+                    upload_date=upload_date,
                     short_link=short_link,
                     short_link_expires=short_link_expires,
                 )
@@ -253,7 +261,7 @@ async def upload_batch(
 
     # Save index to disk
     if files_uploaded:
-        index_service.save_to_disk()
+        await index_service.save_to_disk_async()
 
     # Broadcast batch created notification
     await connection_manager.send_batch_created(batch_metadata.batch_id)
@@ -541,6 +549,64 @@ async def delete_batch(batch_id: UUID) -> dict:
     return {"message": f"Batch {batch_id} deleted successfully"}
 
 
+@dataclass(slots=True)
+class _ScannedFiles:
+    """Column-wise scan results: one entry per .esx file at the same index."""
+
+    filenames: list[str] = field(default_factory=list)
+    filepaths: list[str] = field(default_factory=list)
+    filesizes: array = field(default_factory=lambda: array("q"))
+    modified_times: array = field(default_factory=lambda: array("d"))  # epoch seconds
+    subdirectories: int = 0
+
+    def to_models(self) -> list[ScannedFile]:
+        """Build ScannedFile models sorted by filename (case-insensitive)."""
+        names = self.filenames
+        order = sorted(range(len(names)), key=lambda i: names[i].lower())
+        return [
+            ScannedFile(
+                filename=names[i],
+                filepath=self.filepaths[i],
+                filesize=self.filesizes[i],
+                modified_date=datetime.fromtimestamp(self.modified_times[i]),
+            )
+            for i in order
+        ]
+
+
+def _scan_esx_files(directory: Path, recursive: bool) -> _ScannedFiles:
+    """Collect .esx files under a directory in a single os.scandir walk.
+
+    Unreadable subdirectories are skipped (see scan_files()).
+
+    Args:
+        directory: Directory to scan
+        recursive: Whether to descend into subdirectories (symlinked
+            directories are counted but not followed)
+
+    Returns:
+        Scan results as parallel columns
+    """
+    result = _ScannedFiles()
+
+    def _count_subdirectory(entry: os.DirEntry) -> None:
+        result.subdirectories += 1
+
+    for entry in scan_files(
+        directory.absolute(),
+        lambda name: name.endswith(".esx"),
+        recursive,
+        on_subdirectory=_count_subdirectory,
+    ):
+        stat = entry.stat()
+        result.filenames.append(entry.name)
+        result.filepaths.append(entry.path)
+        result.filesizes.append(stat.st_size)
+        result.modified_times.append(stat.st_mtime)
+
+    return result
+
+
 @router.post(
     "/scan-directory", response_model=DirectoryScanResponse, dependencies=[Depends(verify_admin)]
 )
@@ -557,9 +623,6 @@ async def scan_directory(
     Returns:
         DirectoryScanResponse with list of found .esx files
     """
-    from pathlib import Path
-    from datetime import datetime
-
     try:
         directory = Path(directory_path)
 
@@ -572,42 +635,9 @@ async def scan_directory(
                 status_code=400, detail=f"Path is not a directory: {directory_path}"
             )
 
-        # Scan for .esx files
-        scanned_files: list[ScannedFile] = []
-        subdirs_scanned = 0
-
-        if recursive:
-            # Recursive scan
-            for esx_file in directory.rglob("*.esx"):
-                if esx_file.is_file():
-                    stat = esx_file.stat()
-                    scanned_files.append(
-                        ScannedFile(
-                            filename=esx_file.name,
-                            filepath=str(esx_file.absolute()),
-                            filesize=stat.st_size,
-                            modified_date=datetime.fromtimestamp(stat.st_mtime),
-                        )
-                    )
-
-            # Count subdirectories
-            subdirs_scanned = sum(1 for _ in directory.rglob("*") if _.is_dir())
-        else:
-            # Non-recursive scan (current directory only)
-            for esx_file in directory.glob("*.esx"):
-                if esx_file.is_file():
-                    stat = esx_file.stat()
-                    scanned_files.append(
-                        ScannedFile(
-                            filename=esx_file.name,
-                            filepath=str(esx_file.absolute()),
-                            filesize=stat.st_size,
-                            modified_date=datetime.fromtimestamp(stat.st_mtime),
-                        )
-                    )
-
-        # Sort by filename
-        scanned_files.sort(key=lambda x: x.filename.lower())
+        # Scan for .esx files; models are only built for the response
+        scanned = _scan_esx_files(directory, recursive)
+        scanned_files = scanned.to_models()
 
         logger.info(
             f"Scanned directory {directory_path} (recursive={recursive}): "
@@ -618,7 +648,7 @@ async def scan_directory(
             directory=directory_path,
             total_files=len(scanned_files),
             files=scanned_files,
-            subdirectories_scanned=subdirs_scanned,
+            subdirectories_scanned=scanned.subdirectories,
         )
 
     except HTTPException:
@@ -682,6 +712,9 @@ async def import_from_paths(
     files_uploaded = []
     files_failed = []
 
+    # One upload timestamp for every imported file
+    upload_date = utc_now()
+
     # Import each file from server path
     for file_path_str in import_request.file_paths:
         file_path = Path(file_path_str)
@@ -738,6 +771,7 @@ async def import_from_paths(
                 original_file=saved_path,  # Already a string path
                 processing_status=ProcessingStatus.PENDING,
                 project_name=project_name,
+                upload_date=upload_date,
                 short_link=short_link,
                 short_link_expires=short_link_expires,
             )
@@ -764,7 +798,7 @@ async def import_from_paths(
 
     # Save index to disk
     if files_uploaded:
-        index_service.save_to_disk()
+        await index_service.save_to_disk_async()
 
     # Schedule batch processing in background if auto_process is True
     if files_uploaded and import_request.auto_process and proc_options:
@@ -978,16 +1012,14 @@ async def get_vendor_analysis(
     report_data = report_schedule_service.generate_aggregated_report(time_range=time_range)
 
     # Calculate vendor totals (sum all models for each vendor)
-    vendor_totals = defaultdict(int)
+    vendor_totals: Counter[str] = Counter()
     for vendor_model, quantity in report_data.ap_by_vendor_model.items():
         vendor = vendor_model.split("|")[0] if "|" in vendor_model else "Unknown"
         vendor_totals[vendor] += quantity
 
-    # Sort by quantity
-    top_vendors = sorted(vendor_totals.items(), key=lambda x: x[1], reverse=True)
-    top_models = sorted(report_data.ap_by_vendor_model.items(), key=lambda x: x[1], reverse=True)[
-        :20
-    ]
+    # Sort by quantity (only the top 20 models are selected, not fully sorted)
+    top_vendors = vendor_totals.most_common()
+    top_models = report_data.ap_by_vendor_model.most_common(20)
 
     return {
         "time_range": time_range,
@@ -5,7 +5,7 @@ from __future__ import annotations
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 
 from app.auth import verify_admin
 from app.models import ProcessingStatus, ProjectListItem, ProjectMetadata
@@ -39,32 +39,21 @@ async def list_projects(
         search: Optional search query for project name or filename
 
     Returns:
-        List of projects (cached for 5 min if no filters)
+        List of projects (list items are served from per-project cached JSON
+        unless searching)
     """
-    # Only cache if no filters/search/limit (most common case)
-    use_cache = not search and not status and not limit
-
-    if use_cache:
-        # Try to get from cache
-        cached = cache_service.get_projects()
-        if cached is not None:
-            return cached
-
-    # Fetch from index service
     if search:
         # Search by query
         projects = index_service.search(search)
         if limit:
             projects = projects[:limit]
-    else:
-        # List all with optional filters
-        projects = index_service.list_all(status=status, limit=limit)
-
-    # Cache only if no filters
-    if use_cache:
-        cache_service.set_projects(projects)
+        return projects
 
-    return projects
+    # List all with optional filters; bytes are invalidated per project on change
+    return Response(
+        content=index_service.list_all_json(status=status, limit=limit),
+        media_type="application/json",
+    )
 
 
 @router.get("/{project_id}", response_model=ProjectMetadata)
@@ -75,26 +64,27 @@ async def get_project(project_id: UUID) -> ProjectMetadata:
         project_id: Project UUID
 
     Returns:
-        Project metadata (cached for 10 min)
+        Project metadata (serialized JSON cached for 10 min)
     """
     # Ensure project is unarchived before access
-    if not archive_service.ensure_unarchived(project_id):
+    if not await archive_service.ensure_unarchived_async(project_id):
         raise HTTPException(status_code=503, detail="Failed to unarchive project")
 
-    # Try to get from cache
+    # Try to get from cache; hits skip model rebuild and re-serialization
     cached = cache_service.get_project_details(project_id)
     if cached is not None:
-        return ProjectMetadata(**cached)
+        return Response(content=cached, media_type="application/json")
 
     # Fetch from storage
     metadata = storage_service.load_metadata(project_id)
     if not metadata:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    # Cache the result
-    cache_service.set_project_details(project_id, metadata.model_dump())
+    # Serialize once and cache the bytes
+    body = metadata.model_dump_json().encode("utf-8")
+    cache_service.set_project_details(project_id, body)
 
-    return metadata
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/short/{short_link}", response_model=ProjectMetadata)
@@ -116,7 +106,7 @@ async def get_project_by_short_link(short_link: str) -> ProjectMetadata:
         raise HTTPException(status_code=410, detail="Short link has expired")
 
     # Ensure project is unarchived before access
-    if not archive_service.ensure_unarchived(metadata.project_id):
+    if not await archive_service.ensure_unarchived_async(metadata.project_id):
         raise HTTPException(status_code=503, detail="Failed to unarchive project")
 
     return metadata
@@ -141,7 +131,7 @@ async def delete_project(project_id: UUID, _admin: str = Depends(verify_admin))
 
     # Remove from index
     index_service.remove(project_id)
-    index_service.save_to_disk()
+    await index_service.save_to_disk_async()
 
     # Delete files
     storage_service.delete_project(project_id)
@@ -213,7 +203,7 @@ async def renew_short_link(
     # Save metadata
     storage_service.save_metadata(project_id, metadata)
     index_service.add(metadata)
-    index_service.save_to_disk()
+    await index_service.save_to_disk_async()
 
     # Invalidate cache
     cache_service.invalidate_project(project_id)
@@ -256,7 +246,7 @@ async def create_short_link(
     # Save metadata
     storage_service.save_metadata(project_id, metadata)
     index_service.add(metadata)
-    index_service.save_to_disk()
+    await index_service.save_to_disk_async()
 
     # Invalidate cache
     cache_service.invalidate_project(project_id)
@@ -295,7 +285,7 @@ async def delete_short_link(project_id: UUID, _admin: str = Depends(verify_admin
     # Save metadata
     storage_service.save_metadata(project_id, metadata)
     index_service.add(metadata)
-    index_service.save_to_disk()
+    await index_service.save_to_disk_async()
 
     # Invalidate cache
     cache_service.invalidate_project(project_id)
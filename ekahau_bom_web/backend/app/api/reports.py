@@ -32,7 +32,7 @@ async def list_reports(project_id: UUID) -> dict:
         Dictionary with lists of reports and visualizations (cached for 15 min)
     """
     # Ensure project is unarchived before access
-    if not archive_service.ensure_unarchived(project_id):
+    if not await archive_service.ensure_unarchived_async(project_id):
         raise HTTPException(status_code=503, detail="Failed to unarchive project")
 
     # Try to get from cache
@@ -80,7 +80,7 @@ async def download_report(
         File download response or 304 Not Modified
     """
     # Ensure project is unarchived before access
-    if not archive_service.ensure_unarchived(project_id):
+    if not await archive_service.ensure_unarchived_async(project_id):
         raise HTTPException(status_code=503, detail="Failed to unarchive project")
 
     # Check if project exists
@@ -149,7 +149,7 @@ async def get_visualization(
         Image file response or 304 Not Modified
     """
     # Ensure project is unarchived before access
-    if not archive_service.ensure_unarchived(project_id):
+    if not await archive_service.ensure_unarchived_async(project_id):
         raise HTTPException(status_code=503, detail="Failed to unarchive project")
 
     # Check if project exists
@@ -209,7 +209,7 @@ async def get_visualization_thumbnail(
         GET /api/reports/{id}/visualization/floor1.png/thumb?size=small
     """
     # Ensure project is unarchived before access
-    if not archive_service.ensure_unarchived(project_id):
+    if not await archive_service.ensure_unarchived_async(project_id):
         raise HTTPException(status_code=503, detail="Failed to unarchive project")
 
     # Check if project exists
@@ -260,7 +260,7 @@ async def download_original(
         File download response or 304 Not Modified
     """
     # Ensure project is unarchived before access
-    if not archive_service.ensure_unarchived(project_id):
+    if not await archive_service.ensure_unarchived_async(project_id):
         raise HTTPException(status_code=503, detail="Failed to unarchive project")
 
     # Check if project exists
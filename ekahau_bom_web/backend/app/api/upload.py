@@ -142,7 +142,7 @@ async def upload_file(
 
     # Add to index
     index_service.add(metadata)
-    index_service.save_to_disk()
+    await index_service.save_to_disk_async()
 
     # Invalidate projects list cache (new project added)
     cache_service.invalidate_projects_list()
@@ -236,7 +236,7 @@ async def update_project(
 
     # Update index
     index_service.add(metadata)  # add() also updates existing entries
-    index_service.save_to_disk()
+    await index_service.save_to_disk_async()
 
     # Invalidate cache (project updated)
     cache_service.invalidate_project(project_uuid)
@@ -12,9 +12,8 @@ from fastapi import HTTPException, Security, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from app.config import settings
-from .base import AuthProvider, UserInfo, TokenResponse
+from .base import AuthProvider, UserInfo, TokenResponse, generate_state
 from .simple import SimpleAuthProvider
-from .oauth2 import OAuth2AuthProvider, generate_state
 
 # Re-export for convenience
 __all__ = [
@@ -36,6 +35,18 @@ __all__ = [
 security = HTTPBearer()
 
 
+def __getattr__(name: str):
+    """Import the OAuth2 provider on first access.
+
+    The OAuth2 module pulls in httpx, which simple-auth deployments never use.
+    """
+    if name == "OAuth2AuthProvider":
+        from .oauth2 import OAuth2AuthProvider
+
+        return OAuth2AuthProvider
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 @lru_cache()
 def get_auth_provider() -> AuthProvider:
     """Get the configured authentication provider.
@@ -50,6 +61,8 @@ def get_auth_provider() -> AuthProvider:
     backend = getattr(settings, "auth_backend", "simple")
 
     if backend == "oauth2":
+        from .oauth2 import OAuth2AuthProvider
+
         return OAuth2AuthProvider()
     else:
         return SimpleAuthProvider()
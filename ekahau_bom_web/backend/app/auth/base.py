@@ -3,6 +3,7 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from typing import Optional
+import secrets
 
 
 @dataclass
@@ -120,3 +121,8 @@ class AuthProvider(ABC):
     def supports_oauth2(self) -> bool:
         """Check if this provider supports OAuth2 flow."""
         return False
+
+
+def generate_state() -> str:
+    """Generate a secure random state for CSRF protection."""
+    return secrets.token_urlsafe(32)
@@ -1,15 +1,20 @@
 """OAuth2/OIDC authentication provider (Keycloak, Azure AD, Okta, etc.)."""
 
+import asyncio
+import time
 from datetime import datetime, timedelta, UTC
 from typing import Optional
 from urllib.parse import urlencode
-import secrets
 
 import httpx
 import jwt
 
 from app.config import settings
-from .base import AuthProvider, UserInfo, TokenResponse
+from .base import AuthProvider, UserInfo, TokenResponse, generate_state  # noqa: F401
+from .tokens import InvalidTokenCache, encode_jwt
+
+# Minimum seconds between JWKS refreshes forced by an unknown key ID
+JWKS_REFRESH_INTERVAL = 60.0
 
 
 class OAuth2AuthProvider(AuthProvider):
@@ -52,6 +57,10 @@ class OAuth2AuthProvider(AuthProvider):
         # OIDC endpoints (will be discovered from issuer)
         self._oidc_config: Optional[dict] = None
         self._jwks: Optional[dict] = None
+        self._jwks_etag: Optional[str] = None
+        self._jwks_refresh_lock = asyncio.Lock()
+        self._jwks_refreshed_at: Optional[float] = None  # monotonic time of last forced refresh
+        self._invalid_tokens = InvalidTokenCache()
 
     @property
     def provider_name(self) -> str:
@@ -72,20 +81,49 @@ class OAuth2AuthProvider(AuthProvider):
             self._oidc_config = response.json()
             return self._oidc_config
 
-    async def _get_jwks(self) -> dict:
-        """Fetch JWKS (JSON Web Key Set) for token validation."""
-        if self._jwks is not None:
+    async def _get_jwks(self, refresh: bool = False) -> dict:
+        """Fetch JWKS (JSON Web Key Set) for token validation.
+
+        Args:
+            refresh: Revalidate the cached key set with the IdP. When an ETag
+                was returned previously it is sent as If-None-Match, so an
+                unchanged key set costs a bodiless 304 response.
+        """
+        if self._jwks is not None and not refresh:
             return self._jwks
 
         config = await self._get_oidc_config()
         jwks_uri = config.get("jwks_uri")
 
+        headers = {}
+        if self._jwks is not None and self._jwks_etag:
+            headers["If-None-Match"] = self._jwks_etag
+
         async with httpx.AsyncClient() as client:
-            response = await client.get(jwks_uri)
+            response = await client.get(jwks_uri, headers=headers)
+            if response.status_code == 304 and self._jwks is not None:
+                return self._jwks
             response.raise_for_status()
             self._jwks = response.json()
+            self._jwks_etag = response.headers.get("etag")
             return self._jwks
 
+    async def _refresh_jwks(self) -> dict:
+        """Revalidate the JWKS after a key ID miss, at most once per JWKS_REFRESH_INTERVAL.
+
+        Concurrent misses wait on one lock and share a single fetch, so tokens
+        with made-up key IDs cannot make every request query the IdP.
+        """
+        async with self._jwks_refresh_lock:
+            now = time.monotonic()
+            if (
+                self._jwks_refreshed_at is not None
+                and now - self._jwks_refreshed_at < JWKS_REFRESH_INTERVAL
+            ):
+                return await self._get_jwks()
+            self._jwks_refreshed_at = now
+            return await self._get_jwks(refresh=True)
+
     async def authenticate(self, username: str, password: str) -> Optional[UserInfo]:
         """Not supported for OAuth2 - use OAuth2 flow instead.
 
@@ -103,6 +141,9 @@ class OAuth2AuthProvider(AuthProvider):
         Returns:
             UserInfo if token is valid, None otherwise
         """
+        if token in self._invalid_tokens:
+            return None
+
         # First try to validate as internal JWT
         try:
             payload = jwt.decode(token, self.jwt_secret, algorithms=[self.jwt_algorithm])
@@ -121,26 +162,41 @@ class OAuth2AuthProvider(AuthProvider):
 
         # If internal JWT validation fails, try IdP token validation
         try:
-            return await self._validate_idp_token(token)
+            user = await self._validate_idp_token(token)
         except Exception:
+            # IdP unreachable or erroring: reject this request, but do not
+            # remember the token, which may well be valid
             return None
 
+        if user is None:
+            self._invalid_tokens.add(token)
+        return user
+
     async def _validate_idp_token(self, token: str) -> Optional[UserInfo]:
-        """Validate a token from the IdP using JWKS."""
-        try:
-            # Get JWKS for verification
-            jwks = await self._get_jwks()
+        """Validate a token from the IdP using JWKS.
 
-            # Get token header to find the key
+        Returns:
+            UserInfo if the token verifies, None if it does not (bad signature
+            or claims, unknown key ID)
+
+        Raises:
+            Exception: Fetching the OIDC configuration or JWKS failed
+        """
+        try:
+            # Get token header to find the key; only signed IdP tokens have one
             unverified_header = jwt.get_unverified_header(token)
             kid = unverified_header.get("kid")
+            if kid is None or unverified_header.get("alg") != "RS256":
+                return None
+
+            # Get JWKS for verification
+            jwks = await self._get_jwks()
 
-            # Find the key
-            key = None
-            for k in jwks.get("keys", []):
-                if k.get("kid") == kid:
-                    key = jwt.algorithms.RSAAlgorithm.from_jwk(k)
-                    break
+            # Find the key, revalidating the key set in case the IdP rotated keys
+            key = self._find_jwk(jwks, kid)
+            if key is None:
+                jwks = await self._refresh_jwks()
+                key = self._find_jwk(jwks, kid)
 
             if key is None:
                 return None
@@ -168,9 +224,17 @@ class OAuth2AuthProvider(AuthProvider):
                 display_name=name,
                 roles=roles,
             )
-        except Exception:
+        except jwt.InvalidTokenError:
             return None
 
+    @staticmethod
+    def _find_jwk(jwks: dict, kid: Optional[str]):
+        """Return the RSA public key matching ``kid`` from a JWKS, or None."""
+        for k in jwks.get("keys", []):
+            if k.get("kid") == kid:
+                return jwt.algorithms.RSAAlgorithm.from_jwk(k)
+        return None
+
     def _extract_roles(self, token_payload: dict) -> list[str]:
         """Extract roles from IdP token payload.
 
@@ -225,7 +289,7 @@ class OAuth2AuthProvider(AuthProvider):
         if user.display_name:
             to_encode["name"] = user.display_name
 
-        encoded_jwt = jwt.encode(to_encode, self.jwt_secret, algorithm=self.jwt_algorithm)
+        encoded_jwt = encode_jwt(to_encode, self.jwt_secret, self.jwt_algorithm)
 
         return TokenResponse(
             access_token=encoded_jwt,
@@ -337,8 +401,3 @@ class OAuth2AuthProvider(AuthProvider):
 
         except Exception:
             return None
-
-
-def generate_state() -> str:
-    """Generate a secure random state for CSRF protection."""
-    return secrets.token_urlsafe(32)
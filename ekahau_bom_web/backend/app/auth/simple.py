@@ -7,6 +7,7 @@ import jwt
 
 from app.config import settings
 from .base import AuthProvider, UserInfo, TokenResponse
+from .tokens import InvalidTokenCache, encode_jwt
 
 
 class SimpleAuthProvider(AuthProvider):
@@ -31,6 +32,7 @@ class SimpleAuthProvider(AuthProvider):
         self.algorithm = algorithm or settings.jwt_algorithm
         self.expire_minutes = expire_minutes or settings.access_token_expire_minutes
         self.credentials = credentials or {settings.admin_username: settings.admin_password}
+        self._invalid_tokens = InvalidTokenCache()
 
     @property
     def provider_name(self) -> str:
@@ -65,6 +67,9 @@ class SimpleAuthProvider(AuthProvider):
         Returns:
             UserInfo if token is valid, None otherwise
         """
+        if token in self._invalid_tokens:
+            return None
+
         try:
             payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
             username: str = payload.get("sub")
@@ -81,8 +86,10 @@ class SimpleAuthProvider(AuthProvider):
                 roles=roles,
             )
         except jwt.ExpiredSignatureError:
+            self._invalid_tokens.add(token)
             return None
         except jwt.InvalidTokenError:
+            self._invalid_tokens.add(token)
             return None
 
     def create_token(self, user: UserInfo) -> TokenResponse:
@@ -105,7 +112,7 @@ class SimpleAuthProvider(AuthProvider):
         if user.display_name:
             to_encode["name"] = user.display_name
 
-        encoded_jwt = jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
+        encoded_jwt = encode_jwt(to_encode, self.secret_key, self.algorithm)
 
         return TokenResponse(
             access_token=encoded_jwt,
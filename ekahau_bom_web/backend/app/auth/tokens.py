@@ -0,0 +1,71 @@
+"""Token helpers shared by the authentication providers."""
+
+from calendar import timegm
+from datetime import datetime
+from hashlib import sha256
+from threading import RLock
+
+import jwt
+from cachetools import TTLCache
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Registered claims that PyJWT converts from datetime to NumericDate
+_TIME_CLAIMS = ("exp", "iat", "nbf")
+
+
+def encode_jwt(claims: dict, key: str, algorithm: str) -> str:
+    """Encode a JWT, serializing the claims with orjson when it is installed.
+
+    Produces the same token as ``jwt.encode``; with orjson the compact claims
+    JSON is built in C and handed to the JWS layer directly.
+
+    Args:
+        claims: Token claims (datetime values allowed for exp/iat/nbf)
+        key: Signing key
+        algorithm: Signing algorithm
+
+    Returns:
+        Encoded JWT string
+    """
+    if not ORJSON_AVAILABLE:
+        return jwt.encode(claims, key, algorithm=algorithm)
+
+    payload = dict(claims)
+    for claim in _TIME_CLAIMS:
+        value = payload.get(claim)
+        if isinstance(value, datetime):
+            payload[claim] = timegm(value.utctimetuple())
+
+    return jwt.api_jws.encode(orjson.dumps(payload), key, algorithm=algorithm)
+
+
+class InvalidTokenCache:
+    """Short-lived negative cache of tokens that failed validation.
+
+    Replayed or scanner-generated bad tokens are rejected from memory instead
+    of paying for signature verification on every request. Tokens are keyed
+    by a truncated SHA-256 digest so raw tokens are never retained.
+    """
+
+    def __init__(self, maxsize: int = 2000, ttl: float = 5):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = RLock()
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return sha256(token.encode()).hexdigest()[:16]
+
+    def __contains__(self, token: str) -> bool:
+        with self._lock:
+            return self._key(token) in self._cache
+
+    def add(self, token: str) -> None:
+        """Remember a token as invalid for the cache TTL."""
+        with self._lock:
+            self._cache[self._key(token)] = True
@@ -31,8 +31,15 @@ class Settings(BaseSettings):
     s3_verify: bool = True  # Can be False for dev/test (not recommended for prod)
     s3_ca_bundle: str | None = None  # Path to custom CA certificate bundle
 
+    # Where archived batches are written: None keeps them in data/archives,
+    # "s3://bucket/prefix/" streams them straight to object storage
+    batch_archive_sink: str | None = None
+    # Batch archive compression; zstd falls back to gzip without zstandard installed
+    batch_archive_codec: Literal["zstd", "gzip"] = "zstd"
+
     # API
     api_prefix: str = "/api"
+    app_profile: Literal["full", "minimal"] = "full"  # minimal: no comparison/schedules/websocket
     max_upload_size: int = 500 * 1024 * 1024  # 500 MB
 
     # Processing
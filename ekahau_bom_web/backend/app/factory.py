@@ -0,0 +1,158 @@
+"""FastAPI application factory."""
+
+import importlib
+from contextlib import asynccontextmanager
+from typing import Literal
+
+from fastapi import APIRouter, FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.routing import APIRoute
+from starlette.routing import NoMatchFound
+
+from app.config import settings
+from app.middleware import ResponseTimeMiddleware
+from app.responses import get_default_response_class
+from app.services.archive import archive_service
+from app.services.index import index_service
+from app.services.scheduler_service import scheduler_service
+from app.services.batch_service import batch_service
+from app.services.storage_service import storage_service
+from app.services.notification_service import notification_service
+
+AppProfile = Literal["full", "minimal"]
+
+# Routers are given as (module, attribute) and imported only when mounted,
+# so a profile never pays the import cost of routers it leaves out.
+
+# Routers mounted under settings.api_prefix in every profile
+CORE_ROUTERS: tuple[tuple[str, str], ...] = (
+    ("app.api.upload", "router"),
+    ("app.api.projects", "router"),
+    ("app.api.reports", "router"),
+    ("app.api.notes", "router"),
+    ("app.api.batches", "router"),
+    ("app.api.templates", "router"),
+)
+
+# Routers only mounted in the "full" profile
+OPTIONAL_ROUTERS: tuple[tuple[str, str], ...] = (
+    ("app.api.comparison", "router"),
+    ("app.api.schedules", "router"),
+    ("app.api.websocket", "router"),  # WebSocket at /api/ws
+)
+
+
+def load_router(module: str, attr: str = "router") -> APIRouter:
+    """Import a router module and return its router."""
+    return getattr(importlib.import_module(module), attr)
+
+
+def warm_routes(app: FastAPI) -> None:
+    """Build every route's matching state before the first request.
+
+    Newer FastAPI releases resolve routes of included routers (prefixed path
+    regexes, dependency contexts) lazily on first match; a reverse lookup of
+    an unknown name walks, and therefore builds, all of them up front. On
+    releases that build routes eagerly this is a cheap no-op walk.
+    """
+    try:
+        app.url_path_for("__warm_routes__")
+    except NoMatchFound:
+        pass
+
+    for route in app.routes:
+        if isinstance(route, APIRoute):
+            _ = route.path_regex, route.dependant, route.response_field
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Lifespan events - startup and shutdown."""
+    # Startup: Move route compilation off the first request
+    warm_routes(app)
+
+    # Load index from disk
+    settings.projects_dir.mkdir(parents=True, exist_ok=True)
+    settings.index_file.parent.mkdir(parents=True, exist_ok=True)
+
+    await index_service.load_from_disk_async()
+    print(f"Loaded {index_service.count()} projects from index")
+
+    # Finish deleting directories of projects archived, and batches deleted,
+    # just before a crash
+    archive_service.remove_stale_dirs()
+    batch_service.remove_stale_dirs()
+
+    # Inject services into scheduler for batch processing
+    scheduler_service.set_services(
+        batch_service=batch_service,
+        storage_service=storage_service,
+        notification_service=notification_service,
+    )
+    # Start scheduler (now that event loop is running)
+    scheduler_service.start()
+    print("Scheduler services injected and started")
+
+    yield
+
+    # Shutdown: Save index to disk, stop scheduler and close notification connections
+    scheduler_service.shutdown()
+    await index_service.save_to_disk_async()
+    await notification_service.aclose()
+    print("Index saved to disk, scheduler stopped")
+
+
+def create_app(profile: AppProfile | None = None) -> FastAPI:
+    """Build the FastAPI application.
+
+    Args:
+        profile: "full" mounts every router; "minimal" leaves out comparison,
+            schedules and websocket. Defaults to settings.app_profile.
+
+    Returns:
+        Configured FastAPI application
+    """
+    profile = profile or settings.app_profile
+
+    app = FastAPI(
+        title="Ekahau BOM Web API",
+        version="0.1.0",
+        description="Web service for Ekahau BOM processing",
+        default_response_class=get_default_response_class(),
+        lifespan=lifespan,
+    )
+
+    # CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.cors_origins,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    app.add_middleware(ResponseTimeMiddleware)
+
+    # Include API routers
+    app.include_router(load_router("app.api.auth"))  # Auth already has /api/auth prefix
+    routers = CORE_ROUTERS + OPTIONAL_ROUTERS if profile == "full" else CORE_ROUTERS
+    for module, attr in routers:
+        app.include_router(load_router(module, attr), prefix=settings.api_prefix)
+
+    @app.get("/")
+    async def root():
+        """Root endpoint."""
+        return {
+            "message": "Ekahau BOM Web API",
+            "version": "0.1.0",
+            "docs": "/docs",
+        }
+
+    @app.get("/health")
+    async def health():
+        """Health check endpoint."""
+        return {
+            "status": "healthy",
+            "environment": settings.environment,
+        }
+
+    return app
@@ -0,0 +1,36 @@
+"""ASGI middleware for the FastAPI application.
+
+Middleware here is written as plain ASGI callables rather than with
+Starlette's BaseHTTPMiddleware, which allocates Request/Response objects and
+an extra task per request.
+"""
+
+from __future__ import annotations
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class ResponseTimeMiddleware:
+    """Add an ``x-response-time`` header (milliseconds) to HTTP responses."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                headers = list(message.get("headers", []))
+                headers.append((b"x-response-time", f"{elapsed_ms:.2f}ms".encode("latin-1")))
+                message["headers"] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
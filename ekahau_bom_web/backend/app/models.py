@@ -1,11 +1,42 @@
 """Pydantic models for Ekahau BOM Web API."""
 
+import fnmatch
+import re
+from collections import Counter
+from collections.abc import Iterable, Iterator, MutableSequence
 from datetime import UTC, datetime
 from enum import Enum
-from typing import Optional
+from functools import lru_cache
+from typing import Any, Optional
 from uuid import UUID, uuid4
 
-from pydantic import BaseModel, Field
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    GetCoreSchemaHandler,
+    field_serializer,
+    field_validator,
+)
+from pydantic_core import core_schema
+
+
+def utc_now() -> datetime:
+    """Current time in UTC (default factory for timestamp fields).
+
+    Code creating many models at once should call this once and pass the
+    value explicitly so every item shares one timestamp.
+    """
+    return datetime.now(UTC)
+
+
+# Pool of vendor/floor names: the same few names repeat across every project
+_NAME_POOL: dict[str, str] = {}
+
+
+def intern_names(names: Iterable[str]) -> tuple[str, ...]:
+    """Return names as a tuple of pooled (shared) string objects."""
+    return tuple(_NAME_POOL.setdefault(name, name) for name in names)
 
 
 class ProcessingStatus(str, Enum):
@@ -22,7 +53,7 @@ class ProjectMetadata(BaseModel):
 
     project_id: UUID = Field(default_factory=uuid4)
     filename: str
-    upload_date: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    upload_date: datetime = Field(default_factory=utc_now)
     file_size: int  # bytes
     processing_status: ProcessingStatus = ProcessingStatus.PENDING
 
@@ -41,8 +72,8 @@ class ProjectMetadata(BaseModel):
     total_antennas: Optional[int] = None
     unique_vendors: Optional[int] = None
     unique_colors: Optional[int] = None
-    vendors: Optional[list[str]] = None
-    floors: Optional[list[str]] = None
+    vendors: Optional[tuple[str, ...]] = None
+    floors: Optional[tuple[str, ...]] = None
 
     # Processing
     processing_flags: dict = {}
@@ -63,6 +94,12 @@ class ProjectMetadata(BaseModel):
     archived: bool = False
     last_accessed: Optional[datetime] = None
 
+    @field_validator("vendors", "floors")
+    @classmethod
+    def _intern_names(cls, value: Optional[tuple[str, ...]]) -> Optional[tuple[str, ...]]:
+        """Share one string object per distinct vendor/floor name across projects."""
+        return intern_names(value) if value else value
+
 
 class ProjectListItem(BaseModel):
     """Project list item for UI."""
@@ -87,14 +124,20 @@ class UploadResponse(BaseModel):
 
 
 class ProcessingRequest(BaseModel):
-    """Request for project processing."""
+    """Request for project processing.
+
+    Frozen so a single default instance can be shared by every batch and
+    template instead of building (and deep-copying) a fresh one each time.
+    """
+
+    model_config = ConfigDict(frozen=True)
 
     group_by: Optional[str] = "model"  # 'model', 'floor', 'color', 'vendor', 'tag', or None
-    output_formats: list[str] = [
+    output_formats: tuple[str, ...] = (
         "csv",
         "excel",
         "html",
-    ]  # ['csv', 'excel', 'html', 'json', 'pdf']
+    )  # ('csv', 'excel', 'html', 'json', 'pdf'); JSON lists are accepted
     visualize_floor_plans: bool = True
     show_azimuth_arrows: bool = False
     ap_opacity: float = 0.6  # 0.0-1.0, default 0.6
@@ -105,6 +148,10 @@ class ProcessingRequest(BaseModel):
     short_link_days: int = 30  # Short link expiration in days (1-365)
 
 
+# Shared default for models that embed processing options
+_DEFAULT_PROCESSING = ProcessingRequest()
+
+
 # ============================================================================
 # Batch Processing Models
 # ============================================================================
@@ -144,9 +191,153 @@ class BatchStatistics(BaseModel):
     total_access_points: int = 0
     total_antennas: int = 0
 
-    # Aggregated BOM (vendor+model -> quantity)
-    ap_by_vendor_model: dict[str, int] = {}  # "Vendor|Model" -> quantity
-    antenna_by_model: dict[str, int] = {}  # "Model" -> quantity
+    # Aggregated BOM (vendor+model -> quantity), merged with Counter.update()
+    ap_by_vendor_model: Counter[str] = Field(default_factory=Counter)  # "Vendor|Model" -> quantity
+    antenna_by_model: Counter[str] = Field(default_factory=Counter)  # "Model" -> quantity
+
+    @field_serializer("ap_by_vendor_model", "antenna_by_model")
+    def _serialize_counter(self, value: Counter[str]) -> dict[str, int]:
+        """Dump counters as plain dicts to keep the wire format unchanged."""
+        return dict(value)
+
+    def accumulate(
+        self,
+        ap_rows: Iterable[tuple[str, str, int]] = (),
+        antenna_rows: Iterable[tuple[str, int]] = (),
+    ) -> None:
+        """Add BOM rows to the vendor/model counters as they are produced.
+
+        Rows can come straight from a report parser, so no per-project
+        intermediate dict is built.
+
+        Args:
+            ap_rows: (vendor, model, quantity) access point rows
+            antenna_rows: (model, quantity) antenna rows
+        """
+        ap_by_vendor_model = self.ap_by_vendor_model
+        for vendor, model, quantity in ap_rows:
+            ap_by_vendor_model[f"{vendor}|{model}"] += quantity
+
+        antenna_by_model = self.antenna_by_model
+        for model, quantity in antenna_rows:
+            antenna_by_model[model] += quantity
+
+
+class PackedUUIDs(MutableSequence[UUID]):
+    """List of UUIDs stored as one packed buffer (16 bytes per id).
+
+    Behaves like ``list[UUID]`` (append, ``in``, indexing, iteration) but
+    avoids a UUID object per entry; UUIDs are materialized on access.
+    Validates from and serializes to a plain list of UUIDs.
+    """
+
+    __slots__ = ("_buf",)
+
+    def __init__(self, ids: Iterable[UUID] = ()):
+        self._buf = bytearray(b"".join(project_id.bytes for project_id in ids))
+
+    def _offset(self, index: int) -> int:
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("PackedUUIDs index out of range")
+        return index * 16
+
+    def _find(self, value: Any) -> int:
+        """Return the position of value, or -1 if absent."""
+        if not isinstance(value, UUID):
+            return -1
+        needle = value.bytes
+        pos = self._buf.find(needle)
+        while pos != -1 and pos % 16:
+            pos = self._buf.find(needle, pos + 1)
+        return -1 if pos == -1 else pos // 16
+
+    def __len__(self) -> int:
+        return len(self._buf) // 16
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        offset = self._offset(index)
+        return UUID(bytes=bytes(self._buf[offset : offset + 16]))
+
+    def __setitem__(self, index, value: UUID) -> None:
+        if isinstance(index, slice):
+            raise TypeError("PackedUUIDs does not support slice assignment")
+        offset = self._offset(index)
+        self._buf[offset : offset + 16] = value.bytes
+
+    def __delitem__(self, index) -> None:
+        if isinstance(index, slice):
+            for i in sorted(range(*index.indices(len(self))), reverse=True):
+                del self[i]
+            return
+        offset = self._offset(index)
+        del self._buf[offset : offset + 16]
+
+    def insert(self, index: int, value: UUID) -> None:
+        offset = min(max(index + len(self) if index < 0 else index, 0), len(self)) * 16
+        self._buf[offset:offset] = value.bytes
+
+    def append(self, value: UUID) -> None:
+        self._buf += value.bytes
+
+    def __iter__(self) -> Iterator[UUID]:
+        buf = bytes(self._buf)
+        for offset in range(0, len(buf), 16):
+            yield UUID(bytes=buf[offset : offset + 16])
+
+    def __contains__(self, value: Any) -> bool:
+        return self._find(value) != -1
+
+    def index(self, value: Any, start: int = 0, stop: Optional[int] = None) -> int:
+        if start == 0 and stop is None:
+            position = self._find(value)
+            if position == -1:
+                raise ValueError(f"{value!r} is not in list")
+            return position
+        return super().index(value, start, stop)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, PackedUUIDs):
+            return self._buf == other._buf
+        if isinstance(other, (list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def copy(self) -> "PackedUUIDs":
+        """Return a shallow copy, like list.copy()."""
+        packed = PackedUUIDs()
+        packed._buf = bytearray(self._buf)
+        return packed
+
+    def __repr__(self) -> str:
+        return f"PackedUUIDs({list(self)!r})"
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls, source: Any, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        from_list = core_schema.no_info_after_validator_function(
+            cls, handler.generate_schema(list[UUID])
+        )
+        return core_schema.json_or_python_schema(
+            json_schema=from_list,
+            python_schema=core_schema.union_schema(
+                [
+                    # Copy like list validation does, so models never share a buffer
+                    core_schema.no_info_after_validator_function(
+                        cls.copy, core_schema.is_instance_schema(cls)
+                    ),
+                    from_list,
+                ]
+            ),
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                list, return_schema=handler.generate_schema(list[UUID])
+            ),
+        )
 
 
 class BatchMetadata(BaseModel):
@@ -154,7 +345,7 @@ class BatchMetadata(BaseModel):
 
     batch_id: UUID = Field(default_factory=uuid4)
     batch_name: Optional[str] = None  # User-provided or auto-generated
-    created_date: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    created_date: datetime = Field(default_factory=utc_now)
     created_by: str = "admin"  # User who created the batch
 
     # Tags for categorization and organization
@@ -166,11 +357,11 @@ class BatchMetadata(BaseModel):
     processing_completed: Optional[datetime] = None
 
     # Projects in batch
-    project_ids: list[UUID] = []
+    project_ids: PackedUUIDs = Field(default_factory=PackedUUIDs)
     project_statuses: list[BatchProjectStatus] = []
 
     # Processing options (inherited by all projects)
-    processing_options: ProcessingRequest = Field(default_factory=lambda: ProcessingRequest())
+    processing_options: ProcessingRequest = _DEFAULT_PROCESSING
 
     # Template tracking (if a template was used)
     template_id: Optional[str] = None
@@ -188,6 +379,11 @@ class BatchMetadata(BaseModel):
     # Archive
     archived: bool = False
     last_accessed: Optional[datetime] = None
+    archived_at: Optional[datetime] = None
+    restored_at: Optional[datetime] = None
+    archive_path: Optional[str] = None
+    archive_size: Optional[int] = None  # bytes
+    original_size: Optional[int] = None  # bytes
 
 
 class BatchListItem(BaseModel):
@@ -260,14 +456,14 @@ class BatchTemplate(BaseModel):
     template_id: UUID = Field(default_factory=uuid4)
     name: str  # Template name (e.g., "CSV Only", "Full Reports")
     description: Optional[str] = None  # Template description
-    created_date: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    created_date: datetime = Field(default_factory=utc_now)
     created_by: str = "admin"  # User who created the template
     last_used: Optional[datetime] = None  # Last time template was applied
     usage_count: int = 0  # Number of times template has been used
     is_system: bool = False  # True for predefined templates, False for user-created
 
     # Processing configuration
-    processing_options: ProcessingRequest = Field(default_factory=lambda: ProcessingRequest())
+    processing_options: ProcessingRequest = _DEFAULT_PROCESSING
     parallel_workers: int = Field(default=1, ge=1, le=8)  # Default parallel workers
 
 
@@ -288,7 +484,7 @@ class TemplateCreateRequest(BaseModel):
 
     name: str = Field(..., min_length=1, max_length=100)
     description: Optional[str] = Field(None, max_length=500)
-    processing_options: ProcessingRequest = Field(default_factory=lambda: ProcessingRequest())
+    processing_options: ProcessingRequest = _DEFAULT_PROCESSING
     parallel_workers: int = Field(default=1, ge=1, le=8)
 
 
@@ -323,6 +519,12 @@ class ScheduleStatus(str, Enum):
     RUNNING = "running"  # Currently executing
 
 
+@lru_cache(maxsize=128)
+def _compile_file_pattern(pattern: str) -> re.Pattern[str]:
+    """Compile a shell-style file pattern once per distinct pattern."""
+    return re.compile(fnmatch.translate(pattern))
+
+
 class TriggerConfig(BaseModel):
     """Trigger-specific configuration."""
 
@@ -333,6 +535,11 @@ class TriggerConfig(BaseModel):
     pattern: str = "*.esx"  # File pattern for filtering
     recursive: bool = True  # Search subdirectories
 
+    @property
+    def pattern_regex(self) -> re.Pattern[str]:
+        """Compiled regex for ``pattern``; use ``.match(name)`` per file name."""
+        return _compile_file_pattern(self.pattern or "*.esx")
+
 
 class NotificationConfig(BaseModel):
     """Notification configuration."""
@@ -365,8 +572,8 @@ class Schedule(BaseModel):
     execution_count: int = 0  # Total number of executions
 
     # Metadata
-    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
-    updated_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    created_at: datetime = Field(default_factory=utc_now)
+    updated_at: datetime = Field(default_factory=utc_now)
     created_by: str = "admin"  # User who created the schedule
 
 
@@ -375,7 +582,7 @@ class ScheduleRun(BaseModel):
 
     run_id: UUID = Field(default_factory=uuid4)
     schedule_id: UUID  # Parent schedule
-    executed_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    executed_at: datetime = Field(default_factory=utc_now)
     status: ScheduleStatus  # Execution status
     batch_id: Optional[UUID] = None  # Created batch ID
     duration_seconds: float = 0.0  # Execution duration
@@ -498,7 +705,7 @@ class ComparisonData(BaseModel):
     project_b_name: str  # New/current project name
     project_a_filename: str
     project_b_filename: str
-    comparison_timestamp: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    comparison_timestamp: datetime = Field(default_factory=utc_now)
 
     # Summary
     total_changes: int = 0
@@ -0,0 +1,46 @@
+"""Response classes for the FastAPI application."""
+
+from __future__ import annotations
+
+import inspect
+from typing import Any
+
+from fastapi.datastructures import Default
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson when it is installed.
+
+    Falls back to JSONResponse rendering without orjson.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        return super().render(content)
+
+
+def get_default_response_class():
+    """Pick the application-wide default response class.
+
+    Newer FastAPI releases serialize response models straight to JSON bytes
+    with pydantic-core, but only while the response class is left at its
+    default; overriding it would route every response through an
+    intermediate dict. On those releases the default is kept. Older releases
+    always build a dict and render it with ``json.dumps``, so there
+    FastJSONResponse is used when orjson is available.
+    """
+    if "dump_json" in inspect.signature(serialize_response).parameters:
+        return Default(JSONResponse)
+    if ORJSON_AVAILABLE:
+        return FastJSONResponse
+    return Default(JSONResponse)
@@ -4,13 +4,26 @@ Note: Archiving only applies to local storage backend.
 For S3 storage, archiving is skipped since S3 already provides efficient storage.
 """
 
+import asyncio
+import copy
+import errno
+import heapq
 import logging
+import mmap
+import os
 import shutil
+import stat
+import subprocess
 import tarfile
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
-from typing import Optional
-from uuid import UUID
+from typing import BinaryIO, Callable, Iterable, Optional, Sequence
+from uuid import UUID, uuid4
+
+from cachetools import TTLCache
 
 from app.config import settings
 from app.models import ProcessingStatus, ProjectMetadata
@@ -19,16 +32,797 @@ from app.services.index import index_service
 from app.services.storage.local import LocalStorage
 from app.services.storage_service import storage_service
 
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+try:
+    import grp
+    import pwd
+
+    OWNER_NAMES_AVAILABLE = True
+except ImportError:
+    OWNER_NAMES_AVAILABLE = False
+
+try:
+    import rapidgzip
+
+    RAPIDGZIP_AVAILABLE = True
+except ImportError:
+    RAPIDGZIP_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 # Archive criteria
 ARCHIVE_AFTER_DAYS = 60  # Archive projects not accessed for 60 days
 
+# New archives are zstd-compressed tars when zstandard is installed;
+# existing .tar.gz archives stay readable either way
+ZSTD_SUFFIX = ".tar.zst"
+GZIP_SUFFIX = ".tar.gz"
+ARCHIVE_SUFFIX = ZSTD_SUFFIX if ZSTD_AVAILABLE else GZIP_SUFFIX
+ZSTD_LEVEL = 3
+
+# last_accessed is only rewritten when older than this (relatime semantics)
+LAST_ACCESSED_RESOLUTION = timedelta(hours=1)
+
+# How long a successful ensure_unarchived() is trusted (seconds)
+AVAILABLE_CACHE_TTL = 30
+
+# Compression is CPU and memory heavy; cap concurrent archive jobs
+ARCHIVE_MAX_WORKERS = 2
+
+# .tar.gz archives are (de)compressed by an external process when possible:
+# pigz deflates on all cores, gzip at least runs outside the GIL
+PIGZ_PATH = shutil.which("pigz")
+GZIP_PATH = shutil.which("gzip")
+GZIP_LEVEL = 6
+
+# Member contents are copied into the tar stream in chunks of this size, and
+# streamed tars hand the compressor blocks of the same size (tarfile defaults
+# to 16 KiB copies and 10 KiB stream writes)
+ARCHIVE_COPY_BUFSIZE = 1024 * 1024
+
+# Compressed output is gathered into writes of this size on the archive file
+# (open() would buffer 8 KiB, turning every compressed block into syscalls)
+ARCHIVE_WRITE_BUFSIZE = 8 * 1024 * 1024
+
+# Files a readahead thread may hint to the kernel ahead of the tar writer
+READAHEAD_FILES = 8
+
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_GZIP_MAGIC = b"\x1f\x8b"
+_DECOMPRESS_ERRORS = (zlib.error, zstandard.ZstdError) if ZSTD_AVAILABLE else (zlib.error,)
+
+# Extraction writes member contents on a few threads while the caller keeps
+# decompressing; members above the inline size are streamed directly instead
+EXTRACT_WRITERS = 4
+EXTRACT_MAX_PENDING = 32
+EXTRACT_INLINE_SIZE = 8 * 1024 * 1024
+
+
+# Archived project directories are renamed to "<id>.<token>.gc" and deleted in
+# the background; leftovers from a crash are removed at startup
+STALE_DIR_SUFFIX = ".gc"
+
+# Retired trees are deleted by one native rm process rather than a Python
+# unlink loop per file; rmtree is the fallback (Windows, or rm failing)
+RM_PATH = shutil.which("rm") if os.name == "posix" else None
+
+
+def move_aside(path: Path) -> Path:
+    """
+    Rename a directory to a unique "<name>.<token>.gc" sibling in one syscall.
+
+    Args:
+        path: Directory to retire
+
+    Returns:
+        New path of the directory, ready for remove_in_background()
+
+    Raises:
+        FileNotFoundError: If path does not exist
+    """
+    stale_dir = path.with_name(f"{path.name}.{uuid4().hex}{STALE_DIR_SUFFIX}")
+    os.rename(path, stale_dir)
+    return stale_dir
+
+
+def _remove_trees(paths: Sequence[Path]) -> None:
+    if RM_PATH and paths:
+        result = subprocess.run(
+            [RM_PATH, "-rf", "--", *map(str, paths)],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+        if result.returncode == 0:
+            return
+        stderr = result.stderr.decode(errors="replace").strip()
+        logger.warning(f"rm exited with status {result.returncode}, using rmtree: {stderr}")
+
+    for path in paths:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def remove_in_background(*paths: Path) -> None:
+    """Delete directory trees, all in one rm process where available, on a daemon thread."""
+    threading.Thread(
+        target=_remove_trees,
+        args=(paths,),
+        name="archive-gc",
+        daemon=True,
+    ).start()
+
+
+def _set_file_attrs(path: str, member: tarfile.TarInfo) -> None:
+    """Apply an extracted file's mode and mtime."""
+    if member.mode is not None:
+        os.chmod(path, member.mode)
+    if member.mtime is not None:
+        os.utime(path, (member.mtime, member.mtime))
+
+
+def _write_member(path: str, data: bytes, member: tarfile.TarInfo) -> None:
+    """Write one buffered regular file member."""
+    with open(path, "wb") as f:
+        f.write(data)
+    _set_file_attrs(path, member)
+
+
+def _extract_tar(
+    tar: tarfile.TarFile,
+    dest_dir: Path,
+    rename: Optional[Callable[[str], Optional[str]]] = None,
+) -> None:
+    """
+    Extract every member of a (possibly streaming) tar into dest_dir.
+
+    Members pass through tarfile's "data" filter, which rejects absolute paths,
+    path traversal and device files and drops ownership. Regular files are
+    read in archive order and written by a small thread pool, overlapping
+    decompression with writes; memory is bounded by EXTRACT_MAX_PENDING
+    buffered members of at most EXTRACT_INLINE_SIZE bytes.
+
+    Args:
+        tar: Open tar file (random access or "r|" stream)
+        dest_dir: Directory to extract into
+        rename: Optional mapping of member names to paths under dest_dir;
+            members mapped to None are skipped
+
+    Raises:
+        tarfile.FilterError: If a member is unsafe to extract
+        OSError: If a file cannot be written
+    """
+    dest = os.path.realpath(dest_dir)
+    slots = threading.BoundedSemaphore(EXTRACT_MAX_PENDING)
+    futures = []
+
+    def _drain() -> None:
+        for future in futures:
+            future.result()
+        futures.clear()
+
+    with ThreadPoolExecutor(max_workers=EXTRACT_WRITERS, thread_name_prefix="extract") as pool:
+        for member in tar:
+            if rename is not None:
+                name = rename(member.name)
+                if name is None:
+                    continue
+                changes = {"name": name}
+                if member.islnk():
+                    changes["linkname"] = rename(member.linkname) or member.linkname
+                member = member.replace(**changes, deep=False)
+            member = tarfile.data_filter(member, dest)
+            path = os.path.join(dest, member.name)
+
+            if member.isdir():
+                os.makedirs(path, exist_ok=True)
+                continue
+
+            if not member.isreg():
+                if member.islnk():
+                    _drain()  # Hard link target may still be queued
+                tar.extract(member, dest, filter="fully_trusted")  # Already filtered
+                continue
+
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            src = tar.extractfile(member)
+
+            if member.size > EXTRACT_INLINE_SIZE:
+                with open(path, "wb") as f:
+                    shutil.copyfileobj(src, f)
+                _set_file_attrs(path, member)
+                continue
+
+            data = src.read()
+            slots.acquire()
+            future = pool.submit(_write_member, path, data, member)
+            future.add_done_callback(lambda _: slots.release())
+            futures.append(future)
+
+        _drain()
+
+
+class _PipeWriter:
+    """
+    Write-only binary file over a pipe that counts the bytes written.
+
+    tarfile's plain "w" mode only needs write() and tell(), so a TarFile can
+    write straight to a pipe through this, without its stream buffering.
+    """
+
+    def __init__(self, pipe: BinaryIO):
+        self._pipe = pipe
+        self._pos = 0
+
+    def write(self, data: bytes) -> int:
+        self._pipe.write(data)
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def flush(self) -> None:
+        self._pipe.flush()
+
+    def fileno(self) -> int:
+        return self._pipe.fileno()
+
+    def sendfile(self, src_fd: int, offset: int, count: int) -> bool:
+        """
+        Splice count bytes of src_fd from offset into the pipe with os.sendfile().
+
+        Returns:
+            True once all bytes are sent; False, with nothing sent, if the
+            kernel cannot splice these descriptors
+
+        Raises:
+            tarfile.ReadError: If the source ends early
+        """
+        self._pipe.flush()  # Buffered headers must reach the pipe first
+        dst_fd = self._pipe.fileno()
+        sent = 0
+        while sent < count:
+            try:
+                n = os.sendfile(dst_fd, src_fd, offset + sent, count - sent)
+            except OSError as e:
+                if sent or e.errno not in (errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP):
+                    raise
+                return False
+            if n == 0:
+                raise tarfile.ReadError("unexpected end of data")
+            sent += n
+        self._pos += sent
+        return True
+
+
+class _PipeTarFile(tarfile.TarFile):
+    """
+    TarFile that splices regular file contents into its output pipe.
+
+    Used for uncompressed tars written into an external compressor, opened in
+    plain "w" mode on a _PipeWriter: headers and padding are written as usual,
+    while file contents are moved with os.sendfile() straight from the page
+    cache into the pipe, skipping the userspace read/write copy.
+    """
+
+    def addfile(self, tarinfo, fileobj=None):
+        pipe = self.fileobj
+        if (
+            fileobj is None
+            or not tarinfo.isreg()
+            or not tarinfo.size
+            or not hasattr(os, "sendfile")
+            or not isinstance(pipe, _PipeWriter)
+        ):
+            return super().addfile(tarinfo, fileobj)
+        try:
+            src_fd = fileobj.fileno()
+            src_offset = fileobj.tell()
+        except (AttributeError, OSError):
+            return super().addfile(tarinfo, fileobj)
+        if self.closed:
+            raise OSError(f"{self.__class__.__name__} is closed")
+
+        tarinfo = copy.copy(tarinfo)
+        buf = tarinfo.tobuf(self.format, self.encoding, self.errors)
+        pipe.write(buf)
+        self.offset += len(buf)
+
+        if not pipe.sendfile(src_fd, src_offset, tarinfo.size):
+            # Kernel cannot splice these descriptors; copy in userspace instead
+            tarfile.copyfileobj(fileobj, pipe, tarinfo.size, bufsize=self.copybufsize)
+
+        blocks, remainder = divmod(tarinfo.size, tarfile.BLOCKSIZE)
+        if remainder > 0:
+            pipe.write(tarfile.NUL * (tarfile.BLOCKSIZE - remainder))
+            blocks += 1
+        self.offset += blocks * tarfile.BLOCKSIZE
+        self.members.append(tarinfo)
+
+
+def _gzip_command(*args: str) -> Optional[list[str]]:
+    """Build an external gzip command line, preferring pigz, or None if neither exists."""
+    if PIGZ_PATH:
+        return [PIGZ_PATH, "-p", str(os.cpu_count() or 1), *args]
+    if GZIP_PATH:
+        return [GZIP_PATH, *args]
+    return None
+
+
+def _scan_tree(path: str, arcname: str, entries: list) -> None:
+    """Append the entries below directory path in the order tarfile.add() archives them."""
+    with os.scandir(path) as it:
+        children = sorted(it, key=lambda entry: entry.name)
+    for entry in children:
+        child_arcname = f"{arcname}/{entry.name}"
+        st = entry.stat(follow_symlinks=False)
+        entries.append((entry.path, child_arcname, st))
+        if stat.S_ISDIR(st.st_mode):
+            _scan_tree(entry.path, child_arcname, entries)
+
+
+def _scan_sources(
+    sources: Sequence[tuple[Path, str]],
+) -> list[tuple[str, str, os.stat_result]]:
+    """
+    Walk the archive sources once, in archive order.
+
+    Args:
+        sources: (directory, name inside the archive) pairs, in archive order
+
+    Returns:
+        (path, arcname, lstat result) of every entry, each source directory
+        ahead of its contents
+
+    Raises:
+        FileNotFoundError: If a source directory does not exist
+    """
+    entries: list[tuple[str, str, os.stat_result]] = []
+    for source_dir, arcname in sources:
+        path = os.fspath(source_dir)
+        st = os.lstat(path)
+        entries.append((path, arcname, st))
+        if stat.S_ISDIR(st.st_mode):
+            _scan_tree(path, arcname, entries)
+    return entries
+
+
+class _TarInfoFactory:
+    """
+    Build tar headers from stat results already collected by _scan_sources().
+
+    Equivalent to TarFile.gettarinfo() for directories, regular files,
+    symlinks and hard links, without another lstat() per entry and with
+    owner and group names looked up once per id instead of once per file.
+    """
+
+    def __init__(self):
+        self._unames: dict[int, str] = {}
+        self._gnames: dict[int, str] = {}
+        self._inodes: dict[tuple[int, int], str] = {}  # Regular files seen, for hard links
+
+    def _uname(self, uid: int) -> str:
+        name = self._unames.get(uid)
+        if name is None:
+            try:
+                name = pwd.getpwuid(uid).pw_name if OWNER_NAMES_AVAILABLE else ""
+            except KeyError:
+                name = ""
+            self._unames[uid] = name
+        return name
+
+    def _gname(self, gid: int) -> str:
+        name = self._gnames.get(gid)
+        if name is None:
+            try:
+                name = grp.getgrgid(gid).gr_name if OWNER_NAMES_AVAILABLE else ""
+            except KeyError:
+                name = ""
+            self._gnames[gid] = name
+        return name
+
+    def build(self, tar: tarfile.TarFile, path: str, arcname: str, st: os.stat_result):
+        """Return the TarInfo for one scanned entry."""
+        mode = st.st_mode
+        if not (stat.S_ISREG(mode) or stat.S_ISDIR(mode) or stat.S_ISLNK(mode)):
+            return tar.gettarinfo(path, arcname)  # Devices and FIFOs: rare, keep tarfile's logic
+
+        info = tarfile.TarInfo(arcname)
+        info.mode = mode
+        info.uid = st.st_uid
+        info.gid = st.st_gid
+        info.uname = self._uname(st.st_uid)
+        info.gname = self._gname(st.st_gid)
+        info.mtime = st.st_mtime
+
+        if stat.S_ISDIR(mode):
+            info.type = tarfile.DIRTYPE
+        elif stat.S_ISLNK(mode):
+            info.type = tarfile.SYMTYPE
+            info.linkname = os.readlink(path)
+        else:
+            inode = (st.st_ino, st.st_dev)
+            linked = self._inodes.get(inode) if st.st_nlink > 1 else None
+            if linked is not None and linked != arcname:
+                info.type = tarfile.LNKTYPE
+                info.linkname = linked
+            else:
+                info.type = tarfile.REGTYPE
+                info.size = st.st_size
+                if st.st_ino:
+                    self._inodes[inode] = arcname
+        return info
+
+
+class _Readahead:
+    """
+    Hint upcoming archive members to the kernel while the tar writer works.
+
+    A daemon thread goes through the files in archive order and issues
+    posix_fadvise(WILLNEED) on each, staying at most READAHEAD_FILES files
+    ahead of the writer, so cold-cache reads overlap with compression
+    instead of stalling it. A no-op where posix_fadvise is unavailable.
+    """
+
+    def __init__(self, paths: Sequence[str]):
+        self._paths = paths
+        self._slots = threading.Semaphore(READAHEAD_FILES)
+        self._done = False
+        self._thread = None
+        if paths and hasattr(os, "posix_fadvise"):
+            self._thread = threading.Thread(target=self._run, name="archive-readahead", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        for path in self._paths:
+            self._slots.acquire()
+            if self._done:
+                return
+            try:
+                fd = os.open(path, os.O_RDONLY)
+            except OSError:
+                continue
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            except OSError:
+                pass
+            finally:
+                os.close(fd)
+
+    def advance(self) -> None:
+        """Note that the writer has started on the next file."""
+        self._slots.release()
+
+    def stop(self) -> None:
+        """Stop hinting; the thread exits at its next file."""
+        self._done = True
+        self._slots.release()
+
+
+def write_tar_archive(archive_path: Path, sources: Sequence[tuple[Path, str]]) -> int:
+    """
+    Write directories into a new compressed tar archive.
+
+    Args:
+        archive_path: Destination archive; its suffix selects zstd or gzip
+        sources: (directory, name inside the archive) pairs, in archive order
+
+    Returns:
+        Total size in bytes of the regular files archived
+
+    Raises:
+        FileExistsError: If archive_path already exists
+        FileNotFoundError: If a source directory does not exist
+        RuntimeError: If the external compressor fails
+    """
+    with open(archive_path, "xb", buffering=ARCHIVE_WRITE_BUFSIZE) as fh:
+        return write_tar_stream(fh, sources, zstd=archive_path.name.endswith(ZSTD_SUFFIX))
+
+
+def write_tar_stream(out: BinaryIO, sources: Sequence[tuple[Path, str]], zstd: bool) -> int:
+    """
+    Write directories as a compressed tar stream to an open binary file.
+
+    Zstd streams are compressed in-process on zstd's own worker threads. Gzip
+    streams pipe an uncompressed tar into pigz (or gzip) so deflate runs
+    outside the GIL, with file contents spliced into the pipe by sendfile;
+    the stdlib is the fallback when neither is installed. The external
+    compressor writes straight to out's descriptor, so out must be a real
+    file or pipe in that case. The sources are walked once up front; tar
+    headers are built from that walk's stat results, and source files are
+    hinted to the kernel a few files ahead of the writer (see _Readahead).
+
+    Args:
+        out: Destination file object, left open
+        sources: (directory, name inside the archive) pairs, in archive order
+        zstd: Compress with zstd instead of gzip
+
+    Returns:
+        Total size in bytes of the regular files archived
+
+    Raises:
+        FileNotFoundError: If a source directory does not exist
+        RuntimeError: If the external compressor fails
+    """
+    # One walk provides the headers, the archived size and the readahead list
+    entries = _scan_sources(sources)
+    total_size = 0
+
+    def _add_sources(tar: tarfile.TarFile) -> None:
+        nonlocal total_size
+        factory = _TarInfoFactory()
+        readahead = _Readahead([path for path, _, st in entries if stat.S_ISREG(st.st_mode)])
+        try:
+            for path, arcname, st in entries:
+                info = factory.build(tar, path, arcname, st)
+                if stat.S_ISREG(st.st_mode):
+                    readahead.advance()
+                if not info.isreg():
+                    tar.addfile(info)
+                    continue
+                with open(path, "rb") as f:
+                    tar.addfile(info, f)
+                total_size += info.size
+        finally:
+            readahead.stop()
+
+    if zstd:
+        # Frame checksums let verify_archive() detect corruption
+        compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL, threads=-1, write_checksum=True)
+        with (
+            compressor.stream_writer(out, closefd=False) as zw,
+            tarfile.open(
+                fileobj=zw,
+                mode="w|",
+                bufsize=ARCHIVE_COPY_BUFSIZE,
+                copybufsize=ARCHIVE_COPY_BUFSIZE,
+            ) as tar,
+        ):
+            _add_sources(tar)
+        return total_size
+
+    command = _gzip_command(f"-{GZIP_LEVEL}", "-c")
+    if command:
+        out.flush()
+        proc = subprocess.Popen(
+            command, stdin=subprocess.PIPE, stdout=out, bufsize=ARCHIVE_COPY_BUFSIZE
+        )
+        try:
+            with _PipeTarFile(
+                fileobj=_PipeWriter(proc.stdin), mode="w", copybufsize=ARCHIVE_COPY_BUFSIZE
+            ) as tar:
+                _add_sources(tar)
+        finally:
+            proc.stdin.close()
+            returncode = proc.wait()
+        if returncode != 0:
+            raise RuntimeError(f"{command[0]} exited with status {returncode}")
+    else:
+        with tarfile.open(
+            fileobj=out,
+            mode="w:gz",
+            compresslevel=GZIP_LEVEL,
+            copybufsize=ARCHIVE_COPY_BUFSIZE,
+        ) as tar:
+            _add_sources(tar)
+
+    return total_size
+
+
+# Decompressed output read per call when verifying a zstd archive
+_ZSTD_VERIFY_READ = 1024 * 1024
+
+# zstd framing: skippable frame magic numbers, largest frame header, block header size
+_ZSTD_SKIPPABLE_MAGIC = range(0x184D2A50, 0x184D2A60)
+_ZSTD_MAX_FRAME_HEADER = 18
+_ZSTD_BLOCK_HEADER = 3
+
+
+def _gzip_stream_complete(buf: mmap.mmap) -> bool:
+    """Inflate every gzip member in buf, discarding output; False if the last one is cut off."""
+    inflater = None
+    for offset in range(0, len(buf), ARCHIVE_COPY_BUFSIZE):
+        data = buf[offset : offset + ARCHIVE_COPY_BUFSIZE]
+        while data:
+            if inflater is None:
+                inflater = zlib.decompressobj(wbits=31)
+            # Bounded output: a highly compressed member must not
+            # inflate into one huge buffer
+            inflater.decompress(data, ARCHIVE_COPY_BUFSIZE)
+            data = inflater.unconsumed_tail
+            if inflater.eof:
+                # pigz and concatenated gzip files may hold several members
+                data = inflater.unused_data
+                inflater = None
+
+    # Flush output still held back by the bound at the end of input
+    while inflater is not None and not inflater.eof:
+        if not inflater.decompress(b"", ARCHIVE_COPY_BUFSIZE):
+            break
+    return inflater is None
+
+
+def _zstd_frames_end_at_eof(buf: mmap.mmap) -> bool:
+    """Walk the zstd frame and block headers in buf; True if the last frame ends at its end.
+
+    Decompression alone cannot tell a cut-off final frame from a complete one,
+    so the framing is checked separately. Block contents are skipped, not read.
+    """
+    size = len(buf)
+    offset = 0
+    while offset < size:
+        if size - offset < 4:
+            return False
+        magic = int.from_bytes(buf[offset : offset + 4], "little")
+        if magic in _ZSTD_SKIPPABLE_MAGIC:
+            if size - offset < 8:
+                return False
+            offset += 8 + int.from_bytes(buf[offset + 4 : offset + 8], "little")
+            continue
+
+        header = buf[offset : offset + _ZSTD_MAX_FRAME_HEADER]
+        try:
+            offset += zstandard.frame_header_size(header)
+            has_checksum = zstandard.get_frame_parameters(header).has_checksum
+        except zstandard.ZstdError:
+            return False
+
+        last = False
+        while not last:
+            if size - offset < _ZSTD_BLOCK_HEADER:
+                return False
+            block = int.from_bytes(buf[offset : offset + _ZSTD_BLOCK_HEADER], "little")
+            last = bool(block & 1)
+            block_type = (block >> 1) & 3
+            # RLE blocks (type 1) store a single byte, whatever size they expand to
+            offset += _ZSTD_BLOCK_HEADER + (1 if block_type == 1 else block >> 3)
+        if has_checksum:
+            offset += 4
+    return offset == size
+
+
+def _zstd_stream_complete(buf: mmap.mmap) -> bool:
+    """Decompress every zstd frame in buf, discarding output; False if the last one is cut off.
+
+    Output is read in fixed-size pieces, so memory stays bounded however far
+    the archive expands.
+    """
+    decompressor = zstandard.ZstdDecompressor()
+    reader = decompressor.stream_reader(buf, read_across_frames=True, closefd=False)
+    with reader:
+        while reader.read(_ZSTD_VERIFY_READ):
+            pass
+    return _zstd_frames_end_at_eof(buf)
+
+
+def verify_archive(archive_path: Path) -> None:
+    """
+    Check a gzip or zstd archive end to end before the data it holds is deleted.
+
+    The archive is decompressed with the output discarded, so zlib checks
+    each gzip member's CRC-32 and length trailer, and zstd each frame's
+    checksum (written by write_tar_stream). zlib's CRC-32 is
+    hardware-accelerated, which keeps this bound by decompression speed; the
+    archive is read through a memory mapping that was just written and is
+    normally still in the page cache.
+
+    Args:
+        archive_path: Archive to check
+
+    Raises:
+        RuntimeError: If the archive is empty, truncated or fails a checksum,
+            or is zstd-compressed and zstandard is not installed
+    """
+    with open(archive_path, "rb") as fh:
+        if not os.fstat(fh.fileno()).st_size:
+            raise RuntimeError(f"empty archive: {archive_path}")
+
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                buf.madvise(mmap.MADV_SEQUENTIAL)
+
+            zstd = buf[:4] == _ZSTD_MAGIC
+            if zstd and not ZSTD_AVAILABLE:
+                raise RuntimeError(f"zstandard is required to verify {archive_path}")
+
+            try:
+                complete = _zstd_stream_complete(buf) if zstd else _gzip_stream_complete(buf)
+            except _DECOMPRESS_ERRORS as e:
+                raise RuntimeError(f"corrupt archive {archive_path}: {e}") from e
+
+            if not complete:
+                raise RuntimeError(f"truncated archive: {archive_path}")
+
+
+def extract_tar_archive(
+    archive_path: Path,
+    dest_dir: Path,
+    rename: Optional[Callable[[str], Optional[str]]] = None,
+) -> None:
+    """
+    Extract a zstd or gzip tar archive, detected by its magic bytes.
+
+    Gzip archives are inflated in parallel with rapidgzip when it is
+    installed, then by a pigz/gzip subprocess, and by the single-threaded
+    stdlib reader as a last resort. The stdlib and zstd readers consume a
+    memory mapping of the archive.
+
+    Args:
+        archive_path: Archive to extract
+        dest_dir: Directory to extract into
+        rename: Optional mapping of member names to paths under dest_dir;
+            members mapped to None are skipped
+
+    Raises:
+        RuntimeError: If the archive is zstd-compressed but zstandard is not
+            installed, or the external decompressor fails
+    """
+    with open(archive_path, "rb") as fh:
+        magic = fh.read(4)
+        fh.seek(0)
+
+        if magic[:2] == _GZIP_MAGIC and RAPIDGZIP_AVAILABLE:
+            with (
+                rapidgzip.open(fh, parallelization=0) as gz,
+                tarfile.open(fileobj=gz, mode="r|") as tar,
+            ):
+                _extract_tar(tar, dest_dir, rename)
+            return
+
+        command = _gzip_command("-d", "-c") if magic[:2] == _GZIP_MAGIC else None
+        if command:
+            # The buffered seek above may not move the descriptor the child inherits
+            os.lseek(fh.fileno(), 0, os.SEEK_SET)
+            proc = subprocess.Popen(command, stdin=fh, stdout=subprocess.PIPE)
+            try:
+                with tarfile.open(fileobj=proc.stdout, mode="r|") as tar:
+                    _extract_tar(tar, dest_dir, rename)
+            except BaseException:
+                proc.kill()
+                raise
+            finally:
+                proc.stdout.close()
+                returncode = proc.wait()
+            if returncode != 0:
+                raise RuntimeError(f"{command[0]} exited with status {returncode}")
+            return
+
+        if magic == _ZSTD_MAGIC and not ZSTD_AVAILABLE:
+            raise RuntimeError(f"zstandard is required to extract {archive_path}")
+
+        if not magic:
+            raise tarfile.ReadError(f"empty archive: {archive_path}")
+
+        # In-process decompressors read the archive through a read-only mapping:
+        # compressed pages are faulted in (with sequential readahead) instead of
+        # being copied through read() buffers
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                buf.madvise(mmap.MADV_SEQUENTIAL)
+
+            if magic != _ZSTD_MAGIC:
+                with tarfile.open(fileobj=buf, mode="r:*") as tar:
+                    _extract_tar(tar, dest_dir, rename)
+                return
+
+            with (
+                zstandard.ZstdDecompressor().stream_reader(buf) as zr,
+                tarfile.open(fileobj=zr, mode="r|") as tar,
+            ):
+                _extract_tar(tar, dest_dir, rename)
+
 
 class ArchiveService:
     """Service for archiving and unarchiving projects.
 
-    Archiving (compression to tar.gz) is only applicable to local storage backend.
+    Archiving (compression to tar.zst, or tar.gz without zstandard) is only
+    applicable to local storage backend.
     For S3 storage, archiving is automatically skipped as S3 already provides
     efficient storage and lifecycle policies.
     """
@@ -36,17 +830,18 @@ class ArchiveService:
     def __init__(self):
         """Initialize the archive service."""
         self.projects_dir = settings.projects_dir
+        # Storage backend is fixed for the process lifetime; S3 needs no archiving
+        self._local = isinstance(storage_service.backend, LocalStorage)
+        # Projects recently confirmed unarchived; repeated accesses within the
+        # TTL skip the archive check and the last_accessed metadata write
+        self._available = TTLCache(maxsize=4096, ttl=AVAILABLE_CACHE_TTL)
+        self._available_lock = threading.RLock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=ARCHIVE_MAX_WORKERS, thread_name_prefix="archive"
+        )
         if self.projects_dir.exists() or settings.storage_backend == "local":
             self.projects_dir.mkdir(parents=True, exist_ok=True)
 
-    def _is_local_storage(self) -> bool:
-        """Check if using local storage backend.
-
-        Returns:
-            True if using local storage, False if using S3 or other backend
-        """
-        return isinstance(storage_service.backend, LocalStorage)
-
     def get_archive_path(self, project_id: UUID) -> Path:
         """
         Get path to project archive file.
@@ -55,9 +850,14 @@ class ArchiveService:
             project_id: Project UUID
 
         Returns:
-            Path to .tar.gz archive
+            Path to the existing archive (.tar.zst or legacy .tar.gz), or the
+            path a new archive would be written to
         """
-        return self.projects_dir / f"{project_id}.tar.gz"
+        for suffix in (ZSTD_SUFFIX, GZIP_SUFFIX):
+            archive_path = self.projects_dir / f"{project_id}{suffix}"
+            if archive_path.exists():
+                return archive_path
+        return self.projects_dir / f"{project_id}{ARCHIVE_SUFFIX}"
 
     def is_archived(self, project_id: UUID) -> bool:
         """Check if project is currently archived.
@@ -66,13 +866,13 @@ class ArchiveService:
             project_id: Project UUID
 
         Returns:
-            True if project is archived (tar.gz exists, directory doesn't)
+            True if project is archived (archive exists, directory doesn't)
 
         Note:
             Always returns False for S3 storage (archiving not applicable)
         """
         # S3 storage doesn't support archiving
-        if not self._is_local_storage():
+        if not self._local:
             return False
 
         archive_path = self.get_archive_path(project_id)
@@ -99,7 +899,7 @@ class ArchiveService:
             Always returns False for S3 storage
         """
         # S3 storage doesn't need archiving
-        if not self._is_local_storage():
+        if not self._local:
             return False
 
         # Must be completed
@@ -110,19 +910,57 @@ class ArchiveService:
         if metadata.archived:
             return False
 
-        # Check last access time
-        if metadata.last_accessed is None:
-            # Never accessed - use upload date + 60 days
-            cutoff_date = metadata.upload_date + timedelta(days=ARCHIVE_AFTER_DAYS)
-            return datetime.now(UTC) > cutoff_date
+        return datetime.now(UTC) > self.archive_eligible_at(metadata)
+
+    @staticmethod
+    def archive_eligible_at(metadata: ProjectMetadata) -> datetime:
+        """
+        Time after which a project becomes eligible for archiving.
 
-        # Check last accessed
-        cutoff_date = metadata.last_accessed + timedelta(days=ARCHIVE_AFTER_DAYS)
-        return datetime.now(UTC) > cutoff_date
+        Args:
+            metadata: Project metadata
+
+        Returns:
+            Last access (or upload date if never accessed) + ARCHIVE_AFTER_DAYS
+        """
+        return (metadata.last_accessed or metadata.upload_date) + timedelta(days=ARCHIVE_AFTER_DAYS)
+
+    def find_archive_candidates(
+        self, projects: Iterable[ProjectMetadata], now: Optional[datetime] = None
+    ) -> list[UUID]:
+        """
+        Select projects due for archiving, oldest eligibility first.
+
+        Works on in-memory (index) metadata so a sweep only loads metadata from
+        storage for the few projects that are due, instead of every project.
+        Callers should re-check should_archive() on the freshly loaded metadata.
+
+        Args:
+            projects: Project metadata to consider
+            now: Reference time (defaults to current time)
+
+        Returns:
+            IDs of completed, unarchived projects whose eligibility time has passed
+        """
+        if not self._local:
+            return []
+
+        now = now or datetime.now(UTC)
+        heap = [
+            (self.archive_eligible_at(metadata), metadata.project_id)
+            for metadata in projects
+            if metadata.processing_status == ProcessingStatus.COMPLETED and not metadata.archived
+        ]
+        heapq.heapify(heap)
+
+        due = []
+        while heap and heap[0][0] < now:
+            due.append(heapq.heappop(heap)[1])
+        return due
 
     def archive_project(self, project_id: UUID) -> bool:
         """
-        Archive a project by compressing it to tar.gz.
+        Archive a project by compressing it to tar.zst (tar.gz without zstandard).
 
         Args:
             project_id: Project UUID
@@ -134,68 +972,116 @@ class ArchiveService:
             Only applicable to local storage. Returns False for S3 storage.
         """
         # S3 storage doesn't need archiving
-        if not self._is_local_storage():
+        if not self._local:
             logger.debug(f"Skipping archiving for project {project_id} (S3 storage)")
             return False
 
-        try:
-            project_dir = storage_service.get_project_dir(project_id)
-            archive_path = self.get_archive_path(project_id)
+        archived, metadata = self._archive(project_id)
+        if archived:
+            if metadata:
+                index_service.add(metadata)
+            cache_service.invalidate_project(project_id)
+        return archived
 
-            # Check if project directory exists
-            if not Path(project_dir).exists():
-                logger.warning(f"Project directory not found: {project_dir}")
-                return False
+    def archive_projects_bulk(self, project_ids: Iterable[UUID]) -> list[UUID]:
+        """
+        Archive several projects, updating the index and caches once at the end.
 
-            # Check if already archived
-            if archive_path.exists():
-                logger.warning(f"Archive already exists: {archive_path}")
-                return False
+        Args:
+            project_ids: Project UUIDs
 
-            logger.info(f"Archiving project {project_id} to {archive_path}")
+        Returns:
+            IDs of the projects that were archived
 
-            # Create tar.gz archive
-            with tarfile.open(archive_path, "w:gz") as tar:
-                tar.add(project_dir, arcname=str(project_id))
+        Note:
+            Only applicable to local storage. Returns [] for S3 storage.
+        """
+        if not self._local:
+            logger.debug("Skipping bulk archiving (S3 storage)")
+            return []
+
+        archived_ids = []
+        updated = []
+        for project_id in project_ids:
+            archived, metadata = self._archive(project_id)
+            if archived:
+                archived_ids.append(project_id)
+                if metadata:
+                    updated.append(metadata)
+
+        if archived_ids:
+            index_service.add_bulk(updated)
+            cache_service.invalidate_projects(archived_ids)
+        return archived_ids
+
+    def _archive(self, project_id: UUID) -> tuple[bool, Optional[ProjectMetadata]]:
+        """
+        Compress a project and remove its directory, without index/cache updates.
 
-            # Verify archive was created
-            if not archive_path.exists():
-                logger.error(f"Failed to create archive: {archive_path}")
-                return False
+        Args:
+            project_id: Project UUID
 
-            # Load metadata and update archived flag
-            metadata = storage_service.load_metadata(project_id)
-            if metadata:
-                metadata.archived = True
-                # Save metadata before deleting directory
-                storage_service.save_metadata(project_id, metadata)
-                # Update index
-                index_service.add(metadata)
+        Returns:
+            Tuple of (archived, updated metadata or None if the project has none)
+        """
+        project_dir = storage_service.get_project_dir(project_id)
+        archive_path = self.get_archive_path(project_id)
 
-            # Remove original directory
-            shutil.rmtree(project_dir)
+        self._forget_available(project_id)
+        logger.info(f"Archiving project {project_id} to {archive_path}")
 
-            logger.info(
-                f"Project {project_id} archived successfully. "
-                f"Original size: {self._get_dir_size(project_dir)} bytes, "
-                f"Archive size: {archive_path.stat().st_size} bytes"
+        # The archive is created exclusively and tar.add stats the source, so
+        # both guards are the operation itself rather than separate checks
+        try:
+            original_size = self._write_archive(
+                archive_path, Path(project_dir), arcname=str(project_id)
             )
+        except FileExistsError:
+            logger.warning(f"Archive already exists: {archive_path}")
+            return False, None
+        except FileNotFoundError:
+            logger.warning(f"Project directory not found: {project_dir}")
+            archive_path.unlink(missing_ok=True)
+            return False, None
+        except Exception as e:
+            logger.error(f"Error archiving project {project_id}: {e}", exc_info=True)
+            archive_path.unlink(missing_ok=True)
+            return False, None
 
-            # Invalidate cache
-            cache_service.invalidate_project(str(project_id))
+        try:
+            # metadata.json lives in the project directory, so it is read before
+            # the directory goes away; the archived flag is kept by the index
+            metadata = storage_service.load_metadata(project_id)
 
-            return True
+            # Move the directory aside in one rename; deleting its files can
+            # take a while and happens off the caller's path
+            stale_dir = move_aside(Path(project_dir))
+
+            # An ensure_unarchived() during the write still saw the directory
+            # and may have marked the project available again
+            self._forget_available(project_id)
 
         except Exception as e:
             logger.error(f"Error archiving project {project_id}: {e}", exc_info=True)
-            # Clean up partial archive if it exists
-            if archive_path.exists():
-                archive_path.unlink()
-            return False
+            # Clean up archive if it exists
+            archive_path.unlink(missing_ok=True)
+            return False, None
+
+        if metadata:
+            metadata.archived = True
+        remove_in_background(stale_dir)
+
+        logger.info(
+            f"Project {project_id} archived successfully. "
+            f"Original size: {original_size} bytes, "
+            f"Archive size: {archive_path.stat().st_size} bytes"
+        )
+
+        return True, metadata
 
     def unarchive_project(self, project_id: UUID) -> bool:
         """
-        Unarchive a project by extracting from tar.gz.
+        Unarchive a project by extracting from tar.zst or tar.gz.
 
         Args:
             project_id: Project UUID
@@ -207,33 +1093,30 @@ class ArchiveService:
             Only applicable to local storage. Returns False for S3 storage.
         """
         # S3 storage doesn't use archiving
-        if not self._is_local_storage():
+        if not self._local:
             logger.debug(f"Skipping unarchiving for project {project_id} (S3 storage)")
             return False
 
-        try:
-            archive_path = self.get_archive_path(project_id)
-            project_dir = storage_service.get_project_dir(project_id)
-
-            # Check if archive exists
-            if not archive_path.exists():
-                logger.warning(f"Archive not found: {archive_path}")
-                return False
+        archive_path = self.get_archive_path(project_id)
+        project_dir = storage_service.get_project_dir(project_id)
 
-            # Check if directory already exists
-            if Path(project_dir).exists():
-                logger.warning(f"Project directory already exists: {project_dir}")
-                return False
+        # Claiming the directory atomically rejects an existing one
+        try:
+            os.mkdir(project_dir)
+        except FileExistsError:
+            logger.warning(f"Project directory already exists: {project_dir}")
+            return False
 
+        try:
             logger.info(f"Unarchiving project {project_id} from {archive_path}")
 
-            # Extract tar.gz archive
-            with tarfile.open(archive_path, "r:gz") as tar:
-                tar.extractall(path=self.projects_dir)
-
-            # Verify directory was created
-            if not Path(project_dir).exists():
-                logger.error(f"Failed to extract archive: {archive_path}")
+            try:
+                self._extract_archive(archive_path, self.projects_dir)
+            except FileNotFoundError:
+                if archive_path.exists():
+                    raise
+                logger.warning(f"Archive not found: {archive_path}")
+                os.rmdir(project_dir)
                 return False
 
             # Load metadata and update archived flag
@@ -251,15 +1134,14 @@ class ArchiveService:
             logger.info(f"Project {project_id} unarchived successfully")
 
             # Invalidate cache
-            cache_service.invalidate_project(str(project_id))
+            cache_service.invalidate_project(project_id)
 
             return True
 
         except Exception as e:
             logger.error(f"Error unarchiving project {project_id}: {e}", exc_info=True)
-            # Clean up partial extraction if it exists
-            if Path(project_dir).exists():
-                shutil.rmtree(project_dir)
+            # Clean up partial extraction
+            shutil.rmtree(project_dir, ignore_errors=True)
             return False
 
     def ensure_unarchived(self, project_id: UUID) -> bool:
@@ -276,19 +1158,133 @@ class ArchiveService:
             True if project is available (was already unarchived or successfully unarchived),
             False if unarchiving failed
         """
+        # Recently confirmed available: skip the archive check and metadata write
+        if self._is_known_available(project_id):
+            return True
+
         # Check if project is archived
         if not self.is_archived(project_id):
-            # Not archived, just update last_accessed
-            metadata = storage_service.load_metadata(project_id)
-            if metadata:
-                metadata.last_accessed = datetime.now(UTC)
-                storage_service.save_metadata(project_id, metadata)
-                index_service.add(metadata)
+            # Not archived, just update last_accessed (relatime: only when stale)
+            self._touch_last_accessed(project_id)
+            self._mark_available(project_id)
             return True
 
         # Project is archived, need to unarchive
         logger.info(f"Project {project_id} is archived, unarchiving...")
-        return self.unarchive_project(project_id)
+        if not self.unarchive_project(project_id):
+            return False
+        self._mark_available(project_id)
+        return True
+
+    def _touch_last_accessed(self, project_id: UUID) -> None:
+        """
+        Persist a new last_accessed, unless the stored one is recent enough.
+
+        Archiving works in days, so last_accessed only needs to be accurate to
+        LAST_ACCESSED_RESOLUTION; the in-memory index answers the freshness
+        check without reading metadata.json.
+
+        Args:
+            project_id: Project UUID
+        """
+        now = datetime.now(UTC)
+        indexed = index_service.get(project_id)
+        if (
+            indexed is not None
+            and indexed.last_accessed is not None
+            and now - indexed.last_accessed < LAST_ACCESSED_RESOLUTION
+        ):
+            return
+
+        metadata = storage_service.load_metadata(project_id)
+        if not metadata:
+            return
+        if metadata.last_accessed and now - metadata.last_accessed < LAST_ACCESSED_RESOLUTION:
+            return
+
+        metadata.last_accessed = now
+        storage_service.save_metadata(project_id, metadata)
+        index_service.add(metadata)
+
+    def _is_known_available(self, project_id: UUID) -> bool:
+        """Check if ensure_unarchived() succeeded for the project within the TTL.
+
+        For local storage the project directory must also still exist, so a
+        project archived since it was marked is never reported available.
+        """
+        with self._available_lock:
+            if str(project_id) not in self._available:
+                return False
+        if self._local and not os.path.isdir(storage_service.get_project_dir(project_id)):
+            self._forget_available(project_id)
+            return False
+        return True
+
+    def _mark_available(self, project_id: UUID) -> None:
+        """Remember that the project is unarchived (until archived or TTL expiry)."""
+        with self._available_lock:
+            self._available[str(project_id)] = True
+
+    def _forget_available(self, project_id: UUID) -> None:
+        """Drop the cached availability of a project that is being archived."""
+        with self._available_lock:
+            self._available.pop(str(project_id), None)
+
+    async def _run_in_executor(self, func, project_id: UUID) -> bool:
+        """Run a blocking archive operation on the archive thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, project_id)
+
+    async def archive_project_async(self, project_id: UUID) -> bool:
+        """Archive a project without blocking the event loop.
+
+        Args:
+            project_id: Project UUID
+
+        Returns:
+            True if archiving succeeded, False otherwise
+        """
+        return await self._run_in_executor(self.archive_project, project_id)
+
+    async def unarchive_project_async(self, project_id: UUID) -> bool:
+        """Unarchive a project without blocking the event loop.
+
+        Args:
+            project_id: Project UUID
+
+        Returns:
+            True if unarchiving succeeded, False otherwise
+        """
+        return await self._run_in_executor(self.unarchive_project, project_id)
+
+    async def ensure_unarchived_async(self, project_id: UUID) -> bool:
+        """Ensure project is unarchived without blocking the event loop.
+
+        Args:
+            project_id: Project UUID
+
+        Returns:
+            True if project is available, False if unarchiving failed
+        """
+        # Common case answered on the event loop, without a thread hop
+        if self._is_known_available(project_id):
+            return True
+        return await self._run_in_executor(self.ensure_unarchived, project_id)
+
+    def remove_stale_dirs(self) -> int:
+        """
+        Delete project directories left behind by interrupted archiving.
+
+        Returns:
+            Number of stale directories queued for removal
+        """
+        if not self._local:
+            return 0
+
+        stale_dirs = list(self.projects_dir.glob(f"*{STALE_DIR_SUFFIX}"))
+        if stale_dirs:
+            remove_in_background(*stale_dirs)
+        return len(stale_dirs)
 
     def get_archive_stats(self, project_id: UUID) -> Optional[dict]:
         """
@@ -310,6 +1306,32 @@ class ArchiveService:
             "archive_path": str(archive_path),
         }
 
+    @staticmethod
+    def _write_archive(archive_path: Path, source_dir: Path, arcname: str) -> int:
+        """
+        Write source_dir into a new compressed tar archive.
+
+        Args:
+            archive_path: Destination archive; its suffix selects zstd or gzip
+            source_dir: Directory to archive
+            arcname: Name of the directory inside the archive
+
+        Returns:
+            Total size in bytes of the regular files archived
+        """
+        return write_tar_archive(archive_path, [(source_dir, arcname)])
+
+    @staticmethod
+    def _extract_archive(archive_path: Path, dest_dir: Path) -> None:
+        """
+        Extract a zstd or gzip tar archive into dest_dir.
+
+        Args:
+            archive_path: Archive to extract
+            dest_dir: Directory to extract into
+        """
+        extract_tar_archive(archive_path, dest_dir)
+
     @staticmethod
     def _get_dir_size(directory: Path) -> int:
         """
@@ -322,9 +1344,19 @@ class ArchiveService:
             Total size in bytes
         """
         total_size = 0
-        for item in directory.rglob("*"):
-            if item.is_file():
-                total_size += item.stat().st_size
+        stack = [os.fspath(directory)]
+        while stack:
+            try:
+                it = os.scandir(stack.pop())
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            with it:
+                for entry in it:
+                    # DirEntry caches the dirent type, so only files cost a stat()
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        total_size += entry.stat(follow_symlinks=False).st_size
         return total_size
 
 
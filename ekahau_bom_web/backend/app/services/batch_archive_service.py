@@ -3,25 +3,103 @@ Batch Archive Service - Archive and restore old batches.
 
 This service provides functionality to:
 - Archive batches not accessed for 90+ days
-- Compress batch data with tar.gz
+- Compress batch data with zstd, or tar.gz (streamed through pigz/gzip when installed)
+- Write archives to local disk or stream them straight to S3
 - Automatic cleanup of archived batch files
 - Restore archived batches on demand
 """
 
+import bisect
+import json
 import logging
-import tarfile
-import shutil
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, List, Dict
-from datetime import datetime, timedelta
+from typing import Any, Optional, List, Dict
+from datetime import UTC, datetime, timedelta
 from uuid import UUID
 
+from pydantic import BaseModel
+
+from ..config import settings
 from ..models import BatchMetadata
+from ..utils.atomic_write import atomic_write
+from .archive import (
+    GZIP_SUFFIX,
+    STALE_DIR_SUFFIX,
+    ZSTD_AVAILABLE,
+    ZSTD_SUFFIX,
+    extract_tar_archive,
+    move_aside,
+    remove_in_background,
+    verify_archive,
+    write_tar_archive,
+    write_tar_stream,
+)
 from .batch_service import BatchService
 from .storage_service import StorageService
 
 logger = logging.getLogger(__name__)
 
+S3_SCHEME = "s3://"
+
+# Checksum S3 computes and validates for every part of a streamed archive upload
+S3_CHECKSUM_ALGORITHM = "CRC32"
+
+# Batches archived concurrently by auto_archive_old_batches. Compression runs
+# outside the GIL (pigz/gzip process), so threads overlap one batch's
+# compression with another's file reads and deletes
+BATCH_ARCHIVE_MAX_WORKERS = 2
+
+# Per-batch archive sizes kept next to the archives, so statistics need no
+# batch metadata reads: {"batches": {batch_id: [archive_size, original_size]}}
+STATS_FILE_NAME = "_stats.json"
+
+
+class _CountingReader:
+    """Readable wrapper that counts the bytes read through it."""
+
+    def __init__(self, raw: Any):
+        self._raw = raw
+        self.bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._raw.read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+def _is_batch_dir_name(name: str) -> bool:
+    """Whether a directory under the batches root is a batch (not a stale or stray directory)."""
+    if name.endswith(STALE_DIR_SUFFIX):
+        return False
+    try:
+        UUID(name)
+    except ValueError:
+        return False
+    return True
+
+
+class _BatchAccess(BaseModel):
+    """The fields of batch_metadata.json the last-access index needs.
+
+    Validating only these skips building the full BatchMetadata (project
+    statuses, tags, ...) when the index is refreshed; other keys are ignored.
+    """
+
+    created_date: datetime
+    last_accessed: Optional[datetime] = None
+    archived: bool = False
+
+
+def _split_s3_url(url: str) -> tuple[str, str]:
+    """Split "s3://bucket/prefix" into bucket and key prefix (empty or ending in "/")."""
+    bucket, _, prefix = url[len(S3_SCHEME) :].partition("/")
+    if prefix and not prefix.endswith("/"):
+        prefix += "/"
+    return bucket, prefix
+
 
 class BatchArchiveService:
     """
@@ -29,15 +107,54 @@ class BatchArchiveService:
 
     This service manages batch lifecycle:
     - Identifies batches not accessed for specified period
-    - Archives batch data with tar.gz compression
+    - Archives batch data as zstd or gzip compressed tars
     - Tracks archive status in metadata
     - Restores batches from archive on demand
     """
 
-    def __init__(self, batch_service: BatchService, storage_service: StorageService):
+    def __init__(
+        self,
+        batch_service: BatchService,
+        storage_service: StorageService,
+        archive_sink: Optional[str] = None,
+        archive_codec: Optional[str] = None,
+    ):
+        """
+        Initialize the batch archive service.
+
+        Args:
+            batch_service: Batch service owning batch metadata
+            storage_service: Storage service owning project directories
+            archive_sink: "s3://bucket/prefix/" to stream archives to object
+                storage; defaults to settings.batch_archive_sink, and archives
+                are written under data/archives when neither is set
+            archive_codec: "zstd" or "gzip"; defaults to
+                settings.batch_archive_codec. zstd falls back to gzip when
+                zstandard is not installed
+        """
         self.batch_service = batch_service
         self.storage_service = storage_service
         self.archive_threshold_days = 90  # Archive batches not accessed for 90+ days
+        self.archive_sink = archive_sink or settings.batch_archive_sink
+        codec = archive_codec or settings.batch_archive_codec
+        self.archive_suffix = ZSTD_SUFFIX if codec == "zstd" and ZSTD_AVAILABLE else GZIP_SUFFIX
+        self.max_workers = BATCH_ARCHIVE_MAX_WORKERS  # Lower for disk-bound hosts
+        self._s3_client = None
+
+        # Storage paths are fixed for the service lifetime; derive them once
+        self._projects_root = storage_service.projects_dir
+        self._data_root = self._projects_root.parent
+        self._batches_root = self._data_root / "batches"
+        self._archives_root = self._data_root / "archives"
+        self._archives_root.mkdir(parents=True, exist_ok=True)
+
+        self._stats_lock = threading.Lock()
+        # batch_id -> ((metadata mtime_ns, size), last access epoch, archived);
+        # only batches whose metadata file changed are re-read on refresh
+        self._access_index: Dict[str, tuple[tuple[int, int], float, bool]] = {}
+        # (last access epoch, batch_id) of unarchived batches, oldest first
+        self._access_order: List[tuple[float, str]] = []
+        self._access_lock = threading.Lock()
 
     def find_old_batches(self, days_threshold: Optional[int] = None) -> List[BatchMetadata]:
         """
@@ -47,7 +164,7 @@ class BatchArchiveService:
             days_threshold: Number of days of inactivity (default: 90)
 
         Returns:
-            List of BatchMetadata for old batches
+            List of BatchMetadata for old batches, least recently accessed first
         """
         if days_threshold is None:
             days_threshold = self.archive_threshold_days
@@ -56,32 +173,84 @@ class BatchArchiveService:
             f"[BatchArchiveService] Finding batches not accessed for {days_threshold}+ days"
         )
 
-        threshold_date = datetime.now() - timedelta(days=days_threshold)
-        all_batches = self.batch_service.list_batches()
+        threshold = (datetime.now(UTC) - timedelta(days=days_threshold)).timestamp()
 
-        old_batches = []
-        for batch in all_batches:
-            # Check if batch has archived flag (skip already archived)
-            if hasattr(batch, "archived") and batch.archived:
-                continue
-
-            # Get last access date (use created_date if last_accessed not available)
-            last_accessed = getattr(batch, "last_accessed", None)
-            if last_accessed:
-                access_date = datetime.fromisoformat(last_accessed)
-            else:
-                access_date = datetime.fromisoformat(batch.created_date)
+        with self._access_lock:
+            self._refresh_access_index()
+            # Everything before the threshold in the access-ordered index is old
+            cutoff = bisect.bisect_left(self._access_order, (threshold, ""))
+            candidate_ids = [batch_id for _, batch_id in self._access_order[:cutoff]]
 
-            # Check if batch is old enough to archive
-            if access_date < threshold_date:
+        old_batches = []
+        for batch_id in candidate_ids:
+            batch = self.batch_service.load_batch_metadata(UUID(batch_id))
+            if batch is not None and not batch.archived:
                 old_batches.append(batch)
 
         logger.info(f"[BatchArchiveService] Found {len(old_batches)} old batches")
         return old_batches
 
+    def _refresh_access_index(self) -> None:
+        """
+        Bring the last-access index up to date with the batches directory.
+
+        Each batch's metadata file is stat()ed; only new or modified files are
+        parsed. Must be called with _access_lock held.
+        """
+        index: Dict[str, tuple[tuple[int, int], float, bool]] = {}
+        changed = False
+
+        try:
+            it = os.scandir(self._batches_root)
+        except FileNotFoundError:
+            it = None
+        if it is not None:
+            with it:
+                for entry in it:
+                    if not entry.is_dir():
+                        continue
+                    try:
+                        metadata_path = self.batch_service._get_batch_metadata_path(
+                            UUID(entry.name)
+                        )
+                        st = os.stat(metadata_path)
+                    except (ValueError, FileNotFoundError):
+                        continue
+                    stamp = (st.st_mtime_ns, st.st_size)
+
+                    cached = self._access_index.get(entry.name)
+                    if cached is not None and cached[0] == stamp:
+                        index[entry.name] = cached
+                        continue
+
+                    try:
+                        with open(metadata_path, "rb") as f:
+                            access = _BatchAccess.model_validate_json(f.read())
+                    except FileNotFoundError:
+                        continue
+                    except Exception as e:
+                        logger.warning(
+                            f"[BatchArchiveService] Failed to load batch {entry.name}: {e}"
+                        )
+                        continue
+
+                    # Use created_date if last_accessed not available; stored as
+                    # an epoch so lookups compare floats, not datetimes
+                    accessed = access.last_accessed or access.created_date
+                    index[entry.name] = (stamp, accessed.timestamp(), access.archived)
+                    changed = True
+
+        if changed or index.keys() != self._access_index.keys():
+            self._access_order = sorted(
+                (accessed, batch_id)
+                for batch_id, (_, accessed, archived) in index.items()
+                if not archived
+            )
+        self._access_index = index
+
     def archive_batch(self, batch_id: UUID) -> bool:
         """
-        Archive a batch to tar.gz format.
+        Archive a batch to a compressed tar (.tar.zst or .tar.gz).
 
         Args:
             batch_id: Batch ID to archive
@@ -94,34 +263,52 @@ class BatchArchiveService:
         try:
             # Load batch metadata
             metadata = self.batch_service.load_batch_metadata(batch_id)
+            if metadata is None:
+                logger.error(f"[BatchArchiveService] Batch not found: {batch_id}")
+                return False
 
             # Get batch directory
-            batch_dir = self.storage_service.projects_dir.parent / "batches" / str(batch_id)
+            batch_dir = self._batches_root / str(batch_id)
             if not batch_dir.exists():
                 logger.error(f"[BatchArchiveService] Batch directory not found: {batch_dir}")
                 return False
 
-            # Create archive directory if not exists
-            archive_dir = self.storage_service.projects_dir.parent / "archives"
-            archive_dir.mkdir(exist_ok=True)
-
-            # Create tar.gz archive
-            archive_path = archive_dir / f"batch_{batch_id}.tar.gz"
-            logger.info(f"[BatchArchiveService] Creating archive: {archive_path}")
-
-            with tarfile.open(archive_path, "w:gz") as tar:
-                # Add batch directory to archive
-                tar.add(batch_dir, arcname=f"batch_{batch_id}")
-
-                # Add all project directories for this batch
-                for project_id in metadata.project_ids:
-                    project_dir = self.storage_service.projects_dir / str(project_id)
-                    if project_dir.exists():
-                        tar.add(project_dir, arcname=f"projects/{project_id}")
-
-            # Get archive size
-            archive_size = archive_path.stat().st_size
-            original_size = sum(f.stat().st_size for f in batch_dir.rglob("*") if f.is_file())
+            # Batch directory first, then all project directories for this batch
+            sources = [(batch_dir, f"batch_{batch_id}")]
+            for project_id in metadata.project_ids:
+                project_dir = self._projects_root / str(project_id)
+                if project_dir.exists():
+                    sources.append((project_dir, f"projects/{project_id}"))
+
+            archive_name = f"batch_{batch_id}{self.archive_suffix}"
+            if self.archive_sink and self.archive_sink.startswith(S3_SCHEME):
+                # Stream the archive to object storage without a local copy
+                bucket, prefix = _split_s3_url(self.archive_sink)
+                archive_path = f"{S3_SCHEME}{bucket}/{prefix}{archive_name}"
+                logger.info(f"[BatchArchiveService] Uploading archive: {archive_path}")
+                archive_size, original_size = self._upload_archive(
+                    bucket, prefix + archive_name, sources
+                )
+            else:
+                # Create the archive; one left from a previous restore is
+                # replaced, whichever codec wrote it
+                local_archive = self._archives_root / archive_name
+                for suffix in (ZSTD_SUFFIX, GZIP_SUFFIX):
+                    (self._archives_root / f"batch_{batch_id}{suffix}").unlink(missing_ok=True)
+                archive_path = str(local_archive)
+                logger.info(f"[BatchArchiveService] Creating archive: {archive_path}")
+
+                # The archive is read back and checksummed before any source is
+                # deleted, so a bad write cannot lose the batch
+                try:
+                    original_size = write_tar_archive(local_archive, sources)
+                    verify_archive(local_archive)
+                except BaseException:
+                    local_archive.unlink(missing_ok=True)
+                    raise
+
+                # Get archive size
+                archive_size = local_archive.stat().st_size
 
             # Calculate compression ratio
             compression_ratio = (1 - archive_size / original_size) * 100 if original_size > 0 else 0
@@ -135,24 +322,28 @@ class BatchArchiveService:
 
             # Update metadata to mark as archived
             metadata.archived = True
-            metadata.archived_at = datetime.now().isoformat()
-            metadata.archive_path = str(archive_path)
+            metadata.archived_at = datetime.now(UTC)
+            metadata.archive_path = archive_path
             metadata.archive_size = archive_size
             metadata.original_size = original_size
 
             # Save updated metadata
-            metadata_path = batch_dir / "metadata.json"
-            import json
+            self.batch_service._save_batch_metadata(metadata)
+            self._update_archive_stats(batch_id, (archive_size, original_size))
 
-            with open(metadata_path, "w") as f:
-                json.dump(metadata.model_dump(), f, indent=2, default=str)
-
-            # Delete original batch files (but keep metadata for restore)
+            # Delete original batch files (but keep metadata for restore). Each
+            # project directory is renamed aside at once and its files are
+            # deleted in the background; leftovers are removed at startup
+            stale_dirs = []
             for project_id in metadata.project_ids:
-                project_dir = self.storage_service.projects_dir / str(project_id)
-                if project_dir.exists():
-                    shutil.rmtree(project_dir)
-                    logger.info(f"[BatchArchiveService] Deleted project directory: {project_id}")
+                project_dir = self._projects_root / str(project_id)
+                try:
+                    stale_dirs.append(move_aside(project_dir))
+                except FileNotFoundError:
+                    continue
+                logger.info(f"[BatchArchiveService] Deleted project directory: {project_id}")
+            if stale_dirs:
+                remove_in_background(*stale_dirs)
 
             logger.info(f"[BatchArchiveService] Batch {batch_id} archived successfully")
             return True
@@ -178,59 +369,55 @@ class BatchArchiveService:
         try:
             # Load batch metadata
             metadata = self.batch_service.load_batch_metadata(batch_id)
+            if metadata is None:
+                logger.error(f"[BatchArchiveService] Batch not found: {batch_id}")
+                return False
 
             # Check if batch is archived
             if not getattr(metadata, "archived", False):
                 logger.warning(f"[BatchArchiveService] Batch {batch_id} is not archived")
                 return False
 
-            # Get archive path
-            archive_path = Path(getattr(metadata, "archive_path", ""))
-            if not archive_path.exists():
-                logger.error(f"[BatchArchiveService] Archive not found: {archive_path}")
+            archive_location = metadata.archive_path or ""
+            from_s3 = archive_location.startswith(S3_SCHEME)
+            if not from_s3 and not Path(archive_location).is_file():
+                logger.error(f"[BatchArchiveService] Archive not found: {archive_location}")
                 return False
 
-            logger.info(f"[BatchArchiveService] Extracting archive: {archive_path}")
-
-            # Extract archive
-            with tarfile.open(archive_path, "r:gz") as tar:
-                # Extract to temporary directory first
-                temp_extract_dir = self.storage_service.projects_dir.parent / "temp_restore"
-                temp_extract_dir.mkdir(exist_ok=True)
-
-                tar.extractall(temp_extract_dir)
-
-                # Move batch directory back
-                batch_dir = self.storage_service.projects_dir.parent / "batches" / str(batch_id)
-                extracted_batch_dir = temp_extract_dir / f"batch_{batch_id}"
-                if extracted_batch_dir.exists():
-                    if batch_dir.exists():
-                        shutil.rmtree(batch_dir)
-                    shutil.move(str(extracted_batch_dir), str(batch_dir))
-
-                # Move project directories back
-                projects_extract_dir = temp_extract_dir / "projects"
-                if projects_extract_dir.exists():
-                    for project_dir in projects_extract_dir.iterdir():
-                        project_id = project_dir.name
-                        target_dir = self.storage_service.projects_dir / project_id
-                        if target_dir.exists():
-                            shutil.rmtree(target_dir)
-                        shutil.move(str(project_dir), str(target_dir))
-
-                # Clean up temp directory
-                shutil.rmtree(temp_extract_dir)
+            # Extract straight into place: batch_<id>/ goes back under batches/,
+            # projects/<project_id>/ under the projects directory
+            data_root = self._data_root
+            batch_prefix = f"batch_{batch_id}"
+            projects_name = self._projects_root.name
+
+            def _restore_path(name: str) -> Optional[str]:
+                top, sep, rest = name.partition("/")
+                if top == batch_prefix:
+                    return f"batches/{batch_id}{sep}{rest}"
+                if top == "projects":
+                    return f"{projects_name}{sep}{rest}"
+                return None
+
+            if from_s3:
+                logger.info(f"[BatchArchiveService] Downloading archive: {archive_location}")
+                bucket, _, key = archive_location[len(S3_SCHEME) :].partition("/")
+                archive_path = data_root / f"{key.rpartition('/')[2]}.part"
+                try:
+                    self._get_s3_client().download_file(bucket, key, str(archive_path))
+                    extract_tar_archive(archive_path, data_root, rename=_restore_path)
+                finally:
+                    archive_path.unlink(missing_ok=True)
+            else:
+                logger.info(f"[BatchArchiveService] Extracting archive: {archive_location}")
+                extract_tar_archive(Path(archive_location), data_root, rename=_restore_path)
 
             # Update metadata to mark as not archived
             metadata.archived = False
-            metadata.restored_at = datetime.now().isoformat()
+            metadata.restored_at = datetime.now(UTC)
 
             # Save updated metadata
-            metadata_path = batch_dir / "metadata.json"
-            import json
-
-            with open(metadata_path, "w") as f:
-                json.dump(metadata.model_dump(), f, indent=2, default=str)
+            self.batch_service._save_batch_metadata(metadata)
+            self._update_archive_stats(batch_id, None)
 
             logger.info(f"[BatchArchiveService] Batch {batch_id} restored successfully")
             return True
@@ -241,24 +428,157 @@ class BatchArchiveService:
             )
             return False
 
+    def _get_s3_client(self) -> Any:
+        """Create (once) the S3 client for the archive sink, from storage settings."""
+        if self._s3_client is None:
+            import boto3
+
+            self._s3_client = boto3.client(
+                "s3",
+                region_name=settings.s3_region,
+                aws_access_key_id=settings.s3_access_key,
+                aws_secret_access_key=settings.s3_secret_key,
+                endpoint_url=settings.s3_endpoint_url,
+                use_ssl=settings.s3_use_ssl,
+                verify=settings.s3_ca_bundle or settings.s3_verify,
+            )
+        return self._s3_client
+
+    def _upload_archive(
+        self, bucket: str, key: str, sources: List[tuple[Path, str]]
+    ) -> tuple[int, int]:
+        """
+        Stream a compressed tar of sources to S3 through a pipe, without a local file.
+
+        The archive is written on a producer thread into the pipe while
+        upload_fileobj reads it as a multipart upload, with per-part checksums
+        S3 validates on receipt. The object is deleted if the producer fails or
+        the stored object's size differs from the bytes produced, so the
+        sources are only removed once the upload is known to be complete.
+
+        Args:
+            bucket: Destination bucket
+            key: Destination object key; its suffix selects zstd or gzip
+            sources: (directory, name inside the archive) pairs
+
+        Returns:
+            Tuple of (uploaded archive size, total size of the archived files) in bytes
+
+        Raises:
+            RuntimeError: If the stored object does not match the archive written
+        """
+        client = self._get_s3_client()
+        read_fd, write_fd = os.pipe()
+        errors: List[BaseException] = []
+        original_sizes: List[int] = []
+
+        def _produce() -> None:
+            try:
+                with open(write_fd, "wb") as out:
+                    zstd = key.endswith(ZSTD_SUFFIX)
+                    original_sizes.append(write_tar_stream(out, sources, zstd=zstd))
+            except BaseException as e:  # Reported after the upload finishes
+                errors.append(e)
+
+        producer = threading.Thread(target=_produce, name="batch-archive-upload", daemon=True)
+        producer.start()
+        try:
+            with open(read_fd, "rb") as pipe:
+                reader = _CountingReader(pipe)
+                client.upload_fileobj(
+                    reader, bucket, key, ExtraArgs={"ChecksumAlgorithm": S3_CHECKSUM_ALGORITHM}
+                )
+        finally:
+            producer.join()
+
+        if errors:
+            client.delete_object(Bucket=bucket, Key=key)
+            raise errors[0]
+
+        archive_size = client.head_object(Bucket=bucket, Key=key)["ContentLength"]
+        if archive_size != reader.bytes_read:
+            client.delete_object(Bucket=bucket, Key=key)
+            raise RuntimeError(
+                f"Uploaded s3://{bucket}/{key} is {archive_size} bytes, "
+                f"expected {reader.bytes_read}"
+            )
+        return archive_size, original_sizes[0]
+
+    def _stats_path(self) -> Path:
+        """Path of the aggregated archive statistics file."""
+        return self._archives_root / STATS_FILE_NAME
+
+    def _load_archive_stats(self) -> Dict[str, List[int]]:
+        """
+        Load per-batch archive sizes, rebuilding them from batch metadata once.
+
+        Returns:
+            Mapping of batch ID string to [archive_size, original_size]
+        """
+        try:
+            with open(self._stats_path(), "rb") as f:
+                return json.load(f)["batches"]
+        except FileNotFoundError:
+            pass
+
+        # First use (or archives made before the stats file existed)
+        stats = {
+            str(batch.batch_id): [batch.archive_size or 0, batch.original_size or 0]
+            for batch in self.batch_service.list_batches()
+            if batch.archived
+        }
+        self._write_archive_stats(stats)
+        return stats
+
+    def _write_archive_stats(self, stats: Dict[str, List[int]]) -> None:
+        """Atomically replace the archive statistics file."""
+        data = json.dumps({"batches": stats}, separators=(",", ":")).encode()
+        atomic_write(self._stats_path(), data)
+
+    def _update_archive_stats(self, batch_id: UUID, sizes: Optional[tuple[int, int]]) -> None:
+        """
+        Record (or, with sizes=None, forget) one batch's archive sizes.
+
+        Args:
+            batch_id: Batch ID
+            sizes: (archive_size, original_size) of a newly archived batch,
+                or None when the batch was restored
+        """
+        with self._stats_lock:
+            stats = self._load_archive_stats()
+            if sizes is None:
+                stats.pop(str(batch_id), None)
+            else:
+                stats[str(batch_id)] = list(sizes)
+            self._write_archive_stats(stats)
+
     def get_archive_statistics(self) -> Dict:
         """
         Get archive statistics.
 
+        Reads the aggregated statistics file and counts batch directories
+        (stale and non-batch directories are skipped); no batch metadata is
+        loaded. Archived batches whose directory has since been deleted are
+        left out.
+
         Returns:
             Dictionary with archive statistics
         """
-        all_batches = self.batch_service.list_batches()
+        try:
+            with os.scandir(self._batches_root) as it:
+                batch_ids = {
+                    entry.name for entry in it if entry.is_dir() and _is_batch_dir_name(entry.name)
+                }
+        except FileNotFoundError:
+            batch_ids = set()
 
-        archived_count = 0
-        total_archive_size = 0
-        total_original_size = 0
+        with self._stats_lock:
+            stats = self._load_archive_stats()
 
-        for batch in all_batches:
-            if getattr(batch, "archived", False):
-                archived_count += 1
-                total_archive_size += getattr(batch, "archive_size", 0)
-                total_original_size += getattr(batch, "original_size", 0)
+        archived = [sizes for batch_id, sizes in stats.items() if batch_id in batch_ids]
+        archived_count = len(archived)
+        total_archive_size = sum(sizes[0] for sizes in archived)
+        total_original_size = sum(sizes[1] for sizes in archived)
 
         space_saved = total_original_size - total_archive_size
         compression_ratio = (
@@ -266,9 +586,9 @@ class BatchArchiveService:
         )
 
         return {
-            "total_batches": len(all_batches),
+            "total_batches": len(batch_ids),
             "archived_batches": archived_count,
-            "active_batches": len(all_batches) - archived_count,
+            "active_batches": len(batch_ids) - archived_count,
             "total_archive_size": total_archive_size,
             "total_original_size": total_original_size,
             "space_saved": space_saved,
@@ -300,16 +620,19 @@ class BatchArchiveService:
                 "batch_ids": [str(b.batch_id) for b in old_batches],
             }
 
-        # Archive old batches
-        archived_count = 0
-        failed_count = 0
+        # Archive old batches; each batch is independent
+        batch_ids = [b.batch_id for b in old_batches]
+        if len(batch_ids) > 1 and self.max_workers > 1:
+            with ThreadPoolExecutor(
+                max_workers=min(len(batch_ids), self.max_workers),
+                thread_name_prefix="batch-archive",
+            ) as executor:
+                results = list(executor.map(self.archive_batch, batch_ids))
+        else:
+            results = [self.archive_batch(batch_id) for batch_id in batch_ids]
 
-        for batch in old_batches:
-            success = self.archive_batch(batch.batch_id)
-            if success:
-                archived_count += 1
-            else:
-                failed_count += 1
+        archived_count = sum(results)
+        failed_count = len(results) - archived_count
 
         logger.info(
             f"[BatchArchiveService] Auto-archive completed. "
@@ -326,13 +649,21 @@ class BatchArchiveService:
 
 # Global instance (singleton)
 _batch_archive_service_instance: Optional[BatchArchiveService] = None
+_batch_archive_service_lock = threading.Lock()
 
 
 def get_batch_archive_service(
     batch_service: BatchService, storage_service: StorageService
 ) -> BatchArchiveService:
-    """Get or create the global batch archive service instance."""
+    """Get or create the global batch archive service instance.
+
+    Safe to call from several threads: exactly one instance is created.
+    """
     global _batch_archive_service_instance
-    if _batch_archive_service_instance is None:
-        _batch_archive_service_instance = BatchArchiveService(batch_service, storage_service)
-    return _batch_archive_service_instance
+    if _batch_archive_service_instance is not None:
+        return _batch_archive_service_instance
+
+    with _batch_archive_service_lock:
+        if _batch_archive_service_instance is None:
+            _batch_archive_service_instance = BatchArchiveService(batch_service, storage_service)
+        return _batch_archive_service_instance
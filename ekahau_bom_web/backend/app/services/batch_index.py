@@ -0,0 +1,281 @@
+"""SQLite index of batches, so listings need not open every batch's metadata."""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+from uuid import UUID
+
+from app.models import BatchMetadata, BatchStatus
+
+logger = logging.getLogger(__name__)
+
+# Index database name inside the batches directory
+BATCH_INDEX_FILE = "_index.sqlite3"
+
+# Bump to rebuild existing indexes after a schema change
+SCHEMA_VERSION = 1
+
+# Shortest search the trigram full-text index can answer
+_FTS_MIN_QUERY = 3
+
+# Sort fields and the columns they order by
+SORT_COLUMNS = {
+    "date": "created_ts",
+    "name": "name_key",
+    "project_count": "project_count",
+    "success_rate": "success_rate",
+}
+
+_SCHEMA = """
+CREATE TABLE batches (
+    batch_id TEXT NOT NULL UNIQUE,
+    name_key TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_ts REAL NOT NULL,
+    project_count INTEGER NOT NULL,
+    success_rate REAL NOT NULL,
+    search_text TEXT NOT NULL
+);
+CREATE INDEX batches_created ON batches (created_ts);
+CREATE INDEX batches_name ON batches (name_key);
+CREATE INDEX batches_status ON batches (status, created_ts);
+CREATE TABLE batch_tags (
+    tag TEXT NOT NULL,
+    batch_rowid INTEGER NOT NULL,
+    PRIMARY KEY (tag, batch_rowid)
+) WITHOUT ROWID;
+"""
+
+# Full-text table over batch and project names; optional in SQLite builds
+_FTS_SCHEMA = "CREATE VIRTUAL TABLE batch_text USING fts5(text, tokenize='trigram')"
+
+
+class BatchIndex:
+    """SQLite database with one row per batch, its tags and its searchable text.
+
+    Every metadata save upserts the batch's row and deletions remove it, so
+    list_batches can push filtering, sorting and limiting down into a single
+    indexed query. Substring search goes through an FTS5 trigram table when
+    SQLite has it, and otherwise (or for short queries) is one instr() over
+    the batch name and filenames, lowercased when saved. The database is
+    built from the batch metadata files on first query, and rebuilt when its
+    schema version is out of date; saves made before then are left to the
+    build.
+    """
+
+    def __init__(self, path: Path, load_all: Callable[[], Iterable[BatchMetadata]]):
+        """Initialize the index.
+
+        Args:
+            path: Index database file
+            load_all: Returns the metadata of every batch, to build the index
+        """
+        self.path = path
+        self._load_all = load_all
+        self._db: Optional[sqlite3.Connection] = None
+        self._fts = False
+        self._lock = threading.Lock()
+
+    def query(
+        self,
+        status: Optional[BatchStatus] = None,
+        tags: Optional[list[str]] = None,
+        search_query: Optional[str] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        min_projects: Optional[int] = None,
+        max_projects: Optional[int] = None,
+        sort_by: str = "date",
+        sort_order: str = "desc",
+        limit: Optional[int] = None,
+    ) -> list[UUID]:
+        """Get the IDs of the matching batches, in order.
+
+        Takes the filters and sorting of BatchService.list_batches.
+
+        Returns:
+            Batch UUIDs
+        """
+        with self._lock:
+            if not self.path.parent.is_dir():
+                return []
+            db = self._connect()
+
+            where = []
+            params: list = []
+            if status is not None:
+                where.append("status = ?")
+                params.append(BatchStatus(status).value)
+            for tag in dict.fromkeys(tags or ()):
+                where.append("rowid IN (SELECT batch_rowid FROM batch_tags WHERE tag = ?)")
+                params.append(tag)
+            if created_after:
+                where.append("created_ts >= ?")
+                params.append(created_after.timestamp())
+            if created_before:
+                where.append("created_ts <= ?")
+                params.append(created_before.timestamp())
+            if min_projects is not None:
+                where.append("project_count >= ?")
+                params.append(min_projects)
+            if max_projects is not None:
+                where.append("project_count <= ?")
+                params.append(max_projects)
+            if search_query:
+                needle = search_query.lower()
+                if self._fts and len(needle) >= _FTS_MIN_QUERY:
+                    where.append("rowid IN (SELECT rowid FROM batch_text WHERE batch_text MATCH ?)")
+                    params.append('"%s"' % needle.replace('"', '""'))
+                else:
+                    # search_text is lowercased on save: a plain substring test
+                    where.append("instr(search_text, ?) > 0")
+                    params.append(needle)
+
+            sql = "SELECT batch_id FROM batches"
+            if where:
+                sql += " WHERE " + " AND ".join(where)
+            direction = "DESC" if sort_order == "desc" else "ASC"
+            sql += f" ORDER BY {SORT_COLUMNS.get(sort_by, 'created_ts')} {direction}, rowid"
+            if limit:
+                sql += " LIMIT ?"
+                params.append(limit)
+
+            return [UUID(row[0]) for row in db.execute(sql, params)]
+
+    def record(self, metadata: BatchMetadata) -> None:
+        """Insert or update a batch's row."""
+        with self._lock:
+            db = self._connect_existing()
+            if db is None:
+                return
+            try:
+                with db:
+                    db.execute("BEGIN IMMEDIATE")
+                    self._upsert(db, metadata)
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to index batch {metadata.batch_id}: {e}")
+
+    def remove(self, batch_id: UUID) -> None:
+        """Remove a batch's row."""
+        with self._lock:
+            db = self._connect_existing()
+            if db is None:
+                return
+            try:
+                with db:
+                    db.execute("BEGIN IMMEDIATE")
+                    self._delete(db, str(batch_id))
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to unindex batch {batch_id}: {e}")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _connect_existing(self) -> Optional[sqlite3.Connection]:
+        # Saves before the first query leave the index to be built from the files
+        if self._db is None and not self.path.exists():
+            return None
+        return self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is not None:
+            return self._db
+
+        db = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute("PRAGMA busy_timeout=5000")
+        try:
+            with db:
+                db.execute("BEGIN IMMEDIATE")
+                if db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                    self._build(db)
+        except BaseException:
+            db.close()
+            raise
+        self._fts = (
+            db.execute("SELECT 1 FROM sqlite_master WHERE name = 'batch_text'").fetchone()
+            is not None
+        )
+        self._db = db
+        return db
+
+    def _build(self, db: sqlite3.Connection) -> None:
+        """Create the tables and fill them from the batch metadata files."""
+        for (name,) in db.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+        ).fetchall():
+            if not name.startswith("batch_text_"):  # FTS shadow tables go with batch_text
+                db.execute(f"DROP TABLE IF EXISTS {name}")
+        for statement in _SCHEMA.split(";"):
+            if statement.strip():
+                db.execute(statement)
+        try:
+            db.execute(_FTS_SCHEMA)
+            self._fts = True
+        except sqlite3.OperationalError:
+            logger.info("SQLite has no FTS5 trigram tokenizer; batch search scans the index")
+            self._fts = False
+
+        for metadata in self._load_all():
+            self._upsert(db, metadata)
+        db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _upsert(self, db: sqlite3.Connection, metadata: BatchMetadata) -> None:
+        stats = metadata.statistics
+        search_text = "\n".join(
+            [metadata.batch_name or ""] + [ps.filename for ps in metadata.project_statuses]
+        ).lower()
+        rowid = db.execute(
+            """
+            INSERT INTO batches (batch_id, name_key, status, created_ts, project_count,
+                                 success_rate, search_text)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (batch_id) DO UPDATE SET
+                name_key = excluded.name_key,
+                status = excluded.status,
+                created_ts = excluded.created_ts,
+                project_count = excluded.project_count,
+                success_rate = excluded.success_rate,
+                search_text = excluded.search_text
+            RETURNING rowid
+            """,
+            (
+                str(metadata.batch_id),
+                (metadata.batch_name or "").lower(),
+                metadata.status.value,
+                metadata.created_date.timestamp(),
+                len(metadata.project_ids),
+                stats.successful_projects / stats.total_projects if stats.total_projects else 0.0,
+                search_text,
+            ),
+        ).fetchone()[0]
+
+        db.execute("DELETE FROM batch_tags WHERE batch_rowid = ?", (rowid,))
+        db.executemany(
+            "INSERT INTO batch_tags (tag, batch_rowid) VALUES (?, ?)",
+            [(tag, rowid) for tag in dict.fromkeys(metadata.tags)],
+        )
+        if self._fts:
+            db.execute(
+                "INSERT OR REPLACE INTO batch_text (rowid, text) VALUES (?, ?)",
+                (rowid, search_text),
+            )
+
+    def _delete(self, db: sqlite3.Connection, batch_id: str) -> None:
+        row = db.execute("DELETE FROM batches WHERE batch_id = ? RETURNING rowid", (batch_id,))
+        row = row.fetchone()
+        if row is None:
+            return
+        db.execute("DELETE FROM batch_tags WHERE batch_rowid = ?", row)
+        if self._fts:
+            db.execute("DELETE FROM batch_text WHERE rowid = ?", row)
@@ -3,11 +3,21 @@
 from __future__ import annotations
 
 import asyncio
+import csv
+import io
 import json
 import logging
+import os
+import shutil
+import tempfile
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import UTC, datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 from uuid import UUID
 
 from app.models import (
@@ -19,13 +29,105 @@ from app.models import (
     ProcessingRequest,
     ProcessingStatus,
     ProjectMetadata,
+    utc_now,
 )
+from app.services.archive import STALE_DIR_SUFFIX, move_aside, remove_in_background
+from app.services.batch_index import BATCH_INDEX_FILE, BatchIndex
 from app.services.processor import ProcessorService
 from app.services.storage_service import StorageService
+from app.utils.atomic_write import atomic_write
+from app.utils.zip_entries import deflate_file, write_deflated, write_stored
 from app.websocket import connection_manager
 
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# While a batch is processing, its status updates are buffered in memory and
+# written out at most this often (seconds), plus once when it finishes
+METADATA_FLUSH_INTERVAL = 5.0
+
+# Batch progress is broadcast with a project result when it moved by at least
+# this many percent, or when the last broadcast is this old (seconds)
+PROGRESS_BROADCAST_STEP = 1
+PROGRESS_BROADCAST_INTERVAL = 0.25
+
+# Batch archive entries that are already compressed are stored as-is;
+# the rest (text reports) are deflated at this level
+ARCHIVE_STORED_SUFFIXES = frozenset({".esx", ".zip", ".png", ".jpg", ".jpeg", ".pdf", ".xlsx"})
+ARCHIVE_COMPRESSLEVEL = 1
+
+
+# Threads reading and deflating batch archive entries
+ARCHIVE_WORKERS = os.cpu_count() or 1
+
+# Archive entries prepared ahead of the writer; bounds the deflated data held in memory
+ARCHIVE_READ_AHEAD = 2 * ARCHIVE_WORKERS
+
+
+def _prepare_archive_file(path: Path, arcname: str):
+    """Deflate a batch archive file ahead of writing, unless it is stored as-is.
+
+    Returns:
+        deflate_file() result, or None for files to store
+    """
+    if path.suffix.lower() in ARCHIVE_STORED_SUFFIXES:
+        return None
+    return deflate_file(path, arcname, ARCHIVE_COMPRESSLEVEL)  # ISA-L when available
+
+
+def _write_archive_entry(zipf: zipfile.ZipFile, arcname: str, path: Path, prepared: Future) -> None:
+    """Write one batch archive file once its _prepare_archive_file() future is done."""
+    entry = prepared.result()
+    if entry is None:
+        write_stored(zipf, path, arcname)
+    else:
+        write_deflated(zipf, *entry)
+
+
+@lru_cache(maxsize=4096)
+def _uuid_str(value: UUID) -> str:
+    """str() of a UUID, cached for the IDs used in path joins."""
+    return str(value)
+
+
+def _load_json_file(path: Path):
+    """Parse a JSON file, with orjson when it is installed."""
+    data = path.read_bytes()
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+
+def _iter_csv_columns(path: Path, *columns: tuple[str, str]) -> Iterator[tuple[str, ...]]:
+    """Stream some columns of a report CSV, skipping "#" comment lines.
+
+    Column positions are looked up once in the header, so rows are plain
+    lists rather than DictReader dicts.
+
+    Args:
+        path: CSV file
+        columns: (header, default) pairs; a column missing from the file yields its default
+
+    Yields:
+        The row's values for the columns, with surrounding quotes stripped
+    """
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(line for line in f if not line.startswith("#"))
+        header = next(reader, None)
+        if header is None:
+            return
+        picks = [
+            (header.index(name) if name in header else None, default) for name, default in columns
+        ]
+        for row in reader:
+            if not row:
+                continue  # Blank line
+            yield tuple((row[i] if i is not None else default).strip('"') for i, default in picks)
+
 
 class BatchService:
     """Service for managing batch processing of multiple projects."""
@@ -38,6 +140,26 @@ class BatchService:
         """
         self.storage = storage_service or StorageService()
         self.batches_dir = Path("batches")
+        self._dirty: set[UUID] = set()  # batches with unsaved status updates
+        self._last_flush: dict[UUID, float] = {}  # batch_id -> monotonic time of last write
+        # batch_id -> ((inode, mtime_ns, size) of the metadata file, parsed metadata)
+        self._metadata_cache: dict[UUID, tuple[tuple[int, int, int], BatchMetadata]] = {}
+        self._batch_index: Optional[BatchIndex] = None  # see _get_batch_index()
+        self._processor: Optional[ProcessorService] = None  # see _get_processor()
+        # project_id -> (stat stamps of the BOM report files, BOM counts)
+        self._bom_cache: dict[UUID, tuple[tuple, BatchStatistics]] = {}
+        # (projects_dir, batches_dir, batches root) from the last _batches_root lookup
+        self._batches_root_cache: Optional[tuple[Path, Path, Path]] = None
+
+    @property
+    def _batches_root(self) -> Path:
+        """Directory holding all batches, recomputed only when the storage paths change."""
+        projects_dir = self.storage.projects_dir
+        cached = self._batches_root_cache
+        if cached is None or cached[0] is not projects_dir or cached[1] is not self.batches_dir:
+            root = projects_dir.parent / self.batches_dir
+            cached = self._batches_root_cache = (projects_dir, self.batches_dir, root)
+        return cached[2]
 
     def _get_batch_dir(self, batch_id: UUID) -> Path:
         """Get batch directory path.
@@ -48,7 +170,7 @@ class BatchService:
         Returns:
             Path to batch directory
         """
-        return self.storage.projects_dir.parent / self.batches_dir / str(batch_id)
+        return self._batches_root / _uuid_str(batch_id)
 
     def _get_batch_metadata_path(self, batch_id: UUID) -> Path:
         """Get path to batch metadata file.
@@ -79,8 +201,10 @@ class BatchService:
         Returns:
             Created batch metadata
         """
+        created_date = utc_now()
         metadata = BatchMetadata(
-            batch_name=batch_name or f"Batch {datetime.now(UTC).strftime('%Y-%m-%d %H:%M')}",
+            batch_name=batch_name or f"Batch {created_date.strftime('%Y-%m-%d %H:%M')}",
+            created_date=created_date,
             processing_options=processing_options or ProcessingRequest(),
             parallel_workers=parallel_workers,
             template_id=template_id,
@@ -109,12 +233,67 @@ class BatchService:
         metadata_path = self._get_batch_metadata_path(metadata.batch_id)
         metadata_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(metadata_path, "w", encoding="utf-8") as f:
-            json.dump(metadata.model_dump(mode="json"), f, indent=2, default=str)
+        # Compact JSON, atomically replaced: a crash never leaves it truncated
+        atomic_write(metadata_path, metadata.model_dump_json().encode("utf-8"))
+        self._metadata_cache.pop(metadata.batch_id, None)
+        self._get_batch_index().record(metadata)
+
+    def _flush_batch_metadata(self, metadata: BatchMetadata, force: bool = False) -> None:
+        """Write buffered status updates of a batch, throttled to METADATA_FLUSH_INTERVAL.
+
+        Args:
+            metadata: Batch metadata holding the updates
+            force: Write now, even if nothing is buffered or the last write was recent
+        """
+        batch_id = metadata.batch_id
+        if not force and batch_id not in self._dirty:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_flush.get(batch_id, 0.0) < METADATA_FLUSH_INTERVAL:
+            return
+
+        self._save_batch_metadata(metadata)
+        self._dirty.discard(batch_id)
+        self._last_flush[batch_id] = now
+
+    async def _flush_batch_metadata_async(
+        self, metadata: BatchMetadata, force: bool = False
+    ) -> None:
+        """Run _flush_batch_metadata() in a worker thread, if anything is buffered.
+
+        Args:
+            metadata: Batch metadata holding the updates
+            force: Write now, even if nothing is buffered or the last write was recent
+        """
+        if not force and metadata.batch_id not in self._dirty:
+            return
+        await asyncio.to_thread(self._flush_batch_metadata, metadata, force)
 
     def load_batch_metadata(self, batch_id: UUID) -> Optional[BatchMetadata]:
         """Load batch metadata from storage.
 
+        Args:
+            batch_id: Batch UUID
+
+        Returns:
+            Batch metadata or None if not found
+        """
+        try:
+            data = self._get_batch_metadata_path(batch_id).read_bytes()
+        except FileNotFoundError:
+            return None
+
+        # Parsed and validated in one pass by pydantic-core, no intermediate dict
+        return BatchMetadata.model_validate_json(data)
+
+    def _get_cached_batch_metadata(self, batch_id: UUID) -> Optional[BatchMetadata]:
+        """Load batch metadata for read-only use, parsing the file only when it changed.
+
+        Every save replaces the file (new inode), so the stat stamp changes
+        even when two writes land within one mtime tick. The returned object
+        is shared with later calls and must not be modified; use
+        load_batch_metadata() for metadata that will be changed.
+
         Args:
             batch_id: Batch UUID
 
@@ -122,12 +301,21 @@ class BatchService:
             Batch metadata or None if not found
         """
         metadata_path = self._get_batch_metadata_path(batch_id)
-        if not metadata_path.exists():
+        try:
+            st = os.stat(metadata_path)
+        except FileNotFoundError:
+            self._metadata_cache.pop(batch_id, None)
             return None
 
-        with open(metadata_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            return BatchMetadata(**data)
+        stamp = (st.st_ino, st.st_mtime_ns, st.st_size)
+        cached = self._metadata_cache.get(batch_id)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        metadata = self.load_batch_metadata(batch_id)
+        if metadata is not None:
+            self._metadata_cache[batch_id] = (stamp, metadata)
+        return metadata
 
     def list_batches(
         self,
@@ -157,89 +345,66 @@ class BatchService:
             limit: Optional limit
 
         Returns:
-            List of batch metadata
+            List of batch metadata, shared with the metadata cache: read-only
         """
-        batches_base = self.storage.projects_dir.parent / self.batches_dir
+        # Filtering, sorting and the limit run in the index; only the batches returned are loaded
+        index = self._get_batch_index()
+        batch_ids = index.query(
+            status=status,
+            tags=tags,
+            search_query=search_query,
+            created_after=created_after,
+            created_before=created_before,
+            min_projects=min_projects,
+            max_projects=max_projects,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            limit=limit,
+        )
+
+        batches = []
+        for batch_id in batch_ids:
+            try:
+                metadata = self._get_cached_batch_metadata(batch_id)
+            except Exception as e:
+                logger.warning(f"Failed to load batch {batch_id}: {e}")
+                continue
+            if metadata:
+                batches.append(metadata)
+            else:
+                index.remove(batch_id)  # Deleted behind the index's back
+
+        return batches
+
+    def _get_batch_index(self) -> BatchIndex:
+        """Get the index of the current batches directory."""
+        path = self._batches_root / BATCH_INDEX_FILE
+        index = self._batch_index
+        if index is None or index.path != path:
+            if index is not None:
+                index.close()
+            index = self._batch_index = BatchIndex(path, self._scan_batch_metadata)
+        return index
+
+    def _scan_batch_metadata(self) -> list[BatchMetadata]:
+        """Load the metadata of every batch directory, to (re)build the index."""
+        batches_base = self._batches_root
         if not batches_base.exists():
             return []
 
         batches = []
         for batch_dir in batches_base.iterdir():
-            if not batch_dir.is_dir():
+            if not batch_dir.is_dir() or batch_dir.name.endswith(STALE_DIR_SUFFIX):
                 continue
 
             try:
-                batch_id = UUID(batch_dir.name)
-                metadata = self.load_batch_metadata(batch_id)
+                metadata = self._get_cached_batch_metadata(UUID(batch_dir.name))
                 if metadata:
-                    # Filter by status
-                    if status is not None and metadata.status != status:
-                        continue
-
-                    # Filter by tags (batch must have ALL specified tags)
-                    if tags:
-                        batch_tags = set(metadata.tags)
-                        required_tags = set(tags)
-                        if not required_tags.issubset(batch_tags):
-                            continue
-
-                    # Filter by date range
-                    if created_after and metadata.created_date < created_after:
-                        continue
-                    if created_before and metadata.created_date > created_before:
-                        continue
-
-                    # Filter by project count
-                    project_count = len(metadata.project_ids)
-                    if min_projects is not None and project_count < min_projects:
-                        continue
-                    if max_projects is not None and project_count > max_projects:
-                        continue
-
-                    # Filter by search query (batch name or project filenames)
-                    if search_query:
-                        query_lower = search_query.lower()
-                        batch_name_match = (
-                            metadata.batch_name and query_lower in metadata.batch_name.lower()
-                        )
-                        # Check if any project filename matches
-                        project_match = any(
-                            query_lower in ps.filename.lower() for ps in metadata.project_statuses
-                        )
-                        if not (batch_name_match or project_match):
-                            continue
-
                     batches.append(metadata)
             except (ValueError, Exception) as e:
                 logger.warning(f"Failed to load batch {batch_dir.name}: {e}")
                 continue
 
-        # Sort batches
-        reverse = sort_order == "desc"
-
-        if sort_by == "date":
-            batches.sort(key=lambda b: b.created_date, reverse=reverse)
-        elif sort_by == "name":
-            batches.sort(
-                key=lambda b: (b.batch_name or "").lower(),
-                reverse=reverse,
-            )
-        elif sort_by == "project_count":
-            batches.sort(key=lambda b: len(b.project_ids), reverse=reverse)
-        elif sort_by == "success_rate":
-            # Calculate success rate (avoid division by zero)
-            def success_rate(b: BatchMetadata) -> float:
-                total = b.statistics.total_projects
-                return b.statistics.successful_projects / total if total > 0 else 0.0
-
-            batches.sort(key=success_rate, reverse=reverse)
-        else:
-            # Default to date sorting
-            batches.sort(key=lambda b: b.created_date, reverse=reverse)
-
-        if limit:
-            batches = batches[:limit]
-
         return batches
 
     def add_project_to_batch(self, batch_id: UUID, project_id: UUID, filename: str) -> None:
@@ -308,8 +473,12 @@ class BatchService:
         for tag in tags_to_remove:
             current_tags.discard(tag.strip())
 
+        # Nothing to write if the edit changes nothing (clients may resend the same tags)
+        if current_tags == set(metadata.tags):
+            return metadata.tags
+
         # Update metadata
-        metadata.tags = sorted(list(current_tags))  # Keep tags sorted
+        metadata.tags = sorted(current_tags)  # Keep tags sorted
         self._save_batch_metadata(metadata)
 
         logger.info(
@@ -329,109 +498,148 @@ class BatchService:
         Returns:
             Updated batch metadata with results
         """
-        metadata = self.load_batch_metadata(batch_id)
+        # File IO runs in worker threads so websocket sends and other
+        # requests are not held up by the disk
+        metadata = await asyncio.to_thread(self.load_batch_metadata, batch_id)
         if not metadata:
             raise ValueError(f"Batch {batch_id} not found")
 
         # Update status
         metadata.status = BatchStatus.PROCESSING
         metadata.processing_started = datetime.now(UTC)
-        self._save_batch_metadata(metadata)
+        await self._flush_batch_metadata_async(metadata, force=True)
+        total = len(metadata.project_ids)
 
         # Broadcast batch started
         await connection_manager.send_batch_update(
             batch_id=batch_id,
             status="processing",
             progress=0,
-            message=f"Started processing {len(metadata.project_ids)} projects",
+            message=f"Started processing {total} projects",
         )
 
-        logger.info(
-            f"Starting batch processing for {batch_id}: {len(metadata.project_ids)} projects"
-        )
-
-        # Process projects (sequential for now, parallel implementation later)
-        for idx, project_id in enumerate(metadata.project_ids):
-            logger.info(f"Processing project {idx + 1}/{len(metadata.project_ids)}: {project_id}")
-
-            # Calculate progress (0-100%)
-            progress = int((idx / len(metadata.project_ids)) * 100)
-
-            # Broadcast project started
-            await connection_manager.send_project_update(
-                batch_id=batch_id,
-                project_id=project_id,
-                status="processing",
-                message=f"Processing project {idx + 1} of {len(metadata.project_ids)}",
-            )
+        logger.info(f"Starting batch processing for {batch_id}: {total} projects")
+
+        # Process up to parallel_workers projects at a time. The processor
+        # runs the CLI and report generation in worker threads, so concurrent
+        # projects overlap; results are applied here, one at a time, as each
+        # project finishes. Per-project broadcasts, and their messages, are
+        # skipped while no client is connected
+        semaphore = asyncio.Semaphore(max(1, metadata.parallel_workers))
+
+        async def _run(
+            idx: int, project_id: UUID
+        ) -> tuple[int, UUID, bool, Optional[float], Optional[str]]:
+            async with semaphore:
+                logger.info(f"Processing project {idx + 1}/{total}: {project_id}")
+
+                # Broadcast project started
+                if connection_manager.get_connection_count():
+                    await connection_manager.send_project_update(
+                        batch_id=batch_id,
+                        project_id=project_id,
+                        status="processing",
+                        message=f"Processing project {idx + 1} of {total}",
+                    )
 
-            try:
-                # Load project metadata
-                project_metadata = self.storage.load_metadata(project_id)
-                if not project_metadata:
-                    raise ValueError(f"Project {project_id} not found")
+                try:
+                    # Load project metadata
+                    project_metadata = await asyncio.to_thread(
+                        self.storage.load_metadata, project_id
+                    )
+                    if not project_metadata:
+                        raise ValueError(f"Project {project_id} not found")
 
-                # Process project
-                start_time = datetime.now(UTC)
-                success = await self._process_single_project(
-                    project_metadata, metadata.processing_options
-                )
-                end_time = datetime.now(UTC)
-                processing_time = (end_time - start_time).total_seconds()
+                    # Process project
+                    start_time = datetime.now(UTC)
+                    success = await self._process_single_project(
+                        project_metadata, metadata.processing_options
+                    )
+                    end_time = datetime.now(UTC)
+                    processing_time = (end_time - start_time).total_seconds()
+                    return idx, project_id, success, processing_time, None
+                except Exception as e:
+                    logger.error(f"Failed to process project {project_id}: {e}")
+                    return idx, project_id, False, None, str(e)
 
-                # Update project status in batch
-                self._update_project_status(
+        tasks = [
+            asyncio.create_task(_run(idx, project_id))
+            for idx, project_id in enumerate(metadata.project_ids)
+        ]
+        statuses = {ps.project_id: ps for ps in metadata.project_statuses}
+        completed = 0
+        failed = 0
+        last_progress = 0
+        last_progress_at = time.monotonic()
+        for next_done in asyncio.as_completed(tasks):
+            idx, project_id, success, processing_time, error = await next_done
+            completed += 1
+
+            # Update project status in batch; this reads the project's metadata
+            # for its counts, so it runs in a worker thread
+            if error is None:
+                await asyncio.to_thread(
+                    self._update_project_status,
                     metadata,
                     project_id,
                     ProcessingStatus.COMPLETED if success else ProcessingStatus.FAILED,
                     processing_time,
+                    statuses=statuses,
                 )
-
-                # Broadcast project completed
-                await connection_manager.send_project_update(
-                    batch_id=batch_id,
-                    project_id=project_id,
-                    status="completed" if success else "failed",
-                    message=f"Project {idx + 1} completed in {processing_time:.1f}s",
-                )
-
-                # Update batch progress
-                progress_after = int(((idx + 1) / len(metadata.project_ids)) * 100)
-                await connection_manager.send_batch_update(
-                    batch_id=batch_id,
-                    status="processing",
-                    progress=progress_after,
-                    message=f"Completed {idx + 1} of {len(metadata.project_ids)} projects",
-                )
-
-            except Exception as e:
-                logger.error(f"Failed to process project {project_id}: {e}")
-                self._update_project_status(
+            else:
+                await asyncio.to_thread(
+                    self._update_project_status,
                     metadata,
                     project_id,
                     ProcessingStatus.FAILED,
-                    error_message=str(e),
+                    error_message=error,
+                    statuses=statuses,
                 )
 
-                # Broadcast project failed
-                await connection_manager.send_project_update(
-                    batch_id=batch_id,
-                    project_id=project_id,
-                    status="failed",
-                    message=f"Project {idx + 1} failed: {str(e)}",
-                )
+            if not success:
+                failed += 1
 
-                # Update batch progress even on failure
-                progress_after = int(((idx + 1) / len(metadata.project_ids)) * 100)
-                await connection_manager.send_batch_update(
-                    batch_id=batch_id,
-                    status="processing",
-                    progress=progress_after,
-                    message=f"Completed {idx + 1} of {len(metadata.project_ids)} projects ({metadata.statistics.failed_projects + 1} failed)",
-                )
+            # Checkpoint progress now and then instead of on every update
+            await self._flush_batch_metadata_async(metadata)
+
+            if not connection_manager.get_connection_count():
+                continue
+
+            # Broadcast the project result together with the batch progress
+            # (also on failure). Progress is only included when it moved by a
+            # step or has not been sent for a while, so large batches do not
+            # flood clients
+            if error is None:
+                project_status = "completed" if success else "failed"
+                project_message = f"Project {idx + 1} completed in {processing_time:.1f}s"
+            else:
+                project_status = "failed"
+                project_message = f"Project {idx + 1} failed: {error}"
+            progress = completed * 100 // total
+            now = time.monotonic()
+            batch_status = batch_message = None
+            if (
+                progress - last_progress >= PROGRESS_BROADCAST_STEP
+                or now - last_progress_at >= PROGRESS_BROADCAST_INTERVAL
+                or completed == total
+            ):
+                batch_status = "processing"
+                batch_message = f"Completed {completed} of {total} projects"
+                if failed:
+                    batch_message += f" ({failed} failed)"
+                last_progress, last_progress_at = progress, now
+            await connection_manager.send_batch_progress(
+                batch_id=batch_id,
+                project_id=project_id,
+                project_status=project_status,
+                project_message=project_message,
+                batch_status=batch_status,
+                progress=progress,
+                batch_message=batch_message,
+            )
 
         # Calculate final statistics
-        metadata.statistics = self._calculate_statistics(metadata)
+        metadata.statistics = await asyncio.to_thread(self._calculate_statistics, metadata)
 
         # Determine final batch status
         if metadata.statistics.failed_projects == 0:
@@ -442,7 +650,8 @@ class BatchService:
             metadata.status = BatchStatus.PARTIAL
 
         metadata.processing_completed = datetime.now(UTC)
-        self._save_batch_metadata(metadata)
+        await self._flush_batch_metadata_async(metadata, force=True)
+        self._last_flush.pop(batch_id, None)
 
         # Broadcast final batch status
         status_str = (
@@ -476,11 +685,8 @@ class BatchService:
             True if successful, False otherwise
         """
         try:
-            # Create processor service instance
-            processor = ProcessorService(storage=self.storage)
-
             # Call process_project with options
-            await processor.process_project(
+            await self._get_processor().process_project(
                 project_id=project_metadata.project_id,
                 group_by=options.group_by,
                 output_formats=options.output_formats,
@@ -496,6 +702,13 @@ class BatchService:
             logger.error(f"Failed to process project {project_metadata.project_id}: {e}")
             return False
 
+    def _get_processor(self) -> ProcessorService:
+        """Get the processor service, shared by all projects on the current storage."""
+        processor = self._processor
+        if processor is None or processor.storage is not self.storage:
+            processor = self._processor = ProcessorService(storage=self.storage)
+        return processor
+
     def _update_project_status(
         self,
         metadata: BatchMetadata,
@@ -503,34 +716,43 @@ class BatchService:
         status: ProcessingStatus,
         processing_time: Optional[float] = None,
         error_message: Optional[str] = None,
+        statuses: Optional[dict[UUID, BatchProjectStatus]] = None,
     ) -> None:
         """Update project status in batch metadata.
 
+        The change is only buffered; _flush_batch_metadata() writes it out.
+
         Args:
             metadata: Batch metadata
             project_id: Project UUID
             status: New status
             processing_time: Processing time in seconds
             error_message: Optional error message
+            statuses: Optional project_id -> status map of metadata.project_statuses,
+                for callers updating many projects (saves a scan per update)
         """
-        for project_status in metadata.project_statuses:
-            if project_status.project_id == project_id:
-                project_status.status = status
-                project_status.processing_time = processing_time
-                project_status.error_message = error_message
+        if statuses is not None:
+            project_status = statuses.get(project_id)
+        else:
+            project_status = next(
+                (ps for ps in metadata.project_statuses if ps.project_id == project_id), None
+            )
 
-                # Load project metadata to get counts
-                try:
-                    project_metadata = self.storage.load_metadata(project_id)
-                    if project_metadata:
-                        project_status.access_points_count = project_metadata.aps_count
-                        project_status.antennas_count = project_metadata.total_antennas
-                except Exception as e:
-                    logger.warning(f"Failed to load project metadata for {project_id}: {e}")
+        if project_status is not None:
+            project_status.status = status
+            project_status.processing_time = processing_time
+            project_status.error_message = error_message
 
-                break
+            # Load project metadata to get counts
+            try:
+                project_metadata = self.storage.load_metadata(project_id)
+                if project_metadata:
+                    project_status.access_points_count = project_metadata.aps_count
+                    project_status.antennas_count = project_metadata.total_antennas
+            except Exception as e:
+                logger.warning(f"Failed to load project metadata for {project_id}: {e}")
 
-        self._save_batch_metadata(metadata)
+        self._dirty.add(metadata.batch_id)
 
     def _calculate_statistics(self, metadata: BatchMetadata) -> BatchStatistics:
         """Calculate aggregate statistics from all projects.
@@ -541,15 +763,9 @@ class BatchService:
         Returns:
             Calculated statistics
         """
-        from collections import defaultdict
-
         stats = BatchStatistics()
         stats.total_projects = len(metadata.project_statuses)
 
-        # Temporary dictionaries for aggregation
-        ap_by_vendor_model = defaultdict(int)
-        antenna_by_model = defaultdict(int)
-
         for project_status in metadata.project_statuses:
             if project_status.status == ProcessingStatus.COMPLETED:
                 stats.successful_projects += 1
@@ -563,74 +779,12 @@ class BatchService:
                 if project_status.antennas_count:
                     stats.total_antennas += project_status.antennas_count
 
-                # Load project BOM data and aggregate by vendor/model
+                # Add the project's BOM counts by vendor/model
                 try:
-                    project_dir = self.storage.projects_dir / str(project_status.project_id)
-                    reports_dir = project_dir / "reports"
-
-                    if not reports_dir.exists():
-                        continue
-
-                    # Try JSON first (new projects with JSON format)
-                    json_report_path = reports_dir / "bom_report.json"
-                    if json_report_path.exists():
-                        import json
-
-                        with open(json_report_path, "r", encoding="utf-8") as f:
-                            bom_data = json.load(f)
-
-                        # Aggregate access points by vendor|model
-                        for ap in bom_data.get("access_points", []):
-                            vendor = ap.get("vendor", "Unknown")
-                            model = ap.get("model", "Unknown")
-                            quantity = ap.get("quantity", 1)
-                            vendor_model = f"{vendor}|{model}"
-                            ap_by_vendor_model[vendor_model] += quantity
-
-                        # Aggregate antennas by model
-                        for antenna in bom_data.get("antennas", []):
-                            model = antenna.get("model", "Unknown")
-                            quantity = antenna.get("quantity", 1)
-                            antenna_by_model[model] += quantity
-
-                    else:
-                        # Fallback to CSV (old projects without JSON)
-                        import csv
-
-                        # Find access points CSV file (format: projectname_access_points.csv)
-                        csv_files = list(reports_dir.glob("*_access_points.csv"))
-
-                        if csv_files:
-                            csv_path = csv_files[0]  # Use first match
-
-                            with open(csv_path, "r", encoding="utf-8") as f:
-                                # Skip comment lines starting with #
-                                lines = [line for line in f if not line.startswith("#")]
-                                reader = csv.DictReader(lines)
-
-                                for row in reader:
-                                    vendor = row.get("Vendor", "Unknown").strip('"')
-                                    model = row.get("Model", "Unknown").strip('"')
-                                    quantity = int(row.get("Quantity", "1").strip('"'))
-                                    vendor_model = f"{vendor}|{model}"
-                                    ap_by_vendor_model[vendor_model] += quantity
-
-                        # Find antennas CSV file (format: projectname_antennas.csv)
-                        antenna_csv_files = list(reports_dir.glob("*_antennas.csv"))
-
-                        if antenna_csv_files:
-                            antenna_csv_path = antenna_csv_files[0]
-
-                            with open(antenna_csv_path, "r", encoding="utf-8") as f:
-                                # Skip comment lines
-                                lines = [line for line in f if not line.startswith("#")]
-                                reader = csv.DictReader(lines)
-
-                                for row in reader:
-                                    model = row.get("Model", "Unknown").strip('"')
-                                    quantity = int(row.get("Quantity", "1").strip('"'))
-                                    antenna_by_model[model] += quantity
-
+                    bom = self._load_project_bom(project_status.project_id)
+                    if bom is not None:
+                        stats.ap_by_vendor_model.update(bom.ap_by_vendor_model)
+                        stats.antenna_by_model.update(bom.antenna_by_model)
                 except Exception as e:
                     logger.warning(
                         f"Failed to load BOM data for project {project_status.project_id}: {e}"
@@ -639,12 +793,80 @@ class BatchService:
             elif project_status.status == ProcessingStatus.FAILED:
                 stats.failed_projects += 1
 
-        # Convert defaultdict to regular dict for Pydantic model
-        stats.ap_by_vendor_model = dict(ap_by_vendor_model)
-        stats.antenna_by_model = dict(antenna_by_model)
-
         return stats
 
+    def _load_project_bom(self, project_id: UUID) -> Optional[BatchStatistics]:
+        """Get a project's BOM counts, parsing its reports only when they changed.
+
+        Args:
+            project_id: Project UUID
+
+        Returns:
+            Statistics with only ap_by_vendor_model and antenna_by_model set,
+            shared with later calls (read-only), or None if there are no reports
+        """
+        reports_dir = self.storage.projects_dir / _uuid_str(project_id) / "reports"
+        json_report_path = reports_dir / "bom_report.json"
+        csv_path = antenna_csv_path = None
+        if json_report_path.exists():
+            sources = [json_report_path]
+        else:
+            # Fallback to CSV (old projects without JSON): first match of
+            # projectname_access_points.csv and projectname_antennas.csv
+            csv_path = next(reports_dir.glob("*_access_points.csv"), None)
+            antenna_csv_path = next(reports_dir.glob("*_antennas.csv"), None)
+            sources = [path for path in (csv_path, antenna_csv_path) if path is not None]
+        if not sources:
+            self._bom_cache.pop(project_id, None)
+            return None
+
+        stamps = []
+        for path in sources:
+            st = os.stat(path)
+            stamps.append((path.name, st.st_mtime_ns, st.st_size))
+        stamp = tuple(stamps)
+        cached = self._bom_cache.get(project_id)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        bom = BatchStatistics()
+        if sources[0] == json_report_path:
+            bom_data = _load_json_file(json_report_path)
+
+            # Aggregate access points by vendor|model and antennas by model
+            bom.accumulate(
+                ap_rows=(
+                    (
+                        ap.get("vendor", "Unknown"),
+                        ap.get("model", "Unknown"),
+                        ap.get("quantity", 1),
+                    )
+                    for ap in bom_data.get("access_points", [])
+                ),
+                antenna_rows=(
+                    (antenna.get("model", "Unknown"), antenna.get("quantity", 1))
+                    for antenna in bom_data.get("antennas", [])
+                ),
+            )
+
+        else:
+            # Rows stream into the counters
+            if csv_path is not None:
+                rows = _iter_csv_columns(
+                    csv_path,
+                    ("Vendor", "Unknown"),
+                    ("Model", "Unknown"),
+                    ("Quantity", "1"),
+                )
+                bom.accumulate(ap_rows=((vendor, model, int(qty)) for vendor, model, qty in rows))
+
+            if antenna_csv_path is not None:
+                rows = _iter_csv_columns(antenna_csv_path, ("Model", "Unknown"), ("Quantity", "1"))
+                bom.accumulate(antenna_rows=((model, int(qty)) for model, qty in rows))
+
+        self._bom_cache[project_id] = (stamp, bom)
+        return bom
+
     def create_batch_archive(self, batch_id: UUID) -> Path:
         """Create a ZIP archive with all batch projects and their files.
 
@@ -657,10 +879,6 @@ class BatchService:
         Raises:
             FileNotFoundError: If batch not found
         """
-        import shutil
-        import tempfile
-        import zipfile
-
         # Load batch metadata
         metadata = self.load_batch_metadata(batch_id)
         if not metadata:
@@ -672,54 +890,63 @@ class BatchService:
         zip_path = temp_dir / zip_filename
 
         try:
-            with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zipf:
+            # Collect the files of each project, in archive order
+            files: dict[str, Path] = {}
+            used_folders: set[str] = set()
+            for project_id in metadata.project_ids:
+                # project_id is already a UUID object
+                project_metadata = self.storage.load_metadata(project_id)
+
+                if not project_metadata:
+                    logger.warning(f"Project {project_id} metadata not found, skipping")
+                    continue
+
+                # Create project folder name (sanitize for filesystem)
+                project_name = (
+                    (project_metadata.project_name or f"project_{project_id}")
+                    .replace("/", "_")
+                    .replace("\\", "_")
+                )
+                # Projects sharing a name get the project ID appended, so their
+                # files don't overwrite each other in the archive
+                if project_name in used_folders:
+                    project_name = f"{project_name}_{project_id}"
+                used_folders.add(project_name)
+                project_folder = f"{project_name}/"
+                project_dir = self.storage.projects_dir / _uuid_str(project_id)
+
+                # Add original .esx file
+                original_file = project_dir / "original.esx"
+                if original_file.exists():
+                    files[f"{project_folder}{project_metadata.filename}"] = original_file
+
+                # Add reports directory, visualizations included
+                reports_dir = project_dir / "reports"
+                if reports_dir.exists():
+                    for report_file in reports_dir.rglob("*"):
+                        if report_file.is_file():
+                            rel_path = report_file.relative_to(project_dir)
+                            files[f"{project_folder}{rel_path}"] = report_file
+
+            with zipfile.ZipFile(
+                zip_path, "w", zipfile.ZIP_DEFLATED, compresslevel=ARCHIVE_COMPRESSLEVEL
+            ) as zipf:
                 # Add batch summary
                 summary_content = self._generate_batch_summary(metadata)
                 zipf.writestr("batch_summary.txt", summary_content)
 
-                # Add each project's files
-                for project_id in metadata.project_ids:
-                    # project_id is already a UUID object
-                    project_metadata = self.storage.load_metadata(project_id)
-
-                    if not project_metadata:
-                        logger.warning(f"Project {project_id} metadata not found, skipping")
-                        continue
-
-                    # Create project folder name (sanitize for filesystem)
-                    project_name = (
-                        (project_metadata.project_name or f"project_{project_id}")
-                        .replace("/", "_")
-                        .replace("\\", "_")
-                    )
-                    project_folder = f"{project_name}/"
-
-                    # Add original .esx file
-                    original_file = self.storage.projects_dir / str(project_id) / "original.esx"
-                    if original_file.exists():
-                        zipf.write(original_file, f"{project_folder}{project_metadata.filename}")
-
-                    # Add reports directory
-                    reports_dir = self.storage.projects_dir / str(project_id) / "reports"
-                    if reports_dir.exists():
-                        for report_file in reports_dir.rglob("*"):
-                            if report_file.is_file():
-                                rel_path = report_file.relative_to(
-                                    self.storage.projects_dir / str(project_id)
-                                )
-                                zipf.write(report_file, f"{project_folder}{rel_path}")
-
-                    # Add visualizations directory
-                    viz_dir = (
-                        self.storage.projects_dir / str(project_id) / "reports" / "visualizations"
-                    )
-                    if viz_dir.exists():
-                        for viz_file in viz_dir.rglob("*"):
-                            if viz_file.is_file():
-                                rel_path = viz_file.relative_to(
-                                    self.storage.projects_dir / str(project_id)
-                                )
-                                zipf.write(viz_file, f"{project_folder}{rel_path}")
+                # Files are read and deflated in threads (zlib and ISA-L release
+                # the GIL) and written here in order; stored files are copied by sendfile.
+                # At most ARCHIVE_READ_AHEAD entries are in flight at once
+                pending: deque = deque()
+                with ThreadPoolExecutor(max_workers=ARCHIVE_WORKERS) as executor:
+                    for arcname, path in files.items():
+                        future = executor.submit(_prepare_archive_file, path, arcname)
+                        pending.append((arcname, path, future))
+                        if len(pending) >= ARCHIVE_READ_AHEAD:
+                            _write_archive_entry(zipf, *pending.popleft())
+                    while pending:
+                        _write_archive_entry(zipf, *pending.popleft())
 
             logger.info(f"Created batch archive: {zip_path} ({zip_path.stat().st_size} bytes)")
             return zip_path
@@ -742,58 +969,65 @@ class BatchService:
         Returns:
             Summary text
         """
-        lines = [
-            "=" * 80,
-            f"BATCH SUMMARY: {metadata.batch_name}",
-            "=" * 80,
-            "",
-            f"Batch ID: {metadata.batch_id}",
-            f"Created: {metadata.created_date}",
-            f"Created By: {metadata.created_by}",
-            f"Status: {metadata.status}",
-            "",
-            "STATISTICS:",
-            f"  Total Projects: {metadata.statistics.total_projects}",
-            f"  Successful: {metadata.statistics.successful_projects}",
-            f"  Failed: {metadata.statistics.failed_projects}",
-            f"  Total Access Points: {metadata.statistics.total_access_points}",
-            f"  Total Antennas: {metadata.statistics.total_antennas}",
-            f"  Total Processing Time: {metadata.statistics.total_processing_time:.2f}s",
-            "",
-            "PROCESSING OPTIONS:",
-            f"  Group By: {metadata.processing_options.group_by}",
-            f"  Output Formats: {', '.join(metadata.processing_options.output_formats)}",
-            f"  Visualize Floor Plans: {metadata.processing_options.visualize_floor_plans}",
-            f"  Show Azimuth Arrows: {metadata.processing_options.show_azimuth_arrows}",
-            f"  AP Opacity: {metadata.processing_options.ap_opacity * 100:.0f}%",
-            "",
-            "PROJECTS:",
-        ]
+        statistics = metadata.statistics
+        options = metadata.processing_options
+        output = io.StringIO()
+        write = output.write
+
+        write("=" * 80 + "\n")
+        write(f"BATCH SUMMARY: {metadata.batch_name}\n")
+        write("=" * 80 + "\n")
+        write("\n")
+        write(f"Batch ID: {metadata.batch_id}\n")
+        write(f"Created: {metadata.created_date}\n")
+        write(f"Created By: {metadata.created_by}\n")
+        write(f"Status: {metadata.status}\n")
+        write("\n")
+        write("STATISTICS:\n")
+        write(f"  Total Projects: {statistics.total_projects}\n")
+        write(f"  Successful: {statistics.successful_projects}\n")
+        write(f"  Failed: {statistics.failed_projects}\n")
+        write(f"  Total Access Points: {statistics.total_access_points}\n")
+        write(f"  Total Antennas: {statistics.total_antennas}\n")
+        write(f"  Total Processing Time: {statistics.total_processing_time:.2f}s\n")
+        write("\n")
+        write("PROCESSING OPTIONS:\n")
+        write(f"  Group By: {options.group_by}\n")
+        write(f"  Output Formats: {', '.join(options.output_formats)}\n")
+        write(f"  Visualize Floor Plans: {options.visualize_floor_plans}\n")
+        write(f"  Show Azimuth Arrows: {options.show_azimuth_arrows}\n")
+        write(f"  AP Opacity: {options.ap_opacity * 100:.0f}%\n")
+        write("\n")
+        write("PROJECTS:\n")
 
         # Add project details
         for i, project_status in enumerate(metadata.project_statuses, 1):
-            lines.append(f"\n{i}. {project_status.filename}")
-            lines.append(f"   Project ID: {project_status.project_id}")
-            lines.append(f"   Status: {project_status.status}")
+            write(f"\n{i}. {project_status.filename}\n")
+            write(f"   Project ID: {project_status.project_id}\n")
+            write(f"   Status: {project_status.status}\n")
             if project_status.processing_time:
-                lines.append(f"   Processing Time: {project_status.processing_time:.2f}s")
+                write(f"   Processing Time: {project_status.processing_time:.2f}s\n")
             if project_status.access_points_count:
-                lines.append(f"   Access Points: {project_status.access_points_count}")
+                write(f"   Access Points: {project_status.access_points_count}\n")
             if project_status.antennas_count:
-                lines.append(f"   Antennas: {project_status.antennas_count}")
+                write(f"   Antennas: {project_status.antennas_count}\n")
             if project_status.error_message:
-                lines.append(f"   Error: {project_status.error_message}")
+                write(f"   Error: {project_status.error_message}\n")
 
-        lines.append("")
-        lines.append("=" * 80)
-        lines.append("Generated by Ekahau BOM Web")
-        lines.append("=" * 80)
+        write("\n")
+        write("=" * 80 + "\n")
+        write("Generated by Ekahau BOM Web\n")
+        write("=" * 80)
 
-        return "\n".join(lines)
+        return output.getvalue()
 
     def delete_batch(self, batch_id: UUID) -> bool:
         """Delete a batch and all its data.
 
+        The batch directory is renamed aside in one syscall and its files are
+        deleted on a background thread, so the call does not wait on
+        unlinking every report and visualization.
+
         Args:
             batch_id: Batch UUID
 
@@ -804,16 +1038,35 @@ class BatchService:
         if not batch_dir.exists():
             return False
 
+        self._metadata_cache.pop(batch_id, None)
         try:
-            import shutil
-
-            shutil.rmtree(batch_dir)
-            logger.info(f"Deleted batch {batch_id}")
-            return True
+            stale_dir = move_aside(batch_dir)
+        except FileNotFoundError:
+            return False
         except Exception as e:
             logger.error(f"Failed to delete batch {batch_id}: {e}")
             raise
 
+        self._get_batch_index().remove(batch_id)
+        remove_in_background(stale_dir)
+        logger.info(f"Deleted batch {batch_id}")
+        return True
+
+    def remove_stale_dirs(self) -> int:
+        """Delete batch directories left behind by deletions cut short by a restart.
+
+        Returns:
+            Number of stale directories queued for removal
+        """
+        batches_base = self._batches_root
+        if not batches_base.exists():
+            return 0
+
+        stale_dirs = list(batches_base.glob(f"*{STALE_DIR_SUFFIX}"))
+        if stale_dirs:
+            remove_in_background(*stale_dirs)
+        return len(stale_dirs)
+
 
 # Singleton instance
 batch_service = BatchService()
@@ -3,82 +3,164 @@
 from __future__ import annotations
 
 import logging
-from threading import RLock
-from typing import Any, Callable, Optional
+import time
+from threading import Lock, RLock
+from typing import Any, Callable, Generic, Hashable, Iterable, Optional, TypeVar
 from uuid import UUID
 
-from cachetools import TTLCache
+from cachetools import Cache, TTLCache
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Number of independently locked shards in per-project caches (a power of two)
+CACHE_SHARDS = 16
+
+
+class ShardedTTLCache:
+    """TTLCache split into shards by key hash, each with its own write lock.
+
+    Requests for different projects rarely land on the same shard, so they
+    no longer queue on one lock. Reads take no lock at all: they look the
+    key up without TTLCache's reordering, so concurrent readers never
+    mutate a shard. Each shard holds a slice of the total size and, since
+    hits are not reordered, evicts the oldest-written entry when full.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, shards: int = CACHE_SHARDS):
+        """Initialize the shards.
+
+        Args:
+            maxsize: Total number of entries, spread evenly over the shards
+            ttl: Entry lifetime in seconds
+            shards: Number of shards (a power of two)
+        """
+        per_shard = max(1, -(-maxsize // shards))
+        self._shards = [TTLCache(maxsize=per_shard, ttl=ttl) for _ in range(shards)]
+        self._locks = [RLock() for _ in range(shards)]
+        self._mask = shards - 1
+        self.maxsize = per_shard * shards
+        self.ttl = ttl
+
+    def _shard(self, key: Hashable) -> int:
+        return hash(key) & self._mask
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get an entry, or None if missing or expired."""
+        shard = self._shards[self._shard(key)]
+        try:
+            # TTLCache.__contains__ checks expiry without reordering, and
+            # Cache.__getitem__ is a plain dict lookup: both safe to race a writer
+            if key in shard:
+                return Cache.__getitem__(shard, key)
+        except KeyError:  # Evicted by a writer in between
+            pass
+        return None
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        i = self._shard(key)
+        with self._locks[i]:
+            self._shards[i][key] = value
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove an entry and return it, or default if missing."""
+        i = self._shard(key)
+        with self._locks[i]:
+            return self._shards[i].pop(key, default)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                shard.clear()
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+
+class SingleEntryCache(Generic[T]):
+    """One cached value with a TTL, read without locking.
+
+    The value and its expiry time are kept together in one tuple attribute,
+    which readers load atomically; only writers take the lock.
+    """
+
+    maxsize = 1
+
+    def __init__(self, ttl: float):
+        """Initialize the cache.
+
+        Args:
+            ttl: Entry lifetime in seconds
+        """
+        self.ttl = ttl
+        self._entry: Optional[tuple[T, float]] = None
+        self._lock = Lock()
+
+    def get(self) -> Optional[T]:
+        """Get the value, or None if unset or expired."""
+        entry = self._entry
+        if entry is None or entry[1] <= time.monotonic():
+            return None
+        return entry[0]
+
+    def set(self, value: T) -> None:
+        """Store the value, replacing any previous one."""
+        with self._lock:
+            self._entry = (value, time.monotonic() + self.ttl)
+
+    def clear(self) -> None:
+        """Remove the value."""
+        with self._lock:
+            self._entry = None
+
+    def __len__(self) -> int:
+        return 0 if self.get() is None else 1
+
 
 class CacheService:
     """Service for managing in-memory TTL cache for API responses.
 
     Implements caching for expensive API calls with automatic expiration.
-    Thread-safe with RLock for concurrent access.
+    Per-project caches are sharded with a write lock per shard, and all
+    caches are read without locking.
     """
 
     def __init__(self):
-        # Cache for projects list (5 min TTL, max 1 item)
-        self.projects_cache = TTLCache(maxsize=1, ttl=300)  # 5 minutes
-        self.projects_lock = RLock()
+        # Per-project caches are keyed on the project UUID itself
 
-        # Cache for individual project details (10 min TTL, max 100 projects)
-        self.project_details_cache = TTLCache(maxsize=100, ttl=600)  # 10 minutes
-        self.project_details_lock = RLock()
+        # Cache for individual project details (10 min TTL, max ~100 projects)
+        self.project_details_cache = ShardedTTLCache(maxsize=100, ttl=600)  # 10 minutes
 
-        # Cache for reports list (15 min TTL, max 100 projects)
-        self.reports_cache = TTLCache(maxsize=100, ttl=900)  # 15 minutes
-        self.reports_lock = RLock()
+        # Cache for reports list (15 min TTL, max ~100 projects)
+        self.reports_cache = ShardedTTLCache(maxsize=100, ttl=900)  # 15 minutes
 
-        # Cache for stats (5 min TTL, max 1 item)
-        self.stats_cache = TTLCache(maxsize=1, ttl=300)  # 5 minutes
-        self.stats_lock = RLock()
+        # Cache for stats (5 min TTL, one entry)
+        self.stats_cache: SingleEntryCache[dict] = SingleEntryCache(ttl=300)  # 5 minutes
 
         logger.info("CacheService initialized with TTL caches")
 
-    def get_projects(self) -> Optional[list]:
-        """Get cached projects list.
-
-        Returns:
-            Cached projects list or None if not cached/expired
-        """
-        with self.projects_lock:
-            return self.projects_cache.get("all_projects")
-
-    def set_projects(self, projects: list) -> None:
-        """Cache projects list.
-
-        Args:
-            projects: List of projects to cache
-        """
-        with self.projects_lock:
-            self.projects_cache["all_projects"] = projects
-            logger.debug(f"Cached {len(projects)} projects (TTL: 5 min)")
-
-    def get_project_details(self, project_id: UUID) -> Optional[dict]:
+    def get_project_details(self, project_id: UUID) -> Optional[bytes]:
         """Get cached project details.
 
         Args:
             project_id: Project UUID
 
         Returns:
-            Cached project details or None if not cached/expired
+            Cached project details JSON or None if not cached/expired
         """
-        with self.project_details_lock:
-            return self.project_details_cache.get(str(project_id))
+        return self.project_details_cache.get(project_id)
 
-    def set_project_details(self, project_id: UUID, details: dict) -> None:
+    def set_project_details(self, project_id: UUID, details: bytes) -> None:
         """Cache project details.
 
         Args:
             project_id: Project UUID
-            details: Project details to cache
+            details: Serialized project details JSON to cache
         """
-        with self.project_details_lock:
-            self.project_details_cache[str(project_id)] = details
-            logger.debug(f"Cached project {project_id} details (TTL: 10 min)")
+        self.project_details_cache[project_id] = details
+        logger.debug(f"Cached project {project_id} details (TTL: 10 min)")
 
     def get_reports(self, project_id: UUID) -> Optional[dict]:
         """Get cached reports list.
@@ -89,8 +171,7 @@ class CacheService:
         Returns:
             Cached reports list or None if not cached/expired
         """
-        with self.reports_lock:
-            return self.reports_cache.get(str(project_id))
+        return self.reports_cache.get(project_id)
 
     def set_reports(self, project_id: UUID, reports: dict) -> None:
         """Cache reports list.
@@ -99,9 +180,8 @@ class CacheService:
             project_id: Project UUID
             reports: Reports data to cache
         """
-        with self.reports_lock:
-            self.reports_cache[str(project_id)] = reports
-            logger.debug(f"Cached project {project_id} reports (TTL: 15 min)")
+        self.reports_cache[project_id] = reports
+        logger.debug(f"Cached project {project_id} reports (TTL: 15 min)")
 
     def get_stats(self) -> Optional[dict]:
         """Get cached stats.
@@ -109,8 +189,7 @@ class CacheService:
         Returns:
             Cached stats or None if not cached/expired
         """
-        with self.stats_lock:
-            return self.stats_cache.get("stats")
+        return self.stats_cache.get()
 
     def set_stats(self, stats: dict) -> None:
         """Cache stats.
@@ -118,9 +197,8 @@ class CacheService:
         Args:
             stats: Stats data to cache
         """
-        with self.stats_lock:
-            self.stats_cache["stats"] = stats
-            logger.debug("Cached stats (TTL: 5 min)")
+        self.stats_cache.set(stats)
+        logger.debug("Cached stats (TTL: 5 min)")
 
     # Cache invalidation methods
 
@@ -133,48 +211,52 @@ class CacheService:
             project_id: Project UUID
         """
         # Invalidate project details
-        with self.project_details_lock:
-            self.project_details_cache.pop(str(project_id), None)
+        self.project_details_cache.pop(project_id, None)
 
         # Invalidate reports
-        with self.reports_lock:
-            self.reports_cache.pop(str(project_id), None)
+        self.reports_cache.pop(project_id, None)
 
-        # Invalidate projects list (since it includes this project)
+        # Invalidate stats (since they include this project)
         self.invalidate_projects_list()
 
         logger.info(f"Invalidated cache for project {project_id}")
 
+    def invalidate_projects(self, project_ids: Iterable[UUID]) -> None:
+        """Invalidate caches for several projects at once.
+
+        Invalidates the stats a single time, instead of once per project as
+        invalidate_project() would.
+
+        Args:
+            project_ids: Project UUIDs
+        """
+        count = 0
+        for project_id in project_ids:
+            self.project_details_cache.pop(project_id, None)
+            self.reports_cache.pop(project_id, None)
+            count += 1
+
+        self.invalidate_projects_list()
+
+        logger.info(f"Invalidated cache for {count} projects")
+
     def invalidate_projects_list(self) -> None:
-        """Invalidate projects list cache.
+        """Invalidate caches derived from the projects list (the stats).
 
         Called when any project is created, updated, or deleted.
         """
-        with self.projects_lock:
-            self.projects_cache.pop("all_projects", None)
-
-        # Also invalidate stats since they depend on projects list
-        with self.stats_lock:
-            self.stats_cache.pop("stats", None)
+        self.stats_cache.clear()
 
-        logger.debug("Invalidated projects list and stats cache")
+        logger.debug("Invalidated stats cache")
 
     def invalidate_all(self) -> None:
         """Clear all caches.
 
         Use sparingly - only for major system changes.
         """
-        with self.projects_lock:
-            self.projects_cache.clear()
-
-        with self.project_details_lock:
-            self.project_details_cache.clear()
-
-        with self.reports_lock:
-            self.reports_cache.clear()
-
-        with self.stats_lock:
-            self.stats_cache.clear()
+        self.project_details_cache.clear()
+        self.reports_cache.clear()
+        self.stats_cache.clear()
 
         logger.info("Cleared all caches")
 
@@ -184,36 +266,19 @@ class CacheService:
         Returns:
             Dictionary with cache sizes and hit rates
         """
-        with self.projects_lock:
-            projects_size = len(self.projects_cache)
-
-        with self.project_details_lock:
-            project_details_size = len(self.project_details_cache)
-
-        with self.reports_lock:
-            reports_size = len(self.reports_cache)
-
-        with self.stats_lock:
-            stats_size = len(self.stats_cache)
-
         return {
-            "projects_cache": {
-                "size": projects_size,
-                "maxsize": self.projects_cache.maxsize,
-                "ttl": 300,
-            },
             "project_details_cache": {
-                "size": project_details_size,
+                "size": len(self.project_details_cache),
                 "maxsize": self.project_details_cache.maxsize,
                 "ttl": 600,
             },
             "reports_cache": {
-                "size": reports_size,
+                "size": len(self.reports_cache),
                 "maxsize": self.reports_cache.maxsize,
                 "ttl": 900,
             },
             "stats_cache": {
-                "size": stats_size,
+                "size": len(self.stats_cache),
                 "maxsize": self.stats_cache.maxsize,
                 "ttl": 300,
             },
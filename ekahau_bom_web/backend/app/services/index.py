@@ -2,73 +2,364 @@
 
 from __future__ import annotations
 
-import json
-from pathlib import Path
-from typing import Optional
+import asyncio
+import bisect
+import gc
+import mmap
+import os
+import struct
+import threading
+from json.encoder import encode_basestring
+from typing import Iterable, Iterator, Optional
 from uuid import UUID
 
+from pydantic import BaseModel
+
 from app.config import settings
 from app.models import ProcessingStatus, ProjectListItem, ProjectMetadata
 
+# Each record is a 4-byte big-endian length followed by one ProjectMetadata as JSON
+_FRAME_HEADER = struct.Struct(">I")
+
+# Rewrite the file once appended frames outnumber live projects by this factor
+_COMPACT_RATIO = 2
+
+# Position of a project in the newest-first listings
+_SortKey = tuple[float, UUID]
+
+# Length of the substrings in the search index; shorter queries scan
+_TRIGRAM = 3
+
+
+class _IndexSnapshot(BaseModel):
+    """Legacy on-disk layout of index.json (single JSON document)."""
+
+    projects: list[ProjectMetadata] = []
+
+
+def _encode_frame(metadata: ProjectMetadata) -> bytes:
+    """Encode one project as a length-prefixed frame."""
+    payload = metadata.model_dump_json().encode("utf-8")
+    return _FRAME_HEADER.pack(len(payload)) + payload
+
+
+def _iter_frames(buf) -> Iterator[bytes]:
+    """Yield frame payloads, stopping at a truncated trailing frame."""
+    offset = 0
+    size = len(buf)
+    header_size = _FRAME_HEADER.size
+    while offset + header_size <= size:
+        (length,) = _FRAME_HEADER.unpack_from(buf, offset)
+        offset += header_size
+        if offset + length > size:
+            return
+        yield buf[offset : offset + length]
+        offset += length
+
+
+def _sort_key(p: ProjectMetadata) -> _SortKey:
+    """Order newest upload first, ties by project ID."""
+    return (-p.upload_date.timestamp(), p.project_id)
+
+
+def _search_texts(p: ProjectMetadata) -> tuple[str, str]:
+    """Lowercased project name and filename, as search matches them."""
+    return ((p.project_name or "").lower(), p.filename.lower())
+
+
+def _trigrams(texts: Iterable[str]) -> set[str]:
+    """Every three-character substring of the texts."""
+    return {text[i : i + _TRIGRAM] for text in texts for i in range(len(text) - _TRIGRAM + 1)}
+
+
+def _to_list_item(p: ProjectMetadata) -> ProjectListItem:
+    """Build the list view of a project."""
+    return ProjectListItem(
+        project_id=p.project_id,
+        project_name=p.project_name or p.filename,
+        filename=p.filename,
+        upload_date=p.upload_date,
+        aps_count=p.aps_count,
+        processing_status=p.processing_status,
+        short_link=p.short_link,
+    )
+
+
+# Field order and names must match ProjectListItem
+_LIST_ITEM_TEMPLATE = (
+    '{"project_id":"%s","project_name":%s,"filename":%s,"upload_date":"%s",'
+    '"aps_count":%s,"processing_status":"%s","short_link":%s}'
+)
+_encode_str = encode_basestring  # JSON string literal, non-ASCII kept as-is
+
+
+def _encode_list_item(p: ProjectMetadata) -> bytes:
+    """Encode the list view of a project as JSON.
+
+    Straight-line equivalent of ``_to_list_item(p).model_dump_json()`` for the
+    fixed ProjectListItem shape, without building or validating a model.
+    """
+    upload_date = p.upload_date.isoformat()
+    if upload_date.endswith("+00:00"):
+        upload_date = upload_date[:-6] + "Z"  # Same UTC form as pydantic
+
+    return (
+        _LIST_ITEM_TEMPLATE
+        % (
+            p.project_id,
+            _encode_str(p.project_name or p.filename),
+            _encode_str(p.filename),
+            upload_date,
+            "null" if p.aps_count is None else p.aps_count,
+            p.processing_status.value,
+            "null" if p.short_link is None else _encode_str(p.short_link),
+        )
+    ).encode("utf-8")
+
 
 class IndexService:
-    """In-memory index for fast project searches."""
+    """In-memory index for fast project searches.
+
+    The index file is a sequence of length-prefixed frames. Saving appends a
+    frame for each project added since the last save; when frames are read
+    back, later frames override earlier ones for the same project. Removals
+    and accumulated stale frames trigger a full atomic rewrite. A legacy
+    single-document JSON index is detected by its leading ``{`` and migrated
+    on the next save.
+
+    Listings are served from sort keys kept in newest-first order, overall
+    and per status, and updated by bisection as projects are added and
+    removed, so listing never re-sorts the whole index. Search goes through
+    a trigram inverted index over lowercased names and filenames: only
+    projects holding every trigram of the query are checked.
+    """
 
     def __init__(self):
         self.index_file = settings.index_file
         self._projects: dict[UUID, ProjectMetadata] = {}
         self._short_links: dict[str, UUID] = {}  # short_link -> project_id
+        self._dirty: set[UUID] = set()  # added/updated since last save
+        # project_id -> (metadata encoded, its ProjectListItem JSON)
+        self._list_item_json: dict[UUID, tuple[ProjectMetadata, bytes]] = {}
+        self._by_date: list[_SortKey] = []  # newest first
+        self._by_status: dict[ProcessingStatus, list[_SortKey]] = {}  # each newest first
+        # project_id -> where it is filed; kept apart from the metadata, which
+        # callers may mutate in place before re-adding it
+        self._positions: dict[UUID, tuple[_SortKey, ProcessingStatus]] = {}
+        self._search_texts: dict[UUID, tuple[str, str]] = {}  # lowercased name, filename
+        self._postings: dict[str, set[UUID]] = {}  # trigram -> project_ids
+        # Guards the listings, which unlike single dict operations are not
+        # updated atomically (projects are added from worker threads)
+        self._order_lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._needs_rewrite = True  # on-disk state unknown or not appendable
+        self._frames_on_disk = 0
 
     def load_from_disk(self) -> None:
         """Load index from disk (index.json)."""
         if not self.index_file.exists():
             return
 
-        with open(self.index_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        self._projects = {}
-        self._short_links = {}
-
-        for project_data in data.get("projects", []):
-            metadata = ProjectMetadata(**project_data)
-            self._projects[metadata.project_id] = metadata
-
-            if metadata.short_link:
-                self._short_links[metadata.short_link] = metadata.project_id
+        projects: list[ProjectMetadata] = []
+        needs_rewrite = False
+        frames = 0
+
+        # Decoding allocates many long-lived objects and nothing cyclic, so
+        # generational collections during the load are pure overhead
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            with open(self.index_file, "rb") as f:
+                if os.fstat(f.fileno()).st_size:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                        if buf[:64].lstrip()[:1] == b"{":
+                            projects = _IndexSnapshot.model_validate_json(buf[:]).projects
+                            needs_rewrite = True
+                        else:
+                            end = 0
+                            for payload in _iter_frames(buf):
+                                projects.append(ProjectMetadata.model_validate_json(payload))
+                                frames += 1
+                                end += _FRAME_HEADER.size + len(payload)
+                            needs_rewrite = end != len(buf)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        gc.collect()
+
+        with self._order_lock:
+            self._projects = {}
+            self._short_links = {}
+            self._list_item_json = {}
+
+            for metadata in projects:
+                self._projects[metadata.project_id] = metadata
+
+                if metadata.short_link:
+                    self._short_links[metadata.short_link] = metadata.project_id
+
+            self._rebuild_order()
+            self._dirty.clear()
+            self._needs_rewrite = needs_rewrite
+        self._frames_on_disk = frames
 
     def save_to_disk(self) -> None:
-        """Save index to disk (index.json)."""
-        self.index_file.parent.mkdir(parents=True, exist_ok=True)
-
-        data = {
-            "projects": [
-                metadata.model_dump(mode="json") for metadata in self._projects.values()
-            ]
+        """Save index to disk (index.json).
+
+        Safe to run in a worker thread while the index changes: what to write
+        is taken under the lock, and saves are serialized so an append never
+        races a rewrite.
+        """
+        with self._save_lock:
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+
+            with self._order_lock:
+                rewrite = (
+                    self._needs_rewrite
+                    or not self.index_file.exists()
+                    or self._frames_on_disk + len(self._dirty)
+                    > _COMPACT_RATIO * len(self._projects) + 16
+                )
+                if rewrite:
+                    projects = list(self._projects.values())
+                else:
+                    projects = [
+                        self._projects[project_id]
+                        for project_id in self._dirty
+                        if project_id in self._projects
+                    ]
+                dirty, self._dirty = self._dirty, set()
+                self._needs_rewrite = False
+
+            try:
+                if rewrite:
+                    self._rewrite(projects)
+                    self._frames_on_disk = len(projects)
+                elif projects:
+                    with open(self.index_file, "ab") as f:
+                        f.write(b"".join(_encode_frame(metadata) for metadata in projects))
+                    self._frames_on_disk += len(projects)
+            except BaseException:
+                # Leave it all for the next save, which rewrites the whole file
+                with self._order_lock:
+                    self._dirty |= dirty
+                    self._needs_rewrite = True
+                raise
+
+    async def load_from_disk_async(self) -> None:
+        """Load index from disk in a worker thread, keeping the event loop free."""
+        await asyncio.to_thread(self.load_from_disk)
+
+    async def save_to_disk_async(self) -> None:
+        """Save index to disk in a worker thread, keeping the event loop free."""
+        await asyncio.to_thread(self.save_to_disk)
+
+    def _rewrite(self, projects: Iterable[ProjectMetadata]) -> None:
+        """Write projects to a fresh index file and swap it in atomically.
+
+        Frames are encoded and written one at a time, so the whole index is
+        never held in memory as bytes.
+        """
+        tmp_file = self.index_file.with_suffix(self.index_file.suffix + ".tmp")
+        with open(tmp_file, "wb") as f:
+            for metadata in projects:
+                f.write(_encode_frame(metadata))
+            f.flush()
+            os.fsync(f.fileno())  # Contents reach disk before the rename does
+        os.replace(tmp_file, self.index_file)
+
+    def _rebuild_order(self) -> None:
+        """Rebuild the sorted listings from scratch. Call with _order_lock held."""
+        self._positions = {
+            project_id: (_sort_key(p), p.processing_status)
+            for project_id, p in self._projects.items()
         }
-
-        with open(self.index_file, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        self._by_date = sorted(key for key, _ in self._positions.values())
+        self._by_status = {}
+        for key in self._by_date:
+            self._by_status.setdefault(self._positions[key[1]][1], []).append(key)
+
+        self._search_texts = {}
+        self._postings = {}
+        for project_id, p in self._projects.items():
+            self._index_text(project_id, _search_texts(p))
+
+    def _index_text(self, project_id: UUID, texts: tuple[str, str]) -> None:
+        """Add a project's search texts to the trigram index."""
+        self._search_texts[project_id] = texts
+        for trigram in _trigrams(texts):
+            self._postings.setdefault(trigram, set()).add(project_id)
+
+    def _unfile(self, project_id: UUID) -> None:
+        """Take a project out of the sorted listings. Call with _order_lock held."""
+        position = self._positions.pop(project_id, None)
+        if position is None:
+            return
+        key, status = position
+        for keys in (self._by_date, self._by_status[status]):
+            del keys[bisect.bisect_left(keys, key)]
+
+        for trigram in _trigrams(self._search_texts.pop(project_id)):
+            postings = self._postings[trigram]
+            postings.discard(project_id)
+            if not postings:
+                del self._postings[trigram]
+
+    def _file(self, metadata: ProjectMetadata) -> None:
+        """Put a project into the sorted listings. Call with _order_lock held."""
+        key = _sort_key(metadata)
+        status = metadata.processing_status
+        self._positions[metadata.project_id] = (key, status)
+        bisect.insort(self._by_date, key)
+        bisect.insort(self._by_status.setdefault(status, []), key)
+        self._index_text(metadata.project_id, _search_texts(metadata))
 
     def add(self, metadata: ProjectMetadata) -> None:
         """Add or update project in index."""
-        self._projects[metadata.project_id] = metadata
+        with self._order_lock:
+            self._unfile(metadata.project_id)
+            self._file(metadata)
+            self._projects[metadata.project_id] = metadata
+            self._dirty.add(metadata.project_id)
+        self._list_item_json.pop(metadata.project_id, None)
 
         if metadata.short_link:
             self._short_links[metadata.short_link] = metadata.project_id
 
+    def add_bulk(self, projects: Iterable[ProjectMetadata]) -> None:
+        """Add or update several projects in index."""
+        for metadata in projects:
+            self.add(metadata)
+
     def remove(self, project_id: UUID) -> None:
         """Remove project from index."""
         metadata = self._projects.get(project_id)
         if metadata and metadata.short_link:
             self._short_links.pop(metadata.short_link, None)
 
-        self._projects.pop(project_id, None)
+        self._list_item_json.pop(project_id, None)
+        with self._order_lock:
+            self._unfile(project_id)
+            if self._projects.pop(project_id, None) is not None:
+                self._dirty.discard(project_id)
+                self._needs_rewrite = True
+
+    def clear(self) -> None:
+        """Drop every project from the index, without touching the file."""
+        with self._order_lock:
+            self._projects = {}
+            self._short_links = {}
+            self._list_item_json = {}
+            self._rebuild_order()
 
     def get(self, project_id: UUID) -> Optional[ProjectMetadata]:
         """Get project metadata by ID."""
         return self._projects.get(project_id)
 
+    def all_metadata(self) -> list[ProjectMetadata]:
+        """Get full metadata of every indexed project (unordered)."""
+        return list(self._projects.values())
+
     def get_by_short_link(self, short_link: str) -> Optional[ProjectMetadata]:
         """Get project metadata by short link."""
         project_id = self._short_links.get(short_link)
@@ -76,70 +367,77 @@ class IndexService:
             return self._projects.get(project_id)
         return None
 
+    def _filter_sorted(
+        self, status: Optional[ProcessingStatus] = None, limit: Optional[int] = None
+    ) -> list[ProjectMetadata]:
+        """Projects matching status, newest first, truncated to limit."""
+        with self._order_lock:
+            keys = self._by_status.get(status, []) if status else self._by_date
+
+            # Limit results
+            if limit:
+                keys = keys[:limit]
+
+            projects = self._projects
+            return [projects[project_id] for _, project_id in keys]
+
     def list_all(
         self, status: Optional[ProcessingStatus] = None, limit: Optional[int] = None
     ) -> list[ProjectListItem]:
         """List all projects, optionally filtered by status."""
-        projects = self._projects.values()
+        return [_to_list_item(p) for p in self._filter_sorted(status, limit)]
 
-        # Filter by status
-        if status:
-            projects = [p for p in projects if p.processing_status == status]
-
-        # Sort by upload date (newest first)
-        projects = sorted(projects, key=lambda p: p.upload_date, reverse=True)
-
-        # Limit results
-        if limit:
-            projects = list(projects)[:limit]
-
-        # Convert to ProjectListItem
-        return [
-            ProjectListItem(
-                project_id=p.project_id,
-                project_name=p.project_name or p.filename,
-                filename=p.filename,
-                upload_date=p.upload_date,
-                aps_count=p.aps_count,
-                processing_status=p.processing_status,
-                short_link=p.short_link,
-            )
-            for p in projects
-        ]
+    def list_all_json(
+        self, status: Optional[ProcessingStatus] = None, limit: Optional[int] = None
+    ) -> bytes:
+        """List projects like list_all(), already serialized as a JSON array.
+
+        Each project's list item JSON is cached until the project is re-added
+        or removed, so repeated listings only join bytes. Entries remember the
+        metadata they were encoded from and are only reused for that same
+        object, so a listing racing add() cannot leave stale JSON behind.
+        """
+        cache = self._list_item_json
+        items = []
+        for p in self._filter_sorted(status, limit):
+            cached = cache.get(p.project_id)
+            if cached is not None and cached[0] is p:
+                item = cached[1]
+            else:
+                item = _encode_list_item(p)
+                cache[p.project_id] = (p, item)
+            items.append(item)
+        return b"[" + b",".join(items) + b"]"
 
     def search(self, query: str) -> list[ProjectListItem]:
         """Search projects by name or filename."""
         query_lower = query.lower()
 
-        projects = [
-            p
-            for p in self._projects.values()
-            if query_lower in (p.project_name or "").lower()
-            or query_lower in p.filename.lower()
-        ]
-
-        # Sort by upload date (newest first)
-        projects = sorted(projects, key=lambda p: p.upload_date, reverse=True)
-
-        return [
-            ProjectListItem(
-                project_id=p.project_id,
-                project_name=p.project_name or p.filename,
-                filename=p.filename,
-                upload_date=p.upload_date,
-                aps_count=p.aps_count,
-                processing_status=p.processing_status,
-                short_link=p.short_link,
-            )
-            for p in projects
-        ]
+        with self._order_lock:
+            texts = self._search_texts
+            if len(query_lower) < _TRIGRAM:
+                # Too short for the trigram index: walk everything in
+                # upload date order (newest first), so matches come out sorted
+                candidates = [project_id for _, project_id in self._by_date]
+            else:
+                # Intersect the postings, smallest first
+                postings = sorted(
+                    (self._postings.get(trigram, set()) for trigram in _trigrams([query_lower])),
+                    key=len,
+                )
+                candidates = set(postings[0]).intersection(*postings[1:])
+                candidates = sorted(candidates, key=lambda pid: self._positions[pid][0])
+
+            return [
+                _to_list_item(self._projects[project_id])
+                for project_id in candidates
+                if query_lower in texts[project_id][0] or query_lower in texts[project_id][1]
+            ]
 
     def count(self, status: Optional[ProcessingStatus] = None) -> int:
         """Count projects, optionally filtered by status."""
         if status:
-            return sum(
-                1 for p in self._projects.values() if p.processing_status == status
-            )
+            return len(self._by_status.get(status, ()))
         return len(self._projects)
 
 
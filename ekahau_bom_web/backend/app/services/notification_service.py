@@ -1,5 +1,6 @@
 """Notification service for email, webhook, and Slack notifications."""
 
+import asyncio
 import logging
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
@@ -7,13 +8,47 @@ from typing import Optional
 
 import aiosmtplib
 import httpx
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import Environment, FileSystemLoader, Template, select_autoescape
 
 from app.config import settings
 from app.models import BatchMetadata, Schedule, ScheduleRun, ScheduleStatus
 
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Email template and subject for each run status; others use the fallbacks
+EMAIL_TEMPLATES = {
+    ScheduleStatus.SUCCESS: "schedule_completed.html",
+    ScheduleStatus.FAILED: "schedule_failed.html",
+    ScheduleStatus.PARTIAL: "schedule_partial.html",
+}
+EMAIL_SUBJECTS = {
+    ScheduleStatus.SUCCESS: "✅ Schedule '{name}' completed successfully",
+    ScheduleStatus.FAILED: "❌ Schedule '{name}' failed",
+    ScheduleStatus.PARTIAL: "⚠️ Schedule '{name}' completed with errors",
+}
+DEFAULT_EMAIL_TEMPLATE = "schedule_completed.html"
+DEFAULT_EMAIL_SUBJECT = "Schedule '{name}' executed"
+
+# Slack status marker for each run status
+STATUS_EMOJI = {
+    ScheduleStatus.SUCCESS: "✅",
+    ScheduleStatus.FAILED: "❌",
+    ScheduleStatus.PARTIAL: "⚠️",
+    ScheduleStatus.RUNNING: "⏳",
+}
+DEFAULT_STATUS_EMOJI = "ℹ️"
+
+# Connection pool shared by webhook and Slack notifications
+HTTP_TIMEOUT = 30.0
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=50, max_connections=100)
+
 
 class NotificationService:
     """Service for sending notifications via email, webhook, and Slack."""
@@ -31,8 +66,38 @@ class NotificationService:
             autoescape=select_autoescape(["html", "xml"]),
         )
 
+        # Compiled email templates by name, loaded on first use
+        self._templates: dict[str, Template] = {}
+
+        # Created on first use, so connections stay warm between notifications
+        self._http: Optional[httpx.AsyncClient] = None
+
         logger.info("NotificationService initialized")
 
+    def _get_template(self, name: str) -> Template:
+        """Get a compiled email template, loading it on first use.
+
+        Skips the environment's per-call cache lookup and up-to-date check.
+        """
+        template = self._templates.get(name)
+        if template is None:
+            template = self._templates[name] = self.jinja_env.get_template(name)
+        return template
+
+    def _get_http(self) -> httpx.AsyncClient:
+        """Get the shared HTTP client, creating it if needed."""
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                timeout=HTTP_TIMEOUT, limits=HTTP_LIMITS, http2=HTTP2_AVAILABLE
+            )
+        return self._http
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client and its connections."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
     async def send_email(
         self,
         to: list[str],
@@ -65,7 +130,7 @@ class NotificationService:
 
         try:
             # Render email template
-            email_template = self.jinja_env.get_template(template)
+            email_template = self._get_template(template)
             html_body = email_template.render(**context)
 
             # Create message
@@ -111,9 +176,8 @@ class NotificationService:
             return False
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(url, json=payload)
-                response.raise_for_status()
+            response = await self._get_http().post(url, json=payload)
+            response.raise_for_status()
 
             logger.info(f"Webhook sent to {url} (status: {response.status_code})")
             return True
@@ -146,9 +210,8 @@ class NotificationService:
             if blocks:
                 payload["blocks"] = blocks
 
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(webhook_url, json=payload)
-                response.raise_for_status()
+            response = await self._get_http().post(webhook_url, json=payload)
+            response.raise_for_status()
 
             logger.info(f"Slack notification sent (status: {response.status_code})")
             return True
@@ -188,19 +251,22 @@ class NotificationService:
         ):
             return
 
-        # Prepare context using helper method
-        context = self._build_email_context(schedule, run, batch)
+        # Channels are sent concurrently, so a slow one does not hold up the rest
+        sends = []
 
         # Email notification
         if schedule.notification_config.email:
+            context = self._build_email_context(schedule, run, batch)
             template = self._get_email_template(run.status)
             subject = self._get_email_subject(schedule.name, run.status)
 
-            await self.send_email(
-                to=schedule.notification_config.email,
-                subject=subject,
-                template=template,
-                context=context,
+            sends.append(
+                self.send_email(
+                    to=schedule.notification_config.email,
+                    subject=subject,
+                    template=template,
+                    context=context,
+                )
             )
 
         # Webhook notification
@@ -224,14 +290,20 @@ class NotificationService:
             if run.error_message:
                 payload["error_message"] = run.error_message
 
-            await self.send_webhook(schedule.notification_config.webhook_url, payload)
+            sends.append(self.send_webhook(schedule.notification_config.webhook_url, payload))
 
         # Slack notification
         if schedule.notification_config.slack_webhook:
             message = self._format_slack_message(schedule.name, run)
             blocks = self._format_slack_blocks(schedule.name, run)
 
-            await self.send_slack(schedule.notification_config.slack_webhook, message, blocks)
+            sends.append(
+                self.send_slack(schedule.notification_config.slack_webhook, message, blocks)
+            )
+
+        for result in await asyncio.gather(*sends, return_exceptions=True):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to notify for schedule {schedule.name}: {result}")
 
     def _build_email_context(
         self,
@@ -272,34 +344,15 @@ class NotificationService:
 
     def _get_email_template(self, status: ScheduleStatus) -> str:
         """Get email template name based on status."""
-        if status == ScheduleStatus.SUCCESS:
-            return "schedule_completed.html"
-        elif status == ScheduleStatus.FAILED:
-            return "schedule_failed.html"
-        elif status == ScheduleStatus.PARTIAL:
-            return "schedule_partial.html"
-        else:
-            return "schedule_completed.html"
+        return EMAIL_TEMPLATES.get(status, DEFAULT_EMAIL_TEMPLATE)
 
     def _get_email_subject(self, schedule_name: str, status: ScheduleStatus) -> str:
         """Get email subject based on status."""
-        if status == ScheduleStatus.SUCCESS:
-            return f"✅ Schedule '{schedule_name}' completed successfully"
-        elif status == ScheduleStatus.FAILED:
-            return f"❌ Schedule '{schedule_name}' failed"
-        elif status == ScheduleStatus.PARTIAL:
-            return f"⚠️ Schedule '{schedule_name}' completed with errors"
-        else:
-            return f"Schedule '{schedule_name}' executed"
+        return EMAIL_SUBJECTS.get(status, DEFAULT_EMAIL_SUBJECT).format(name=schedule_name)
 
     def _format_slack_message(self, schedule_name: str, run: ScheduleRun) -> str:
         """Format Slack message text."""
-        status_emoji = {
-            ScheduleStatus.SUCCESS: "✅",
-            ScheduleStatus.FAILED: "❌",
-            ScheduleStatus.PARTIAL: "⚠️",
-            ScheduleStatus.RUNNING: "⏳",
-        }.get(run.status, "ℹ️")
+        status_emoji = STATUS_EMOJI.get(run.status, DEFAULT_STATUS_EMOJI)
 
         message = f"{status_emoji} Schedule '{schedule_name}' {run.status.value}\n"
         message += f"Duration: {run.duration_seconds:.2f}s\n"
@@ -312,12 +365,7 @@ class NotificationService:
 
     def _format_slack_blocks(self, schedule_name: str, run: ScheduleRun) -> list[dict]:
         """Format Slack block kit blocks."""
-        status_emoji = {
-            ScheduleStatus.SUCCESS: "✅",
-            ScheduleStatus.FAILED: "❌",
-            ScheduleStatus.PARTIAL: "⚠️",
-            ScheduleStatus.RUNNING: "⏳",
-        }.get(run.status, "ℹ️")
+        status_emoji = STATUS_EMOJI.get(run.status, DEFAULT_STATUS_EMOJI)
 
         blocks = [
             {
@@ -13,7 +13,7 @@ from pathlib import Path
 from typing import Optional
 from uuid import UUID
 
-from app.models import ProcessingStatus, ProjectMetadata
+from app.models import ProcessingStatus, ProjectMetadata, intern_names
 from app.services.cache import cache_service
 from app.services.index import index_service
 from app.services.storage_service import StorageService
@@ -325,12 +325,12 @@ class ProcessorService:
             # Extract vendors from bill_of_materials
             bom = report_data.get("access_points", {}).get("bill_of_materials", [])
             vendors = sorted(set(item["vendor"] for item in bom if "vendor" in item))
-            metadata.vendors = vendors if vendors else None
+            metadata.vendors = intern_names(vendors) if vendors else None
 
             # Extract floor names
             floors_data = report_data.get("floors", [])
             floors = [floor["name"] for floor in floors_data if "name" in floor]
-            metadata.floors = floors if floors else None
+            metadata.floors = intern_names(floors) if floors else None
 
             logger.debug(f"Extracted summary for {project_id}: {summary}")
 
@@ -13,7 +13,7 @@ import logging
 from pathlib import Path
 from typing import Optional, Dict, List
 from datetime import datetime, timedelta
-from collections import defaultdict
+from collections import Counter, defaultdict
 from uuid import UUID
 import csv
 import io
@@ -47,8 +47,8 @@ class AggregatedReportData:
         self.total_antennas: int = 0
 
         # Aggregated BOM: vendor|model -> quantity
-        self.ap_by_vendor_model: Dict[str, int] = defaultdict(int)
-        self.antenna_by_model: Dict[str, int] = defaultdict(int)
+        self.ap_by_vendor_model: Counter[str] = Counter()
+        self.antenna_by_model: Counter[str] = Counter()
 
         # Time-based metrics
         self.batches_by_date: Dict[str, int] = defaultdict(int)  # date -> count
@@ -206,11 +206,8 @@ class ReportScheduleService:
                 report_data.total_antennas += batch.statistics.total_antennas
 
                 # Aggregate equipment by vendor/model
-                for vendor_model, quantity in batch.statistics.ap_by_vendor_model.items():
-                    report_data.ap_by_vendor_model[vendor_model] += quantity
-
-                for model, quantity in batch.statistics.antenna_by_model.items():
-                    report_data.antenna_by_model[model] += quantity
+                report_data.ap_by_vendor_model.update(batch.statistics.ap_by_vendor_model)
+                report_data.antenna_by_model.update(batch.statistics.antenna_by_model)
 
             # Track batches and APs by date
             batch_date_obj = (
@@ -262,18 +259,14 @@ class ReportScheduleService:
         # Access Points by Vendor/Model
         output.write("ACCESS POINTS BY VENDOR/MODEL\n")
         output.write("Vendor|Model,Quantity\n")
-        for vendor_model, quantity in sorted(
-            report_data.ap_by_vendor_model.items(), key=lambda x: x[1], reverse=True
-        ):
+        for vendor_model, quantity in report_data.ap_by_vendor_model.most_common():
             output.write(f"{vendor_model},{quantity}\n")
         output.write("\n")
 
         # Antennas by Model
         output.write("ANTENNAS BY MODEL\n")
         output.write("Model,Quantity\n")
-        for model, quantity in sorted(
-            report_data.antenna_by_model.items(), key=lambda x: x[1], reverse=True
-        ):
+        for model, quantity in report_data.antenna_by_model.most_common():
             output.write(f"{model},{quantity}\n")
         output.write("\n")
 
@@ -320,17 +313,13 @@ class ReportScheduleService:
 
         lines.append("ACCESS POINTS BY VENDOR/MODEL")
         lines.append("-" * 80)
-        for vendor_model, quantity in sorted(
-            report_data.ap_by_vendor_model.items(), key=lambda x: x[1], reverse=True
-        ):
+        for vendor_model, quantity in report_data.ap_by_vendor_model.most_common():
             lines.append(f"{vendor_model:<50} {quantity:>10}")
         lines.append("")
 
         lines.append("ANTENNAS BY MODEL")
         lines.append("-" * 80)
-        for model, quantity in sorted(
-            report_data.antenna_by_model.items(), key=lambda x: x[1], reverse=True
-        ):
+        for model, quantity in report_data.antenna_by_model.most_common():
             lines.append(f"{model:<50} {quantity:>10}")
         lines.append("")
 
@@ -3,16 +3,23 @@
 import asyncio
 import json
 import logging
-from datetime import UTC, datetime
-from pathlib import Path
-from typing import TYPE_CHECKING, Optional
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime, timedelta
+from functools import lru_cache
+from pathlib import Path, PurePath, PurePosixPath
+from typing import TYPE_CHECKING, Any, Optional
 from uuid import UUID
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.jobstores.base import JobLookupError
 from apscheduler.jobstores.memory import MemoryJobStore
+from watchdog.events import FileSystemEvent, PatternMatchingEventHandler
+from watchdog.observers import Observer
 
+from app.config import settings
 from app.models import (
     ProcessingRequest,
     Schedule,
@@ -21,8 +28,10 @@ from app.models import (
     ScheduleRun,
     ScheduleStatus,
     ScheduleUpdateRequest,
+    TriggerConfig,
     TriggerType,
 )
+from app.utils.scan import scan_files
 
 if TYPE_CHECKING:
     from app.services.batch_service import BatchService
@@ -31,6 +40,142 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Quiet period after the last new file before a directory trigger fires, so
+# a burst of copies is processed as one batch
+WATCH_DEBOUNCE_SECONDS = 10
+
+# Concurrent list_objects_v2 requests when listing an S3 trigger prefix
+S3_LIST_CONCURRENCY = 8
+
+
+@lru_cache(maxsize=256)
+def parse_cron(cron_expression: str) -> CronTrigger:
+    """
+    Parse a crontab expression into a UTC CronTrigger, cached per expression.
+
+    CronTrigger is stateless once built, so one instance is shared by every
+    schedule using the same expression and by repeated validations.
+
+    Args:
+        cron_expression: Five-field crontab expression
+
+    Returns:
+        CronTrigger in UTC
+
+    Raises:
+        ValueError: If the expression is invalid
+    """
+    try:
+        return CronTrigger.from_crontab(cron_expression, timezone="UTC")
+    except Exception as e:
+        raise ValueError(f"Invalid cron expression: {e}") from e
+
+
+def _find_matching_files(directory: Path, pattern: re.Pattern[str], recursive: bool) -> list[Path]:
+    """
+    List files under directory whose names match a precompiled pattern.
+
+    Args:
+        directory: Directory to scan
+        pattern: Compiled file name pattern (see TriggerConfig.pattern_regex)
+        recursive: Descend into subdirectories (symlinked directories are not followed)
+
+    Returns:
+        Matching file paths, sorted
+
+    Raises:
+        OSError: If directory itself cannot be listed (unreadable subdirectories are skipped)
+    """
+    matches = [Path(entry.path) for entry in scan_files(directory, pattern.match, recursive)]
+    matches.sort()
+    return matches
+
+
+def _list_s3_page_keys(
+    s3_client: Any, bucket: str, prefix: str, delimiter: Optional[str] = None
+) -> tuple[list[str], list[str]]:
+    """
+    Page through list_objects_v2 for one prefix.
+
+    Args:
+        s3_client: boto3 S3 client
+        bucket: Bucket name
+        prefix: Key prefix
+        delimiter: Group keys below this delimiter into common prefixes
+
+    Returns:
+        Tuple of (object keys, common prefixes)
+    """
+    params = {"Bucket": bucket, "Prefix": prefix, "PaginationConfig": {"PageSize": 1000}}
+    if delimiter:
+        params["Delimiter"] = delimiter
+
+    keys: list[str] = []
+    prefixes: list[str] = []
+    for page in s3_client.get_paginator("list_objects_v2").paginate(**params):
+        keys.extend(obj["Key"] for obj in page.get("Contents", []))
+        prefixes.extend(p["Prefix"] for p in page.get("CommonPrefixes", []))
+    return keys, prefixes
+
+
+def _list_s3_keys(
+    s3_client: Any, bucket: str, prefix: Optional[str], pattern: re.Pattern[str], recursive: bool
+) -> list[str]:
+    """
+    List object keys under an S3 prefix whose names match a precompiled pattern.
+
+    The top level is listed with Delimiter='/'. Recursive listings then list
+    each sub-"folder" concurrently, hiding per-request latency. Blocks until the
+    listing completes; call it from a worker thread (asyncio.to_thread), never
+    on the event loop.
+
+    Args:
+        s3_client: boto3 S3 client (thread-safe)
+        bucket: Bucket name
+        prefix: Key prefix ("folder"); a trailing slash is added if missing
+        pattern: Compiled file name pattern (see TriggerConfig.pattern_regex)
+        recursive: Include keys below nested "folders"
+
+    Returns:
+        Matching object keys, sorted
+    """
+    # A "folder" prefix without its trailing slash also matches sibling keys
+    # and is much slower to list on some S3-compatible backends
+    prefix = prefix or ""
+    if prefix and not prefix.endswith("/"):
+        prefix += "/"
+
+    # Delimiter='/' returns only direct children plus one entry per sub-"folder",
+    # so non-recursive listings never page through deeper keys
+    all_keys, sub_prefixes = _list_s3_page_keys(s3_client, bucket, prefix, delimiter="/")
+
+    if recursive and sub_prefixes:
+        workers = min(S3_LIST_CONCURRENCY, len(sub_prefixes))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for sub_keys, _ in pool.map(
+                lambda sub_prefix: _list_s3_page_keys(s3_client, bucket, sub_prefix),
+                sub_prefixes,
+            ):
+                all_keys.extend(sub_keys)
+
+    keys = [key for key in all_keys if pattern.match(key.rsplit("/", 1)[-1])]
+    keys.sort()
+    return keys
+
+
+class _DirectoryTriggerHandler(PatternMatchingEventHandler):
+    """Calls back when a file matching the trigger pattern appears."""
+
+    def __init__(self, pattern: str, on_new_file):
+        super().__init__(patterns=[pattern], ignore_directories=True)
+        self._on_new_file = on_new_file
+
+    def on_created(self, event: FileSystemEvent) -> None:
+        self._on_new_file()
+
+    def on_moved(self, event: FileSystemEvent) -> None:
+        self._on_new_file()
+
 
 class SchedulerService:
     """Service for managing scheduled batch processing jobs using APScheduler."""
@@ -67,6 +212,17 @@ class SchedulerService:
             self.scheduler = AsyncIOScheduler(jobstores=jobstores, timezone="UTC")
         self._started = False
 
+        # S3 client for S3-triggered schedules (created on first use)
+        self._s3_client: Any = None
+
+        # Filesystem watches for directory-triggered schedules (observer started lazily)
+        self._observer: Optional[Observer] = None
+        self._watches: dict[UUID, object] = {}
+
+        # One run at a time per schedule: the cron job and the debounced
+        # "{id}:watch" job would otherwise pick up the same files concurrently
+        self._run_locks: dict[UUID, asyncio.Lock] = {}
+
         logger.info(
             f"SchedulerService initialized (not started yet, "
             f"scheduler_type={'Background' if use_background else 'AsyncIO'})"
@@ -157,7 +313,7 @@ class SchedulerService:
         """
         try:
             # Parse cron expression
-            trigger = CronTrigger.from_crontab(schedule.cron_expression, timezone="UTC")
+            trigger = parse_cron(schedule.cron_expression)
 
             # Add job to scheduler
             self.scheduler.add_job(
@@ -169,13 +325,10 @@ class SchedulerService:
                 replace_existing=True,
             )
 
-            # Update next run time (handle different APScheduler versions)
-            job = self.scheduler.get_job(str(schedule.schedule_id))
-            if job:
-                # APScheduler 3.x uses next_run_time attribute
-                next_run = getattr(job, "next_run_time", None)
-                if next_run:
-                    schedule.next_run_time = next_run
+            self._refresh_next_run_time(schedule)
+
+            if schedule.trigger_type == TriggerType.DIRECTORY:
+                self._watch_directory(schedule)
 
             logger.info(
                 f"Added job for schedule '{schedule.name}' (ID: {schedule.schedule_id}), "
@@ -186,6 +339,23 @@ class SchedulerService:
             logger.error(f"Failed to add job for schedule {schedule.schedule_id}: {e}")
             raise
 
+    def _refresh_next_run_time(self, schedule: Schedule) -> None:
+        """
+        Copy the job's next fire time onto the schedule.
+
+        Called whenever the job is (re)scheduled or has fired, so listing
+        schedules can read next_run_time without querying the job store.
+
+        Args:
+            schedule: Schedule whose job to read
+        """
+        job = self.scheduler.get_job(str(schedule.schedule_id))
+        if job:
+            # APScheduler 3.x uses next_run_time attribute (absent until started)
+            next_run = getattr(job, "next_run_time", None)
+            if next_run:
+                schedule.next_run_time = next_run
+
     def _remove_job_from_scheduler(self, schedule_id: UUID) -> None:
         """
         Remove a job from APScheduler.
@@ -193,15 +363,103 @@ class SchedulerService:
         Args:
             schedule_id: Schedule ID to remove
         """
+        self._unwatch_directory(schedule_id)
+        try:
+            self.scheduler.remove_job(f"{schedule_id}:watch")  # Pending debounced run
+        except JobLookupError:
+            pass
+
         try:
             self.scheduler.remove_job(str(schedule_id))
             logger.info(f"Removed job for schedule {schedule_id}")
         except Exception as e:
             logger.warning(f"Failed to remove job {schedule_id}: {e}")
 
+    def _watch_directory(self, schedule: Schedule) -> None:
+        """
+        Watch a directory-triggered schedule's directory for new files.
+
+        New matching files queue a one-off run WATCH_DEBOUNCE_SECONDS later;
+        further files within that window push the run back. The cron job stays
+        in place as a fallback for filesystems without change notifications.
+
+        Args:
+            schedule: Directory-triggered schedule
+        """
+        self._unwatch_directory(schedule.schedule_id)
+
+        directory = schedule.trigger_config.directory
+        if not directory or not Path(directory).is_dir():
+            logger.warning(
+                f"Not watching directory for schedule {schedule.schedule_id}: "
+                f"{directory!r} does not exist"
+            )
+            return
+
+        schedule_id = schedule.schedule_id
+        handler = _DirectoryTriggerHandler(
+            schedule.trigger_config.pattern or "*.esx",
+            on_new_file=lambda: self._queue_directory_run(schedule_id),
+        )
+
+        try:
+            if self._observer is None:
+                self._observer = Observer()
+                self._observer.daemon = True
+                self._observer.start()
+            self._watches[schedule_id] = self._observer.schedule(
+                handler, directory, recursive=schedule.trigger_config.recursive
+            )
+            logger.info(f"Watching {directory} for schedule {schedule_id}")
+        except Exception as e:
+            logger.warning(f"Failed to watch {directory}, relying on cron only: {e}")
+
+    def _unwatch_directory(self, schedule_id: UUID) -> None:
+        """
+        Stop watching a schedule's directory, if watched.
+
+        Args:
+            schedule_id: Schedule ID
+        """
+        watch = self._watches.pop(schedule_id, None)
+        if watch is not None and self._observer is not None:
+            try:
+                self._observer.unschedule(watch)
+            except Exception as e:
+                logger.warning(f"Failed to stop watching for schedule {schedule_id}: {e}")
+
+    def _queue_directory_run(self, schedule_id: UUID) -> None:
+        """
+        Queue (or push back) a debounced run after a new file appears.
+
+        Called from the watchdog thread; APScheduler's add_job is thread-safe.
+
+        Args:
+            schedule_id: Schedule ID
+        """
+        self.scheduler.add_job(
+            func=self._execute_schedule,
+            trigger="date",
+            run_date=datetime.now(UTC) + timedelta(seconds=WATCH_DEBOUNCE_SECONDS),
+            args=[schedule_id],
+            id=f"{schedule_id}:watch",
+            replace_existing=True,
+        )
+
     async def _execute_schedule(self, schedule_id: UUID) -> None:
         """
-        Execute a scheduled job - scan directory, create batch, and process files.
+        Execute a scheduled job, waiting for any run of the same schedule to finish first.
+
+        Args:
+            schedule_id: Schedule ID to execute
+        """
+        lock = self._run_locks.setdefault(schedule_id, asyncio.Lock())
+        async with lock:
+            await self._run_schedule(schedule_id)
+
+    async def _run_schedule(self, schedule_id: UUID) -> None:
+        """
+        Run a schedule - scan directory, create batch, and process files.
 
         Args:
             schedule_id: Schedule ID to execute
@@ -215,6 +473,10 @@ class SchedulerService:
 
         logger.info(f"Executing schedule '{schedule.name}' (ID: {schedule_id})")
 
+        # APScheduler advances the job before running it; pick up the new fire time
+        if schedule.enabled:
+            self._refresh_next_run_time(schedule)
+
         # Check if services are available
         if not self._batch_service or not self._storage_service:
             logger.error("SchedulerService: Services not injected, cannot execute schedule")
@@ -231,23 +493,13 @@ class SchedulerService:
         batch_metadata = None
 
         try:
-            # Step 1: Scan directory for .esx files
+            # Step 1: Scan directory (or S3 prefix) for .esx files
             trigger_config = schedule.trigger_config
-            directory = trigger_config.directory
-
-            if not directory:
-                raise ValueError("No directory configured in trigger_config")
-
-            dir_path = Path(directory)
-            if not dir_path.exists():
-                raise FileNotFoundError(f"Directory not found: {directory}")
-
-            # Find matching files
             pattern = trigger_config.pattern or "*.esx"
-            if trigger_config.recursive:
-                matching_files = list(dir_path.rglob(pattern))
-            else:
-                matching_files = list(dir_path.glob(pattern))
+            # Listing and reads are blocking (disk or S3 requests); keep them off the event loop
+            matching_files = await asyncio.to_thread(
+                self._find_trigger_files, schedule.trigger_type, trigger_config
+            )
 
             run.files_found = len(matching_files)
             logger.info(
@@ -297,8 +549,9 @@ class SchedulerService:
             files_added = 0
             for file_path in matching_files:
                 try:
-                    with open(file_path, "rb") as f:
-                        file_content = f.read()
+                    file_content = await asyncio.to_thread(
+                        self._read_trigger_file, schedule.trigger_type, trigger_config, file_path
+                    )
 
                     project_metadata = self._storage_service.save_uploaded_file(
                         filename=file_path.name,
@@ -369,7 +622,6 @@ class SchedulerService:
         finally:
             # Save schedule history
             self._save_schedule_run(run)
-
             # Save updated schedule
             schedules[schedule_id] = schedule
             self._save_schedules()
@@ -385,6 +637,87 @@ class SchedulerService:
                 except Exception as e:
                     logger.error(f"Failed to send notifications: {e}")
 
+    def _get_s3_client(self) -> Any:
+        """Create (once) the S3 client used by S3 triggers, from storage settings."""
+        if self._s3_client is None:
+            import boto3
+
+            self._s3_client = boto3.client(
+                "s3",
+                region_name=settings.s3_region,
+                aws_access_key_id=settings.s3_access_key,
+                aws_secret_access_key=settings.s3_secret_key,
+                endpoint_url=settings.s3_endpoint_url,
+                use_ssl=settings.s3_use_ssl,
+                verify=settings.s3_ca_bundle or settings.s3_verify,
+            )
+        return self._s3_client
+
+    def _find_trigger_files(
+        self, trigger_type: TriggerType, trigger_config: TriggerConfig
+    ) -> list[PurePath]:
+        """
+        Find files to process for a schedule run.
+
+        Args:
+            trigger_type: Schedule trigger type
+            trigger_config: Trigger configuration
+
+        Returns:
+            Local file paths, or S3 object keys as PurePosixPath for S3 triggers
+
+        Raises:
+            ValueError: If the trigger has no directory or bucket configured
+            FileNotFoundError: If the configured directory does not exist
+        """
+        if trigger_type == TriggerType.S3:
+            if not trigger_config.s3_bucket:
+                raise ValueError("No s3_bucket configured in trigger_config")
+
+            keys = _list_s3_keys(
+                self._get_s3_client(),
+                trigger_config.s3_bucket,
+                trigger_config.s3_prefix,
+                trigger_config.pattern_regex,
+                trigger_config.recursive,
+            )
+            return [PurePosixPath(key) for key in keys]
+
+        directory = trigger_config.directory
+        if not directory:
+            raise ValueError("No directory configured in trigger_config")
+
+        dir_path = Path(directory)
+        if not dir_path.exists():
+            raise FileNotFoundError(f"Directory not found: {directory}")
+
+        return _find_matching_files(
+            dir_path, trigger_config.pattern_regex, trigger_config.recursive
+        )
+
+    def _read_trigger_file(
+        self, trigger_type: TriggerType, trigger_config: TriggerConfig, file_path: PurePath
+    ) -> bytes:
+        """
+        Read one file found by _find_trigger_files.
+
+        Args:
+            trigger_type: Schedule trigger type
+            trigger_config: Trigger configuration
+            file_path: Local path, or S3 object key for S3 triggers
+
+        Returns:
+            File content
+        """
+        if trigger_type == TriggerType.S3:
+            response = self._get_s3_client().get_object(
+                Bucket=trigger_config.s3_bucket, Key=str(file_path)
+            )
+            return response["Body"].read()
+
+        with open(file_path, "rb") as f:
+            return f.read()
+
     def _save_schedule_run(self, run: ScheduleRun) -> None:
         """
         Save schedule execution history.
@@ -427,10 +760,7 @@ class SchedulerService:
             ValueError: If cron expression is invalid
         """
         # Validate cron expression
-        try:
-            CronTrigger.from_crontab(request.cron_expression)
-        except Exception as e:
-            raise ValueError(f"Invalid cron expression: {e}")
+        parse_cron(request.cron_expression)
 
         # Create schedule
         schedule = Schedule(
@@ -494,13 +824,7 @@ class SchedulerService:
             if trigger_type is not None and schedule.trigger_type != trigger_type:
                 continue
 
-            # Update next run time from scheduler
-            if schedule.enabled:
-                job = self.scheduler.get_job(str(schedule.schedule_id))
-                if job:
-                    next_run = getattr(job, "next_run_time", None)
-                    if next_run:
-                        schedule.next_run_time = next_run
+            # next_run_time is kept current when jobs are added or fire
 
             filtered.append(
                 ScheduleListItem(
@@ -548,10 +872,7 @@ class SchedulerService:
 
         # Validate cron expression if changed
         if request.cron_expression and request.cron_expression != schedule.cron_expression:
-            try:
-                CronTrigger.from_crontab(request.cron_expression)
-            except Exception as e:
-                raise ValueError(f"Invalid cron expression: {e}")
+            parse_cron(request.cron_expression)
 
         # Update fields
         if request.name is not None:
@@ -614,6 +935,7 @@ class SchedulerService:
 
         # Remove from storage
         del schedules[schedule_id]
+        self._run_locks.pop(schedule_id, None)
         self._save_schedules()
 
         # Remove history file
@@ -680,6 +1002,11 @@ class SchedulerService:
     def shutdown(self) -> None:
         """Shutdown the scheduler."""
         logger.info("Shutting down scheduler")
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout=5)
+            self._observer = None
+            self._watches.clear()
         self.scheduler.shutdown()
 
 
@@ -59,8 +59,7 @@ class StorageService:
             metadata: Project metadata
         """
         # Serialize metadata to JSON bytes
-        metadata_json = json.dumps(metadata.model_dump(mode="json"), indent=2, ensure_ascii=False)
-        metadata_bytes = metadata_json.encode("utf-8")
+        metadata_bytes = metadata.model_dump_json(indent=2).encode("utf-8")
 
         # Save using backend
         self.backend.save_file(project_id, "metadata.json", metadata_bytes)
@@ -81,8 +80,7 @@ class StorageService:
         try:
             # Load from backend
             metadata_bytes = self.backend.get_file(project_id, "metadata.json")
-            data = json.loads(metadata_bytes.decode("utf-8"))
-            return ProjectMetadata(**data)
+            return ProjectMetadata.model_validate_json(metadata_bytes)
         except FileNotFoundError:
             return None
 
@@ -11,6 +11,7 @@ from __future__ import annotations
 
 import logging
 from datetime import UTC, datetime
+from uuid import UUID
 
 from app.services.archive import archive_service
 from app.services.cache import cache_service
@@ -46,68 +47,66 @@ def archive_old_projects() -> dict:
     errors = 0
     total_space_saved = 0
 
-    # Get all projects from index
-    all_projects = index_service.list_all()
+    # Pick due projects from the in-memory index; only those are loaded from storage
+    all_projects = index_service.all_metadata()
     total_projects = len(all_projects)
+    candidates = archive_service.find_archive_candidates(all_projects)
 
-    logger.info(f"Checking {total_projects} projects for archiving")
+    logger.info(f"Checking {total_projects} projects for archiving ({len(candidates)} candidates)")
 
-    for project_item in all_projects:
+    # Confirm candidates against stored metadata and record sizes before archiving
+    original_sizes: dict[UUID, int] = {}
+    for project_id in candidates:
         try:
             # Load full metadata
-            metadata = storage_service.load_metadata(project_item.project_id)
+            metadata = storage_service.load_metadata(project_id)
             if not metadata:
                 continue
 
-            # Check if project should be archived
+            # Re-check against stored metadata (index may be stale)
             if not archive_service.should_archive(metadata):
                 continue
 
             logger.info(
-                f"Archiving project {project_item.project_id} "
+                f"Archiving project {project_id} "
                 f"(name: {metadata.project_name}, "
                 f"last_accessed: {metadata.last_accessed}, "
                 f"upload_date: {metadata.upload_date})"
             )
 
             # Get project size before archiving
-            project_dir = storage_service.get_project_dir(project_item.project_id)
-            original_size = archive_service._get_dir_size(project_dir)
-
-            # Archive project
-            if archive_service.archive_project(project_item.project_id):
-                # Get archive size
-                archive_path = archive_service.get_archive_path(project_item.project_id)
-                archive_size = archive_path.stat().st_size if archive_path.exists() else 0
-
-                space_saved = original_size - archive_size
-                total_space_saved += space_saved
-
-                logger.info(
-                    f"Project {project_item.project_id} archived successfully. "
-                    f"Original: {original_size / 1024 / 1024:.2f} MB, "
-                    f"Archive: {archive_size / 1024 / 1024:.2f} MB, "
-                    f"Saved: {space_saved / 1024 / 1024:.2f} MB "
-                    f"({(space_saved / original_size * 100):.1f}%)"
-                )
-
-                projects_archived += 1
-
-                # Update index
-                metadata = storage_service.load_metadata(project_item.project_id)
-                if metadata:
-                    index_service.add(metadata)
-            else:
-                logger.error(f"Failed to archive project {project_item.project_id}")
-                errors += 1
+            project_dir = storage_service.get_project_dir(project_id)
+            original_sizes[project_id] = archive_service._get_dir_size(project_dir)
 
         except Exception as e:
             logger.error(
-                f"Error processing project {project_item.project_id}: {e}",
+                f"Error processing project {project_id}: {e}",
                 exc_info=True,
             )
             errors += 1
 
+    # Archive in one pass; index and caches are updated once for the whole batch
+    archived_ids = archive_service.archive_projects_bulk(original_sizes)
+    errors += len(original_sizes) - len(archived_ids)
+
+    for project_id in archived_ids:
+        original_size = original_sizes[project_id]
+        archive_path = archive_service.get_archive_path(project_id)
+        archive_size = archive_path.stat().st_size if archive_path.exists() else 0
+
+        space_saved = original_size - archive_size
+        total_space_saved += space_saved
+
+        logger.info(
+            f"Project {project_id} archived successfully. "
+            f"Original: {original_size / 1024 / 1024:.2f} MB, "
+            f"Archive: {archive_size / 1024 / 1024:.2f} MB, "
+            f"Saved: {space_saved / 1024 / 1024:.2f} MB "
+            f"({(space_saved / original_size * 100) if original_size else 0:.1f}%)"
+        )
+
+    projects_archived = len(archived_ids)
+
     # Save index to disk
     index_service.save_to_disk()
 
@@ -0,0 +1,31 @@
+"""Crash-safe file replacement."""
+
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+
+
+def atomic_write(path: Path, data: bytes) -> None:
+    """Replace a file's contents atomically and durably.
+
+    The data is written to a temporary sibling in one ``write()``, fsynced,
+    and renamed over ``path``, so readers see either the old or the new file
+    and a crash never leaves it truncated.
+
+    Args:
+        path: File to replace (its directory must exist)
+        data: New file contents
+    """
+    # Unique per writer thread, in the same directory so the rename is atomic
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
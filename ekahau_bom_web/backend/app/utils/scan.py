@@ -0,0 +1,57 @@
+"""Finding files in a directory tree with a single os.scandir walk."""
+
+from __future__ import annotations
+
+import logging
+import os
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def scan_files(
+    directory: Path | str,
+    match: Callable[[str], bool],
+    recursive: bool,
+    on_subdirectory: Optional[Callable[[os.DirEntry], None]] = None,
+) -> Iterator[os.DirEntry]:
+    """Yield the files under a directory whose names match, in no particular order.
+
+    Symlinked files are followed; symlinked directories are not descended
+    into. Subdirectories that cannot be read are skipped with a warning.
+
+    Args:
+        directory: Directory to scan
+        match: Predicate on a file name
+        recursive: Descend into subdirectories
+        on_subdirectory: Called with each subdirectory found while recursing,
+            symlinked ones included
+
+    Yields:
+        Directory entries of the matching files
+
+    Raises:
+        OSError: If directory itself cannot be listed
+    """
+    root = os.fspath(directory)
+    pending = [root]
+    while pending:
+        path = pending.pop()
+        try:
+            entries = os.scandir(path)
+        except PermissionError:
+            if path == root:
+                raise
+            logger.warning(f"Skipping unreadable directory {path}")
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir():
+                    if recursive:
+                        if on_subdirectory is not None:
+                            on_subdirectory(entry)
+                        if not entry.is_symlink():
+                            pending.append(entry.path)
+                elif match(entry.name) and entry.is_file():
+                    yield entry
@@ -0,0 +1,161 @@
+"""Writing ZIP entries faster than ZipFile.write() does."""
+
+from __future__ import annotations
+
+import mmap
+import os
+import sys
+import time
+import zipfile
+from pathlib import Path
+
+try:
+    from isal import isal_zlib as deflate_zlib
+
+    ISAL_AVAILABLE = True
+except ImportError:
+    import zlib as deflate_zlib
+
+    ISAL_AVAILABLE = False
+
+SENDFILE_AVAILABLE = hasattr(os, "sendfile") and sys.platform.startswith("linux")
+
+# CPython-private ZipFile attributes the fast paths rely on; archives whose
+# ZipFile lacks any of them are written through the public API instead
+_ZIPFILE_INTERNALS = (
+    "_lock",
+    "_writing",
+    "_seekable",
+    "_writecheck",
+    "_didModify",
+    "start_dir",
+    "filelist",
+    "NameToInfo",
+    "fp",
+)
+
+
+def deflate_file(path: Path, arcname: str, compresslevel: int = 1) -> tuple[zipfile.ZipInfo, bytes]:
+    """Read and deflate a file for write_deflated().
+
+    Uses ISA-L's SIMD DEFLATE and CRC32 when the isal package is installed,
+    zlib otherwise. Holds the whole file in memory, so it is meant for
+    reports rather than large project files.
+
+    Args:
+        path: File to compress
+        arcname: Name of the entry in the archive
+        compresslevel: DEFLATE level (ISA-L supports 0-3 and clamps higher ones)
+
+    Returns:
+        Entry info (with CRC and sizes) and the raw DEFLATE stream
+    """
+    st = os.stat(path)
+    with open(path, "rb") as f:
+        data = f.read()
+
+    if ISAL_AVAILABLE:
+        compresslevel = min(compresslevel, deflate_zlib.ISAL_BEST_COMPRESSION)
+    compressor = deflate_zlib.compressobj(compresslevel, deflate_zlib.DEFLATED, -15)
+    compressed = compressor.compress(data) + compressor.flush()
+
+    zinfo = zipfile.ZipInfo(arcname, time.localtime(st.st_mtime)[:6])
+    zinfo.external_attr = (st.st_mode & 0xFFFF) << 16
+    zinfo.compress_type = zipfile.ZIP_DEFLATED
+    zinfo.CRC = deflate_zlib.crc32(data)
+    zinfo.file_size = len(data)
+    zinfo.compress_size = len(compressed)
+    return zinfo, compressed
+
+
+def write_deflated(zipf: zipfile.ZipFile, zinfo: zipfile.ZipInfo, compressed: bytes) -> None:
+    """Append an already-deflated entry to a ZIP being written.
+
+    zipfile has no API for pre-compressed data, so this writes the local
+    header and data directly, the way ZipFile.mkdir() writes its entries.
+    Where ZipFile lacks the internals this needs, the data is inflated again
+    and added with ZipFile.writestr().
+
+    Args:
+        zipf: Archive open for writing
+        zinfo: Entry info from deflate_file()
+        compressed: Raw DEFLATE stream from deflate_file()
+    """
+    if not _has_internals(zipf):
+        data = deflate_zlib.decompress(compressed, -15)
+        zipf.writestr(zinfo, data, compress_type=zipfile.ZIP_DEFLATED)
+        return
+    _append_entry(zipf, zinfo, lambda fp: fp.write(compressed))
+
+
+def write_stored(zipf: zipfile.ZipFile, path: Path, arcname: str) -> None:
+    """Append a file to a ZIP being written, uncompressed, copied in the kernel.
+
+    The CRC32 is computed over an mmap of the file, so the header can be
+    written up front, and the data is then copied with os.sendfile()
+    straight into the archive's file descriptor. Falls back to
+    ZipFile.write() where sendfile is unavailable, the archive is not a
+    real file, or ZipFile lacks the internals this needs.
+
+    Args:
+        zipf: Archive open for writing
+        path: File to add
+        arcname: Name of the entry in the archive
+    """
+    out_fd = None
+    if SENDFILE_AVAILABLE and _has_internals(zipf) and zipf._seekable:
+        try:
+            out_fd = zipf.fp.fileno()
+        except (AttributeError, OSError):
+            pass
+    if out_fd is None:
+        zipf.write(path, arcname, compress_type=zipfile.ZIP_STORED)
+        return
+
+    zinfo = zipfile.ZipInfo.from_file(path, arcname)
+    zinfo.compress_type = zipfile.ZIP_STORED
+    with open(path, "rb") as src:
+        size = os.fstat(src.fileno()).st_size
+        crc = 0
+        if size:
+            with mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                crc = deflate_zlib.crc32(mapped)
+        zinfo.CRC = crc
+        zinfo.file_size = zinfo.compress_size = size
+
+        def copy(fp) -> None:
+            fp.flush()  # The header goes out before the copied data
+            offset = fp.tell()
+            sent = 0
+            while sent < size:
+                n = os.sendfile(out_fd, src.fileno(), sent, size - sent)
+                if n == 0:
+                    raise OSError(f"{path} shrank while being archived")
+                sent += n
+            fp.seek(offset + size)  # Resync the buffered file with the fd
+
+        _append_entry(zipf, zinfo, copy)
+
+
+def _has_internals(zipf: zipfile.ZipFile) -> bool:
+    """Check that zipf has every private attribute _append_entry() uses."""
+    return all(hasattr(zipf, name) for name in _ZIPFILE_INTERNALS)
+
+
+def _append_entry(zipf: zipfile.ZipFile, zinfo: zipfile.ZipInfo, write_data) -> None:
+    """Write an entry with known CRC and sizes: local header, then write_data(fp)."""
+    zip64 = zinfo.file_size > zipfile.ZIP64_LIMIT or zinfo.compress_size > zipfile.ZIP64_LIMIT
+    with zipf._lock:
+        if zipf._writing:
+            raise ValueError("Can't write to the ZIP file while there is another write handle open")
+        if zipf._seekable:
+            zipf.fp.seek(zipf.start_dir)
+        zinfo.header_offset = zipf.fp.tell()
+        zipf._writecheck(zinfo)
+        zipf._didModify = True
+
+        zipf.fp.write(zinfo.FileHeader(zip64))
+        write_data(zipf.fp)
+        zipf.filelist.append(zinfo)
+        zipf.NameToInfo[zinfo.filename] = zinfo
+        zipf.start_dir = zipf.fp.tell()
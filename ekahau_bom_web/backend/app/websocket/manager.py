@@ -10,6 +10,28 @@ from fastapi import WebSocket
 logger = logging.getLogger(__name__)
 
 
+def _batch_update_data(
+    batch_id: UUID, status: str, progress: int | None, message: str | None
+) -> dict:
+    return {
+        "batch_id": str(batch_id),
+        "status": status,
+        "progress": progress,
+        "message": message,
+    }
+
+
+def _project_update_data(
+    batch_id: UUID, project_id: UUID, status: str, message: str | None
+) -> dict:
+    return {
+        "batch_id": str(batch_id),
+        "project_id": str(project_id),
+        "status": status,
+        "message": message,
+    }
+
+
 class ConnectionManager:
     """
     Manages WebSocket connections and broadcasts updates.
@@ -82,6 +104,9 @@ class ConnectionManager:
             message: Message dict to broadcast (will be JSON-encoded)
             exclude_client: Optional client_id to exclude from broadcast
         """
+        if not self.active_connections:
+            return
+
         logger.info(
             f"[ConnectionManager] Broadcasting '{message['type']}' "
             f"to {len(self.active_connections)} clients"
@@ -121,12 +146,7 @@ class ConnectionManager:
         """
         update_message = {
             "type": "batch_update",
-            "data": {
-                "batch_id": str(batch_id),
-                "status": status,
-                "progress": progress,
-                "message": message,
-            },
+            "data": _batch_update_data(batch_id, status, progress, message),
         }
         await self.broadcast(update_message)
 
@@ -148,11 +168,46 @@ class ConnectionManager:
         """
         update_message = {
             "type": "project_update",
+            "data": _project_update_data(batch_id, project_id, status, message),
+        }
+        await self.broadcast(update_message)
+
+    async def send_batch_progress(
+        self,
+        batch_id: UUID,
+        project_id: UUID,
+        project_status: str,
+        project_message: str | None = None,
+        batch_status: str | None = None,
+        progress: int | None = None,
+        batch_message: str | None = None,
+    ) -> None:
+        """
+        Broadcast a project update and the batch progress it caused as one message.
+
+        Replaces a project_update followed by a batch_update. Clients get
+        {"project": <project_update data>, "batch": <batch_update data or null>}.
+
+        Args:
+            batch_id: Parent batch UUID
+            project_id: Project UUID
+            project_status: New project status
+            project_message: Optional project status message
+            batch_status: Batch status; None to send the project update alone
+            progress: Optional batch progress percentage (0-100)
+            batch_message: Optional batch status message
+        """
+        update_message = {
+            "type": "batch_progress",
             "data": {
-                "batch_id": str(batch_id),
-                "project_id": str(project_id),
-                "status": status,
-                "message": message,
+                "project": _project_update_data(
+                    batch_id, project_id, project_status, project_message
+                ),
+                "batch": (
+                    _batch_update_data(batch_id, batch_status, progress, batch_message)
+                    if batch_status is not None
+                    else None
+                ),
             },
         }
         await self.broadcast(update_message)
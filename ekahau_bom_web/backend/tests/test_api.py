@@ -41,9 +41,8 @@ def temp_storage(tmp_path, monkeypatch):
     monkeypatch.setattr("app.api.projects.storage_service", storage)
     monkeypatch.setattr("app.api.reports.storage_service", storage)
 
-    # Clear index completely (projects and short_links)
-    index_service._projects = {}
-    index_service._short_links = {}
+    # Clear index completely
+    index_service.clear()
 
     # Clear cache to prevent stale data
     cache_service.invalidate_all()
@@ -51,8 +50,7 @@ def temp_storage(tmp_path, monkeypatch):
     yield storage
 
     # Cleanup
-    index_service._projects = {}
-    index_service._short_links = {}
+    index_service.clear()
     cache_service.invalidate_all()
 
 
@@ -111,6 +109,71 @@ def test_health_endpoint():
     assert data["status"] == "healthy"
 
 
+def test_response_time_header():
+    """Test responses carry the x-response-time header."""
+    response = client.get("/health")
+    assert response.headers["x-response-time"].endswith("ms")
+
+
+def test_minimal_profile_skips_optional_routers():
+    """Test the minimal app profile leaves out comparison/schedules/websocket routes."""
+    from app.factory import create_app
+
+    minimal_client = TestClient(create_app(profile="minimal"))
+    assert minimal_client.get("/api/projects").status_code == 200
+    assert minimal_client.get("/api/schedules").status_code == 404
+
+    paths = create_app(profile="minimal").openapi()["paths"]
+    assert "/api/batches" in paths
+    assert not any(p.startswith(("/api/comparison", "/api/schedules")) for p in paths)
+    assert "/api/schedules" in app.openapi()["paths"]
+
+
+def test_minimal_profile_does_not_import_optional_routers():
+    """Test routers left out of a profile are never imported."""
+    import subprocess
+    import sys
+
+    code = (
+        "import sys; from app.factory import create_app; create_app(profile='minimal'); "
+        "print(sorted(m for m in sys.modules if m.startswith('app.api.')))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(__file__).parent.parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert "app.api.batches" in result.stdout
+    assert "app.api.comparison" not in result.stdout
+    assert "app.api.schedules" not in result.stdout
+
+
+def test_warm_routes():
+    """Test route warm-up leaves routing intact."""
+    from app.factory import create_app, warm_routes
+
+    warm_app = create_app()
+    warm_routes(warm_app)
+
+    warm_client = TestClient(warm_app)
+    assert warm_client.get("/health").status_code == 200
+    assert warm_client.get("/api/projects").status_code == 200
+
+
+def test_fast_json_response_render():
+    """Test FastJSONResponse produces JSON equivalent to JSONResponse."""
+    import json
+
+    from fastapi.responses import JSONResponse
+
+    from app.responses import FastJSONResponse
+
+    content = {"name": "Офис", "count": 3, "items": [1, 2.5, None, True], "nested": {"a": "b"}}
+    assert json.loads(FastJSONResponse(content).body) == json.loads(JSONResponse(content).body)
+
+
 def test_root_endpoint():
     """Test root endpoint."""
     response = client.get("/")
@@ -166,6 +229,17 @@ def test_get_project_details(temp_storage, sample_project):
     assert data["floors_count"] == 2
 
 
+def test_get_project_details_cached(temp_storage, sample_project):
+    """Test repeated detail requests are served from cached JSON."""
+    first = client.get(f"/api/projects/{sample_project.project_id}")
+    assert cache_service.get_project_details(sample_project.project_id) == first.content
+
+    second = client.get(f"/api/projects/{sample_project.project_id}")
+    assert second.status_code == 200
+    assert second.headers["content-type"] == "application/json"
+    assert second.json() == first.json()
+
+
 def test_get_project_details_not_found():
     """Test getting non-existent project."""
     response = client.get(f"/api/projects/{uuid4()}")
@@ -0,0 +1,653 @@
+"""Tests for Archive Service."""
+
+from __future__ import annotations
+
+import errno
+import os
+import shutil
+import tarfile
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+
+from app.models import ProcessingStatus, ProjectMetadata
+from app.services import archive
+from app.services.archive import ArchiveService
+from app.services.index import IndexService
+from app.services.storage_service import StorageService
+
+
+@pytest.fixture
+def temp_storage(tmp_path):
+    """Create temporary local storage service."""
+    from app.services.storage.local import LocalStorage
+
+    storage = StorageService()
+    storage.backend = LocalStorage(base_dir=tmp_path / "projects")
+    storage.projects_dir = tmp_path / "projects"
+    return storage
+
+
+@pytest.fixture
+def archive_service(temp_storage, tmp_path):
+    """Create archive service bound to temporary storage and index."""
+    with (
+        patch.object(archive, "storage_service", temp_storage),
+        patch.object(archive, "index_service", IndexService()),
+    ):
+        service = ArchiveService()
+        service.projects_dir = tmp_path / "projects"
+        yield service
+
+
+@pytest.fixture
+def sample_project(temp_storage):
+    """Create a completed project with a few files on disk."""
+    project_id = uuid4()
+    project_dir = temp_storage.get_project_dir(project_id)
+    (project_dir / "reports").mkdir(parents=True)
+    (project_dir / "original.esx").write_bytes(b"esx" * 1000)
+    (project_dir / "reports" / "bom.csv").write_text("Vendor,Model,Quantity\nCisco,AP1,2\n")
+
+    metadata = ProjectMetadata(
+        project_id=project_id,
+        filename="test.esx",
+        file_size=3000,
+        processing_status=ProcessingStatus.COMPLETED,
+        original_file=f"projects/{project_id}/original.esx",
+    )
+    temp_storage.save_metadata(project_id, metadata)
+    return project_id
+
+
+def test_archiving_skipped_for_s3_backend(tmp_path):
+    """Test a non-local backend disables archiving for the service's lifetime."""
+    from unittest.mock import MagicMock
+
+    storage = StorageService()
+    storage.backend = MagicMock()  # Not a LocalStorage
+    with patch.object(archive, "storage_service", storage):
+        service = ArchiveService()
+
+    assert not service.is_archived(uuid4())
+    assert not service.archive_project(uuid4())
+    assert service.find_archive_candidates([]) == []
+
+
+def test_archive_and_unarchive_roundtrip(archive_service, temp_storage, sample_project):
+    """Test a project survives archiving and unarchiving unchanged."""
+    project_dir = temp_storage.get_project_dir(sample_project)
+
+    assert archive_service.archive_project(sample_project)
+    assert archive_service.is_archived(sample_project)
+    assert archive_service.get_archive_path(sample_project).name.endswith(archive.ARCHIVE_SUFFIX)
+    assert not project_dir.exists()
+
+    assert archive_service.unarchive_project(sample_project)
+    assert not archive_service.is_archived(sample_project)
+    assert (project_dir / "original.esx").read_bytes() == b"esx" * 1000
+    assert (project_dir / "reports" / "bom.csv").read_text().startswith("Vendor,")
+    assert temp_storage.load_metadata(sample_project).archived is False
+
+
+def _wait_until(condition, timeout=5.0):
+    """Poll until condition() is true (background deletion)."""
+    import time
+
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_archive_removes_directory_in_background(archive_service, tmp_path, sample_project):
+    """Test the project directory is renamed aside and deleted off the call path."""
+    projects_dir = tmp_path / "projects"
+
+    archived, metadata = archive_service._archive(sample_project)
+
+    assert archived and metadata.archived
+    assert _wait_until(lambda: not list(projects_dir.glob("*.gc")))
+
+    # Leftovers from an interrupted archive are scavenged
+    (projects_dir / "crashed.gc" / "reports").mkdir(parents=True)
+    assert archive_service.remove_stale_dirs() == 1
+    assert _wait_until(lambda: not (projects_dir / "crashed.gc").exists())
+
+
+@pytest.mark.parametrize("rm", ["rm", "failing", None])
+def test_remove_trees(tmp_path, rm):
+    """Test trees are removed by one rm process, falling back to rmtree."""
+    rm_path = {"rm": shutil.which("rm"), "failing": shutil.which("false"), None: None}[rm]
+    if rm and not rm_path:
+        pytest.skip(f"{rm} command not available")
+
+    trees = [tmp_path / "a.gc", tmp_path / "b.gc"]
+    for tree in trees:
+        (tree / "reports").mkdir(parents=True)
+        (tree / "reports" / "bom.csv").write_text("x")
+
+    with patch.object(archive, "RM_PATH", rm_path):
+        archive._remove_trees(trees)
+
+    assert not any(tree.exists() for tree in trees)
+
+
+def test_archive_guards(archive_service, temp_storage, sample_project):
+    """Test existing archives/directories and missing sources are rejected cleanly."""
+    missing = uuid4()
+    assert not archive_service.archive_project(missing)
+    assert not archive_service.get_archive_path(missing).exists()
+
+    archive_path = archive_service.get_archive_path(sample_project)
+    archive_path.write_bytes(b"existing")
+    assert not archive_service.archive_project(sample_project)
+    assert archive_path.read_bytes() == b"existing"
+    archive_path.unlink()
+
+    assert archive_service.archive_project(sample_project)
+    project_dir = temp_storage.get_project_dir(sample_project)
+    project_dir.mkdir()
+    (project_dir / "keep.txt").write_text("keep")
+    assert not archive_service.unarchive_project(sample_project)
+    assert (project_dir / "keep.txt").read_text() == "keep"
+
+    assert not archive_service.unarchive_project(missing)
+    assert not temp_storage.get_project_dir(missing).exists()
+
+
+def test_archive_projects_bulk(archive_service, temp_storage, sample_project):
+    """Test bulk archiving updates the index once and invalidates caches together."""
+    missing = uuid4()
+
+    with (
+        patch.object(archive.index_service, "add_bulk") as add_bulk,
+        patch.object(archive.cache_service, "invalidate_projects") as invalidate,
+    ):
+        archived = archive_service.archive_projects_bulk([sample_project, missing])
+
+    assert archived == [sample_project]
+    assert archive_service.is_archived(sample_project)
+    (updated,) = add_bulk.call_args.args[0]
+    assert updated.project_id == sample_project and updated.archived
+    invalidate.assert_called_once_with([sample_project])
+
+
+def test_unarchive_legacy_gzip_archive(archive_service, temp_storage, sample_project):
+    """Test archives written as .tar.gz are still found and extracted."""
+    project_dir = temp_storage.get_project_dir(sample_project)
+
+    with patch.object(archive, "ARCHIVE_SUFFIX", archive.GZIP_SUFFIX):
+        assert archive_service.archive_project(sample_project)
+
+    archive_path = archive_service.get_archive_path(sample_project)
+    assert archive_path.name.endswith(".tar.gz")
+    assert archive_service.is_archived(sample_project)
+
+    assert archive_service.unarchive_project(sample_project)
+    assert (project_dir / "original.esx").read_bytes() == b"esx" * 1000
+    assert not archive_path.exists()
+
+
+def test_find_archive_candidates(archive_service):
+    """Test only completed, unarchived, long-idle projects are due, oldest first."""
+    from datetime import UTC, datetime, timedelta
+
+    now = datetime(2025, 6, 1, tzinfo=UTC)
+
+    def project(days_idle, **kwargs):
+        return ProjectMetadata(
+            filename="p.esx",
+            file_size=1,
+            original_file="projects/p/original.esx",
+            processing_status=kwargs.pop("status", ProcessingStatus.COMPLETED),
+            upload_date=now - timedelta(days=days_idle),
+            **kwargs,
+        )
+
+    oldest = project(200)
+    due = project(90)
+    recent = project(10)
+    recently_accessed = project(300, last_accessed=now - timedelta(days=5))
+    failed = project(300, status=ProcessingStatus.FAILED)
+    archived = project(300, archived=True)
+
+    candidates = archive_service.find_archive_candidates(
+        [due, recent, recently_accessed, failed, archived, oldest], now=now
+    )
+
+    assert candidates == [oldest.project_id, due.project_id]
+
+
+def test_write_archive_returns_original_size(tmp_path):
+    """Test the archived size is accumulated during the tar walk."""
+    source = tmp_path / "src"
+    (source / "nested").mkdir(parents=True)
+    (source / "a.txt").write_bytes(b"a" * 100)
+    (source / "nested" / "b.txt").write_bytes(b"b" * 23)
+
+    size = ArchiveService._write_archive(tmp_path / "project.tar.gz", source, arcname="p")
+
+    assert size == 123 == ArchiveService._get_dir_size(source)
+
+
+def test_get_dir_size(tmp_path):
+    """Test directory size counts nested files and skips symlinks and missing dirs."""
+    (tmp_path / "a" / "b").mkdir(parents=True)
+    (tmp_path / "a" / "one.bin").write_bytes(b"1" * 10)
+    (tmp_path / "a" / "b" / "two.bin").write_bytes(b"2" * 5)
+    (tmp_path / "a" / "link.bin").symlink_to(tmp_path / "a" / "one.bin")
+
+    assert ArchiveService._get_dir_size(tmp_path / "a") == 15
+    assert ArchiveService._get_dir_size(tmp_path / "missing") == 0
+
+
+@pytest.mark.parametrize("reader", ["rapidgzip", "gzip", "stdlib"])
+def test_extract_gzip_archive_readers(tmp_path, reader):
+    """Test gzip archives extract the same with rapidgzip, a gzip process or the stdlib."""
+    if reader == "rapidgzip" and not archive.RAPIDGZIP_AVAILABLE:
+        pytest.skip("rapidgzip not installed")
+    if reader == "gzip" and not archive.GZIP_PATH:
+        pytest.skip("gzip not installed")
+
+    source = tmp_path / "src"
+    source.mkdir()
+    (source / "data.bin").write_bytes(bytes(range(256)) * 64)
+    archive_path = tmp_path / "project.tar.gz"
+    ArchiveService._write_archive(archive_path, source, arcname="project")
+
+    with (
+        patch.object(archive, "RAPIDGZIP_AVAILABLE", reader == "rapidgzip"),
+        patch.object(archive, "PIGZ_PATH", None),
+        patch.object(archive, "GZIP_PATH", archive.GZIP_PATH if reader == "gzip" else None),
+    ):
+        ArchiveService._extract_archive(archive_path, tmp_path / "out")
+
+    assert (tmp_path / "out" / "project" / "data.bin").read_bytes() == bytes(range(256)) * 64
+
+
+def test_write_gzip_archive_through_pigz(tmp_path):
+    """Test .tar.gz archives are piped through pigz when it is on PATH."""
+    gzip_path = shutil.which("gzip")
+    if gzip_path is None:
+        pytest.skip("gzip not installed")
+
+    # Stand-in for pigz that accepts its arguments and gzips stdin to stdout
+    fake_pigz = tmp_path / "pigz"
+    fake_pigz.write_text(f"#!/bin/sh\nexec {gzip_path} -c\n")
+    fake_pigz.chmod(0o755)
+
+    source = tmp_path / "src"
+    source.mkdir()
+    (source / "data.txt").write_text("pigz")
+    archive_path = tmp_path / "project.tar.gz"
+
+    with patch.object(archive, "PIGZ_PATH", str(fake_pigz)):
+        ArchiveService._write_archive(archive_path, source, arcname="project")
+
+    with tarfile.open(archive_path, "r:gz") as tar:
+        assert tar.extractfile("project/data.txt").read() == b"pigz"
+
+
+def test_extract_tar_writes_members_and_rejects_traversal(tmp_path):
+    """Test threaded extraction handles large, linked and unsafe members."""
+    import io
+
+    def add_file(tar, name, data):
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = 1_700_000_000
+        tar.addfile(info, io.BytesIO(data))
+
+    archive_path = tmp_path / "project.tar"
+    with tarfile.open(archive_path, "w") as tar:
+        for i in range(50):
+            add_file(tar, f"p/reports/{i}.csv", f"row {i}".encode())
+        link = tarfile.TarInfo("p/latest.csv")
+        link.type = tarfile.SYMTYPE
+        link.linkname = "reports/0.csv"
+        tar.addfile(link)
+
+    # Single-digit rows go through the writer pool, the rest are streamed inline
+    with patch.object(archive, "EXTRACT_INLINE_SIZE", 5):
+        with tarfile.open(archive_path, "r|") as tar:
+            archive._extract_tar(tar, tmp_path / "out")
+
+    out = tmp_path / "out" / "p"
+    assert [(out / "reports" / f"{i}.csv").read_text() for i in range(50)] == [
+        f"row {i}" for i in range(50)
+    ]
+    assert (out / "reports" / "7.csv").stat().st_mtime == 1_700_000_000
+    assert (out / "latest.csv").read_text() == "row 0"
+
+    evil_path = tmp_path / "evil.tar"
+    with tarfile.open(evil_path, "w") as tar:
+        add_file(tar, "../escape.txt", b"x")
+
+    with tarfile.open(evil_path, "r|") as tar:
+        with pytest.raises(tarfile.FilterError):
+            archive._extract_tar(tar, tmp_path / "out")
+    assert not (tmp_path / "escape.txt").exists()
+
+
+@pytest.mark.skipif(not archive.ZSTD_AVAILABLE, reason="zstandard not installed")
+def test_archive_uses_zstd(archive_service, sample_project):
+    """Test new archives are zstd-compressed when zstandard is available."""
+    assert archive_service.archive_project(sample_project)
+
+    archive_path = archive_service.get_archive_path(sample_project)
+    assert archive_path.name.endswith(".tar.zst")
+    assert archive_path.read_bytes()[:4] == b"\x28\xb5\x2f\xfd"
+
+
+@pytest.mark.asyncio
+async def test_async_archive_roundtrip(archive_service, temp_storage, sample_project):
+    """Test the executor-backed async variants archive and restore a project."""
+    assert await archive_service.archive_project_async(sample_project)
+    assert archive_service.is_archived(sample_project)
+
+    assert await archive_service.ensure_unarchived_async(sample_project)
+    assert temp_storage.get_project_dir(sample_project).exists()
+    assert not archive_service.is_archived(sample_project)
+
+
+def test_ensure_unarchived_caches_availability(archive_service, temp_storage, sample_project):
+    """Test repeated accesses skip the metadata write until the project is archived."""
+    with patch.object(temp_storage, "save_metadata", wraps=temp_storage.save_metadata) as save:
+        assert archive_service.ensure_unarchived(sample_project)
+        assert archive_service.ensure_unarchived(sample_project)
+    assert save.call_count == 1
+
+    # Archiving drops the cached decision, so the next access unarchives again
+    assert archive_service.archive_project(sample_project)
+    assert archive_service.ensure_unarchived(sample_project)
+    assert temp_storage.get_project_dir(sample_project).exists()
+
+
+def test_ensure_unarchived_during_archive(archive_service, temp_storage, sample_project):
+    """Test an access while the archive is written doesn't leave the project marked available."""
+    write_archive = archive_service._write_archive
+    during = []
+
+    def write_and_access(*args, **kwargs):
+        size = write_archive(*args, **kwargs)
+        during.append(archive_service.ensure_unarchived(sample_project))
+        return size
+
+    with patch.object(archive_service, "_write_archive", side_effect=write_and_access):
+        assert archive_service.archive_project(sample_project)
+
+    assert during == [True]  # Directory still there mid-archive
+    assert not archive_service._is_known_available(sample_project)
+    assert archive_service.ensure_unarchived(sample_project)
+    assert (temp_storage.get_project_dir(sample_project) / "original.esx").exists()
+
+
+def test_known_available_requires_directory(archive_service, temp_storage, sample_project):
+    """Test a cached availability is dropped once the project directory is gone."""
+    assert archive_service.ensure_unarchived(sample_project)
+    assert archive_service._is_known_available(sample_project)
+
+    temp_storage.get_project_dir(sample_project).rename(archive_service.projects_dir / "moved")
+    assert not archive_service._is_known_available(sample_project)
+
+
+def test_last_accessed_written_at_most_hourly(archive_service, temp_storage, sample_project):
+    """Test last_accessed is only persisted when the stored value is stale."""
+    from datetime import UTC, datetime, timedelta
+
+    archive_service._touch_last_accessed(sample_project)
+    first = temp_storage.load_metadata(sample_project).last_accessed
+    assert first is not None
+
+    archive_service._touch_last_accessed(sample_project)
+    assert temp_storage.load_metadata(sample_project).last_accessed == first
+
+    metadata = temp_storage.load_metadata(sample_project)
+    metadata.last_accessed = datetime.now(UTC) - timedelta(hours=2)
+    temp_storage.save_metadata(sample_project, metadata)
+    archive.index_service.add(metadata)
+
+    archive_service._touch_last_accessed(sample_project)
+    assert temp_storage.load_metadata(sample_project).last_accessed > first
+
+
+@pytest.mark.parametrize("use_zstd", [False, True])
+def test_write_archive_uses_large_copy_buffer(tmp_path, use_zstd):
+    """Test member contents are copied into the tar stream in 1 MiB chunks."""
+    if use_zstd and not archive.ZSTD_AVAILABLE:
+        pytest.skip("zstandard not installed")
+
+    source = tmp_path / "src"
+    source.mkdir()
+    (source / "big.bin").write_bytes(os.urandom(3 * archive.ARCHIVE_COPY_BUFSIZE))
+    suffix = archive.ZSTD_SUFFIX if use_zstd else archive.GZIP_SUFFIX
+
+    with (
+        patch.object(archive, "PIGZ_PATH", None),
+        patch.object(archive, "GZIP_PATH", None),
+        patch("tarfile.copyfileobj", wraps=tarfile.copyfileobj) as copy,
+    ):
+        archive.ArchiveService._write_archive(tmp_path / f"out{suffix}", source, "src")
+
+    assert copy.call_args.kwargs["bufsize"] == archive.ARCHIVE_COPY_BUFSIZE
+
+    dest = tmp_path / "dest"
+    dest.mkdir()
+    archive.ArchiveService._extract_archive(tmp_path / f"out{suffix}", dest)
+    assert (dest / "src" / "big.bin").read_bytes() == (source / "big.bin").read_bytes()
+
+
+def test_write_tar_archive_buffers_output(tmp_path):
+    """Test the archive file is opened with a large write buffer."""
+    source = tmp_path / "src"
+    source.mkdir()
+    (source / "a.txt").write_text("a")
+
+    with patch.object(archive, "open", wraps=open, create=True) as opened:
+        archive.write_tar_archive(tmp_path / "out.tar.gz", [(source, "src")])
+
+    assert opened.call_args_list[0].kwargs["buffering"] == archive.ARCHIVE_WRITE_BUFSIZE
+
+
+def test_pipe_tar_splices_file_contents(tmp_path):
+    """Test tars streamed into a compressor pipe match tarfile's own output."""
+    if not archive.GZIP_PATH:
+        pytest.skip("gzip not installed")
+
+    source = tmp_path / "src"
+    (source / "reports").mkdir(parents=True)
+    (source / "original.esx").write_bytes(os.urandom(3 * 1024 * 1024 + 17))
+    (source / "reports" / "bom.csv").write_text("ap,count\n")
+    (source / "reports" / "empty.txt").write_bytes(b"")
+    archive_path = tmp_path / "p.tar.gz"
+
+    with (
+        patch.object(archive, "PIGZ_PATH", None),
+        patch("os.sendfile", wraps=os.sendfile) as sendfile,
+    ):
+        size = archive.write_tar_archive(archive_path, [(source, "p")])
+
+    assert sendfile.called
+    assert size == 3 * 1024 * 1024 + 17 + len("ap,count\n")
+    with tarfile.open(archive_path, "r:gz") as tar:
+        assert tar.extractfile("p/original.esx").read() == (source / "original.esx").read_bytes()
+        assert tar.extractfile("p/reports/bom.csv").read() == b"ap,count\n"
+        assert tar.getmember("p/reports/empty.txt").size == 0
+
+
+def test_pipe_tar_falls_back_without_splicing(tmp_path):
+    """Test the pipe tar copies in userspace when the kernel refuses to splice."""
+    if not archive.GZIP_PATH:
+        pytest.skip("gzip not installed")
+
+    source = tmp_path / "src"
+    source.mkdir()
+    (source / "original.esx").write_bytes(os.urandom(100_000))
+    archive_path = tmp_path / "p.tar.gz"
+
+    with (
+        patch.object(archive, "PIGZ_PATH", None),
+        patch("os.sendfile", side_effect=OSError(errno.EINVAL, "Invalid argument")),
+    ):
+        archive.write_tar_archive(archive_path, [(source, "p")])
+
+    with tarfile.open(archive_path, "r:gz") as tar:
+        assert tar.extractfile("p/original.esx").read() == (source / "original.esx").read_bytes()
+
+
+def test_extract_tar_archive_renames_members(tmp_path):
+    """Test members can be relocated or skipped while extracting."""
+    source = tmp_path / "src"
+    (source / "keep").mkdir(parents=True)
+    (source / "keep" / "a.txt").write_text("a")
+    (source / "drop.txt").write_text("drop")
+    archive_path = tmp_path / "x.tar.gz"
+    archive.write_tar_archive(archive_path, [(source, "top")])
+
+    def rename(name):
+        if name == "top" or name.startswith("top/keep"):
+            return "moved" + name[len("top") :]
+        return None
+
+    archive.extract_tar_archive(archive_path, tmp_path / "out", rename=rename)
+
+    assert (tmp_path / "out" / "moved" / "keep" / "a.txt").read_text() == "a"
+    assert not (tmp_path / "out" / "moved" / "drop.txt").exists()
+    assert not (tmp_path / "out" / "top").exists()
+
+
+def test_verify_gzip_archive(tmp_path):
+    """Test intact archives pass and corrupt or truncated ones are rejected."""
+    import gzip
+
+    source = tmp_path / "src"
+    source.mkdir()
+    # Highly compressible, so inflated output outgrows the per-call bound
+    (source / "zeros.bin").write_bytes(bytes(3 * archive.ARCHIVE_COPY_BUFSIZE))
+    (source / "a.txt").write_text("a" * 1000)
+    archive_path = tmp_path / "x.tar.gz"
+    archive.write_tar_archive(archive_path, [(source, "top")])
+    archive.verify_archive(archive_path)
+
+    # Concatenated members are one valid gzip stream
+    data = archive_path.read_bytes()
+    multi = tmp_path / "multi.gz"
+    multi.write_bytes(data + gzip.compress(b"more"))
+    archive.verify_archive(multi)
+
+    # Flip a bit in the stored CRC-32
+    corrupt = tmp_path / "corrupt.gz"
+    corrupt.write_bytes(data[:-8] + bytes([data[-8] ^ 1]) + data[-7:])
+    with pytest.raises(RuntimeError, match="corrupt"):
+        archive.verify_archive(corrupt)
+
+    truncated = tmp_path / "truncated.gz"
+    truncated.write_bytes(data[: len(data) // 2])
+    with pytest.raises(RuntimeError, match="truncated"):
+        archive.verify_archive(truncated)
+
+    empty = tmp_path / "empty.gz"
+    empty.touch()
+    with pytest.raises(RuntimeError, match="empty"):
+        archive.verify_archive(empty)
+
+
+def test_verify_zstd_archive(tmp_path):
+    """Test zstd archives are checked against their frame checksums."""
+    if not archive.ZSTD_AVAILABLE:
+        pytest.skip("zstandard not installed")
+
+    source = tmp_path / "src"
+    source.mkdir()
+    (source / "data.bin").write_bytes(os.urandom(256 * 1024))
+    archive_path = tmp_path / "x.tar.zst"
+    archive.write_tar_archive(archive_path, [(source, "top")])
+    archive.verify_archive(archive_path)
+
+    data = archive_path.read_bytes()
+    corrupt = tmp_path / "corrupt.zst"
+    corrupt.write_bytes(data[:-4] + bytes(b ^ 0xFF for b in data[-4:]))
+    with pytest.raises(RuntimeError, match="corrupt"):
+        archive.verify_archive(corrupt)
+
+    truncated = tmp_path / "truncated.zst"
+    truncated.write_bytes(data[: len(data) // 2])
+    with pytest.raises(RuntimeError, match="truncated"):
+        archive.verify_archive(truncated)
+
+
+def test_verify_zstd_bounded_memory(tmp_path):
+    """Test verifying a highly compressible zstd archive reads its output in small pieces."""
+    if not archive.ZSTD_AVAILABLE:
+        pytest.skip("zstandard not installed")
+    import tracemalloc
+
+    import zstandard
+
+    compressor = zstandard.ZstdCompressor(write_checksum=True)
+    skippable = (0x184D2A50).to_bytes(4, "little") + (3).to_bytes(4, "little") + b"abc"
+    data = compressor.compress(bytes(64 << 20)) + skippable + compressor.compress(b"tail")
+    archive_path = tmp_path / "zeros.zst"
+    archive_path.write_bytes(data)
+
+    tracemalloc.start()
+    try:
+        archive.verify_archive(archive_path)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < 8 << 20
+
+    truncated = tmp_path / "truncated.zst"
+    truncated.write_bytes(data[:-1])
+    with pytest.raises(RuntimeError, match="truncated"):
+        archive.verify_archive(truncated)
+
+
+def test_write_tar_stream_matches_tar_add(tmp_path):
+    """Test headers prebuilt from the source walk match what tarfile.add() writes."""
+    source = tmp_path / "src"
+    (source / "b" / "c").mkdir(parents=True)
+    for name in ("z.txt", "a.txt", "b/y.txt", "b/c/x.txt"):
+        (source / name).write_text(name)
+    os.symlink("a.txt", source / "link.txt")
+    os.link(source / "z.txt", source / "b" / "hard.txt")
+
+    with tarfile.open(tmp_path / "expected.tar", "w") as tar:
+        tar.add(source, arcname="src")
+        expected = tar.getmembers()
+
+    with patch.object(archive, "PIGZ_PATH", None), patch.object(archive, "GZIP_PATH", None):
+        size = archive.write_tar_archive(tmp_path / "actual.tar.gz", [(source, "src")])
+    with tarfile.open(tmp_path / "actual.tar.gz") as tar:
+        actual = tar.getmembers()
+        assert tar.extractfile("src/b/c/x.txt").read() == b"b/c/x.txt"
+
+    def header(m):
+        # As stored: permission bits and whole-second mtimes
+        mode, mtime = m.mode & 0o7777, int(m.mtime)
+        return (m.name, m.type, m.size, mode, mtime, m.uid, m.uname, m.gname, m.linkname)
+
+    assert [header(m) for m in actual] == [header(m) for m in expected]
+    assert size == sum(m.size for m in expected if m.isreg())
+
+
+def test_readahead_hints_files(tmp_path):
+    """Test files are hinted to the kernel with WILLNEED."""
+    if not hasattr(os, "posix_fadvise"):
+        pytest.skip("posix_fadvise not available")
+
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"{i}.bin"
+        path.write_bytes(b"x")
+        paths.append(str(path))
+
+    with patch.object(os, "posix_fadvise", wraps=os.posix_fadvise) as fadvise:
+        readahead = archive._Readahead(paths)
+        readahead._thread.join(timeout=5)
+
+    assert fadvise.call_count == len(paths)
+    assert all(call.args[3] == os.POSIX_FADV_WILLNEED for call in fadvise.call_args_list)
@@ -4,6 +4,7 @@ import pytest
 from fastapi.testclient import TestClient
 from app.main import app
 from app.config import settings
+from app.auth.base import UserInfo
 
 client = TestClient(app)
 
@@ -179,3 +180,42 @@ def test_process_requires_admin():
         422,
         500,
     ]  # Bad request, not found, validation, or processing error
+
+
+def test_encode_jwt_matches_pyjwt():
+    """Test the shared encoder produces tokens PyJWT decodes to the same claims."""
+    import jwt
+    from datetime import datetime, timedelta, UTC
+    from app.auth.tokens import encode_jwt
+
+    KEY = "k" * 32
+    exp = datetime.now(UTC).replace(microsecond=0) + timedelta(minutes=5)
+    claims = {"sub": "admin", "exp": exp, "roles": ["admin"]}
+    assert encode_jwt(claims, KEY, "HS256") == jwt.encode(claims, KEY, algorithm="HS256")
+
+    token = encode_jwt({**claims, "name": "Админ"}, KEY, "HS256")
+    payload = jwt.decode(token, KEY, algorithms=["HS256"])
+    assert payload["sub"] == "admin"
+    assert payload["exp"] == int(exp.timestamp())
+    assert payload["name"] == "Админ"
+
+
+@pytest.mark.asyncio
+async def test_invalid_token_negative_cache():
+    """Test rejected tokens are remembered and skip re-verification."""
+    from unittest.mock import patch
+    from app.auth.simple import SimpleAuthProvider
+
+    provider = SimpleAuthProvider(secret_key="k" * 32, algorithm="HS256")
+    assert await provider.validate_token("not-a-jwt") is None
+    assert "not-a-jwt" in provider._invalid_tokens
+
+    with patch("app.auth.simple.jwt.decode") as decode:
+        assert await provider.validate_token("not-a-jwt") is None
+    decode.assert_not_called()
+
+    # Valid tokens are unaffected
+    token = provider.create_token(UserInfo(username="admin", roles=["admin"])).access_token
+    user = await provider.validate_token(token)
+    assert user.username == "admin"
+    assert token not in provider._invalid_tokens
@@ -4,7 +4,9 @@ from __future__ import annotations
 
 import io
 import json
+import os
 import zipfile
+from unittest.mock import patch
 from uuid import uuid4
 
 import pytest
@@ -48,14 +50,14 @@ def temp_storage(tmp_path, monkeypatch):
     (tmp_path / "batches").mkdir(exist_ok=True)
 
     # Clear index
-    index_service._projects = {}
+    index_service.clear()
 
     yield storage
 
     # Cleanup
     batch_service.storage = original_batch_storage
     batch_service.batches_dir = original_batches_dir
-    index_service._projects = {}
+    index_service.clear()
 
 
 @pytest.fixture
@@ -699,3 +701,71 @@ class TestBatchTagsEndpoints:
 
 
 # NOTE: Advanced filtering tests moved to test_advanced_filtering.py for better organization
+
+
+class TestScanDirectory:
+    """Tests for POST /api/batches/scan-directory."""
+
+    def test_scan_directory(self, tmp_path, admin_headers):
+        """Test scanning finds .esx files, sorted by name, with recursion opt-in."""
+        (tmp_path / "b.esx").write_bytes(b"12345")
+        (tmp_path / "A.esx").write_bytes(b"1")
+        (tmp_path / "notes.txt").write_text("x")
+        nested = tmp_path / "site" / "floor"
+        nested.mkdir(parents=True)
+        (nested / "c.esx").write_bytes(b"123")
+
+        response = client.post(
+            "/api/batches/scan-directory",
+            data={"directory_path": str(tmp_path), "recursive": "false"},
+            headers=admin_headers,
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert [f["filename"] for f in data["files"]] == ["A.esx", "b.esx"]
+        assert data["files"][1]["filesize"] == 5
+        assert data["files"][1]["filepath"] == str(tmp_path / "b.esx")
+        assert data["subdirectories_scanned"] == 0
+
+        response = client.post(
+            "/api/batches/scan-directory",
+            data={"directory_path": str(tmp_path), "recursive": "true"},
+            headers=admin_headers,
+        )
+        data = response.json()
+        assert data["total_files"] == 3
+        assert [f["filename"] for f in data["files"]] == ["A.esx", "b.esx", "c.esx"]
+        assert data["subdirectories_scanned"] == 2
+
+    def test_scan_directory_skips_unreadable_subdirectory(self, tmp_path, admin_headers):
+        """Test an unreadable subdirectory is skipped instead of failing the scan."""
+        (tmp_path / "a.esx").write_bytes(b"1")
+        locked = tmp_path / "locked"
+        locked.mkdir()
+        (locked / "b.esx").write_bytes(b"1")
+        real_scandir = os.scandir
+
+        def scandir(path):
+            if path == str(locked):
+                raise PermissionError(13, "Permission denied", path)
+            return real_scandir(path)
+
+        with patch("app.utils.scan.os.scandir", side_effect=scandir):
+            response = client.post(
+                "/api/batches/scan-directory",
+                data={"directory_path": str(tmp_path), "recursive": "true"},
+                headers=admin_headers,
+            )
+        assert response.status_code == 200
+        data = response.json()
+        assert [f["filename"] for f in data["files"]] == ["a.esx"]
+        assert data["subdirectories_scanned"] == 1
+
+    def test_scan_directory_not_found(self, tmp_path, admin_headers):
+        """Test scanning a missing directory returns 404."""
+        response = client.post(
+            "/api/batches/scan-directory",
+            data={"directory_path": str(tmp_path / "missing")},
+            headers=admin_headers,
+        )
+        assert response.status_code == 404
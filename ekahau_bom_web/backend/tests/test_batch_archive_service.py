@@ -0,0 +1,423 @@
+"""Tests for BatchArchiveService."""
+
+from __future__ import annotations
+
+import tarfile
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+
+from app.services import archive
+from app.services.batch_archive_service import BatchArchiveService
+from app.services.batch_service import BatchService
+from app.services.storage_service import StorageService
+
+
+@pytest.fixture
+def temp_batch_service(tmp_path):
+    """Create temporary batch service with temp storage."""
+    from app.services.storage.local import LocalStorage
+
+    storage = StorageService()
+    storage.backend = LocalStorage(base_dir=tmp_path / "projects")
+    storage.projects_dir = tmp_path / "projects"
+
+    return BatchService(storage_service=storage)
+
+
+@pytest.fixture
+def archive_service(temp_batch_service):
+    """Create batch archive service over the temporary batch service."""
+    return BatchArchiveService(temp_batch_service, temp_batch_service.storage)
+
+
+def _archive_names(archive_path):
+    """List member names of a .tar.zst or .tar.gz archive."""
+    if archive_path.endswith(archive.ZSTD_SUFFIX):
+        import zstandard
+
+        with (
+            open(archive_path, "rb") as fh,
+            zstandard.ZstdDecompressor().stream_reader(fh) as zr,
+            tarfile.open(fileobj=zr, mode="r|") as tar,
+        ):
+            return tar.getnames()
+    with tarfile.open(archive_path, "r:gz") as tar:
+        return tar.getnames()
+
+
+@pytest.fixture
+def sample_batch(temp_batch_service):
+    """Create a batch with two projects on disk."""
+    batch = temp_batch_service.create_batch(batch_name="Old batch")
+    projects_dir = temp_batch_service.storage.projects_dir
+
+    for i in range(2):
+        project_id = uuid4()
+        project_dir = projects_dir / str(project_id)
+        (project_dir / "reports").mkdir(parents=True)
+        (project_dir / "original.esx").write_bytes(bytes([i]) * 1000)
+        (project_dir / "reports" / "bom.csv").write_text(f"ap,count\nAP-{i},1\n")
+        temp_batch_service.add_project_to_batch(batch.batch_id, project_id, f"site{i}.esx")
+
+    return temp_batch_service.load_batch_metadata(batch.batch_id)
+
+
+class TestArchiveRestore:
+    """Tests for archiving and restoring batches."""
+
+    @pytest.mark.parametrize("codec", ["zstd", "gzip"])
+    def test_archive_and_restore_roundtrip(self, temp_batch_service, sample_batch, codec):
+        """Test archiving removes project dirs and restoring brings them back."""
+        if codec == "zstd" and not archive.ZSTD_AVAILABLE:
+            pytest.skip("zstandard not installed")
+
+        archive_service = BatchArchiveService(
+            temp_batch_service, temp_batch_service.storage, archive_codec=codec
+        )
+        projects_dir = temp_batch_service.storage.projects_dir
+        project_ids = list(sample_batch.project_ids)
+
+        assert archive_service.archive_batch(sample_batch.batch_id) is True
+
+        archived = temp_batch_service.load_batch_metadata(sample_batch.batch_id)
+        assert archived.archived is True
+        assert archived.archived_at is not None
+        assert archived.archive_path.endswith(f".tar.{'zst' if codec == 'zstd' else 'gz'}")
+        assert archived.archive_size > 0
+        # Batch metadata plus both projects' files
+        assert archived.original_size > 2 * (1000 + len("ap,count\nAP-0,1\n"))
+        assert all(not (projects_dir / str(pid)).exists() for pid in project_ids)
+
+        names = _archive_names(archived.archive_path)
+        assert f"batch_{sample_batch.batch_id}/batch_metadata.json" in names
+        assert f"projects/{project_ids[0]}/reports/bom.csv" in names
+
+        assert archive_service.restore_batch(sample_batch.batch_id) is True
+
+        restored = temp_batch_service.load_batch_metadata(sample_batch.batch_id)
+        assert restored.archived is False
+        assert restored.restored_at is not None
+        for i, pid in enumerate(project_ids):
+            assert (projects_dir / str(pid) / "original.esx").read_bytes() == bytes([i]) * 1000
+        assert sorted(p.name for p in projects_dir.parent.iterdir()) == [
+            "archives",
+            "batches",
+            "projects",
+        ]
+
+        # A restored batch can be archived again over the previous archive,
+        # also with the other codec
+        assert archive_service.archive_batch(sample_batch.batch_id) is True
+        assert archive_service.restore_batch(sample_batch.batch_id) is True
+        other_codec = BatchArchiveService(
+            temp_batch_service,
+            temp_batch_service.storage,
+            archive_codec="gzip" if codec == "zstd" else "zstd",
+        )
+        assert other_codec.archive_batch(sample_batch.batch_id) is True
+        archives = list(projects_dir.parent.glob("archives/*.tar.*"))
+        assert len(archives) == 1
+
+    def test_archive_deletes_project_dirs_in_background(
+        self, archive_service, temp_batch_service, sample_batch
+    ):
+        """Test project directories are renamed aside and removed off the caller's path."""
+        import time
+
+        projects_dir = temp_batch_service.storage.projects_dir
+        assert archive_service.archive_batch(sample_batch.batch_id) is True
+
+        assert not any((projects_dir / str(pid)).exists() for pid in sample_batch.project_ids)
+        deadline = time.monotonic() + 5
+        while list(projects_dir.glob("*.gc")) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert list(projects_dir.iterdir()) == []
+
+    @pytest.mark.parametrize("compressor", ["gzip", "stdlib"])
+    def test_archive_compressors(self, temp_batch_service, sample_batch, compressor):
+        """Test gzip batches archive the same through a gzip process and the stdlib."""
+        if compressor == "gzip" and not archive.GZIP_PATH:
+            pytest.skip("gzip not installed")
+
+        archive_service = BatchArchiveService(
+            temp_batch_service, temp_batch_service.storage, archive_codec="gzip"
+        )
+
+        with (
+            patch.object(archive, "PIGZ_PATH", None),
+            patch.object(archive, "GZIP_PATH", archive.GZIP_PATH if compressor == "gzip" else None),
+        ):
+            assert archive_service.archive_batch(sample_batch.batch_id) is True
+            assert archive_service.restore_batch(sample_batch.batch_id) is True
+
+    def test_failed_verification_keeps_sources(
+        self, archive_service, temp_batch_service, sample_batch
+    ):
+        """Test nothing is deleted or marked archived when the archive fails its check."""
+        projects_dir = temp_batch_service.storage.projects_dir
+
+        with patch(
+            "app.services.batch_archive_service.verify_archive",
+            side_effect=RuntimeError("corrupt archive"),
+        ):
+            assert archive_service.archive_batch(sample_batch.batch_id) is False
+
+        assert temp_batch_service.load_batch_metadata(sample_batch.batch_id).archived is False
+        assert all((projects_dir / str(pid)).is_dir() for pid in sample_batch.project_ids)
+        assert not list(projects_dir.parent.glob("archives/*.tar.*"))
+
+    def test_archive_missing_batch(self, archive_service):
+        """Test archiving or restoring an unknown batch fails cleanly."""
+        assert archive_service.archive_batch(uuid4()) is False
+        assert archive_service.restore_batch(uuid4()) is False
+
+    def test_restore_not_archived(self, archive_service, sample_batch):
+        """Test restoring a batch that is not archived is refused."""
+        assert archive_service.restore_batch(sample_batch.batch_id) is False
+
+
+class TestFindOldBatches:
+    """Tests for finding batches to archive."""
+
+    def test_find_old_batches(self, archive_service, temp_batch_service):
+        """Test old batches are found by last access, oldest first, skipping archived ones."""
+        from datetime import UTC, datetime, timedelta
+
+        now = datetime.now(UTC)
+
+        def batch(name, created_days_ago, accessed_days_ago=None, archived=False):
+            metadata = temp_batch_service.create_batch(batch_name=name)
+            metadata.created_date = now - timedelta(days=created_days_ago)
+            if accessed_days_ago is not None:
+                metadata.last_accessed = now - timedelta(days=accessed_days_ago)
+            metadata.archived = archived
+            temp_batch_service._save_batch_metadata(metadata)
+            return metadata
+
+        old = batch("old", 100)
+        oldest = batch("oldest", 400)
+        batch("recent", 10)
+        batch("accessed", 200, accessed_days_ago=5)
+        batch("archived", 300, archived=True)
+
+        found = archive_service.find_old_batches(90)
+        assert [b.batch_name for b in found] == ["oldest", "old"]
+
+        # Only changed metadata is re-read on the next call
+        old.last_accessed = now
+        temp_batch_service._save_batch_metadata(old)
+        with patch.object(
+            temp_batch_service, "load_batch_metadata", wraps=temp_batch_service.load_batch_metadata
+        ) as load:
+            found = archive_service.find_old_batches(90)
+
+        assert [b.batch_id for b in found] == [oldest.batch_id]
+        # The changed batch is re-read through the index; only the candidate is loaded
+        assert load.call_count == 1
+
+
+class TestStatistics:
+    """Tests for archive statistics."""
+
+    def test_statistics_follow_archive_and_restore(
+        self, archive_service, temp_batch_service, sample_batch
+    ):
+        """Test statistics come from the stats file, not batch metadata."""
+        temp_batch_service.create_batch(batch_name="Active")
+        assert archive_service.archive_batch(sample_batch.batch_id) is True
+        archived = temp_batch_service.load_batch_metadata(sample_batch.batch_id)
+
+        # Directories being removed in the background, and stray ones, aren't batches
+        batches_root = archive_service._batches_root
+        (batches_root / f"{uuid4()}.{uuid4().hex}.gc").mkdir()
+        (batches_root / "lost+found").mkdir()
+
+        with patch.object(temp_batch_service, "list_batches") as list_batches:
+            stats = archive_service.get_archive_statistics()
+        list_batches.assert_not_called()
+
+        assert stats["total_batches"] == 2
+        assert stats["archived_batches"] == 1
+        assert stats["active_batches"] == 1
+        assert stats["total_archive_size"] == archived.archive_size
+        assert stats["total_original_size"] == archived.original_size
+        assert stats["space_saved"] == archived.original_size - archived.archive_size
+
+        assert archive_service.restore_batch(sample_batch.batch_id) is True
+        assert archive_service.get_archive_statistics()["archived_batches"] == 0
+
+    def test_statistics_rebuilt_without_stats_file(
+        self, archive_service, temp_batch_service, sample_batch
+    ):
+        """Test a missing stats file is rebuilt from batch metadata."""
+        assert archive_service.archive_batch(sample_batch.batch_id) is True
+        archive_service._stats_path().unlink()
+
+        assert archive_service.get_archive_statistics()["archived_batches"] == 1
+        assert archive_service._stats_path().exists()
+
+        # Deleted batches drop out of the statistics
+        temp_batch_service.delete_batch(sample_batch.batch_id)
+        assert archive_service.get_archive_statistics()["archived_batches"] == 0
+
+
+class TestAutoArchive:
+    """Tests for automatic archiving of old batches."""
+
+    def test_auto_archive_runs_batches_concurrently(
+        self, archive_service, temp_batch_service, sample_batch
+    ):
+        """Test every candidate is archived on the worker pool and failures are counted."""
+        import threading
+
+        other = temp_batch_service.create_batch(batch_name="Other")
+        threads = set()
+        archive_batch = archive_service.archive_batch
+
+        def tracking_archive(batch_id):
+            threads.add(threading.current_thread().name)
+            return archive_batch(batch_id)
+
+        candidates = [sample_batch, other, temp_batch_service.create_batch()]
+        temp_batch_service.delete_batch(candidates[2].batch_id)
+
+        with (
+            patch.object(archive_service, "find_old_batches", return_value=candidates),
+            patch.object(archive_service, "archive_batch", side_effect=tracking_archive),
+        ):
+            result = archive_service.auto_archive_old_batches(days_threshold=0)
+
+        assert result["total_candidates"] == 3
+        assert result["archived_count"] == 2
+        assert result["failed_count"] == 1
+        assert all(name.startswith("batch-archive") for name in threads), threads
+        assert temp_batch_service.load_batch_metadata(other.batch_id).archived is True
+
+
+class TestS3Sink:
+    """Tests for streaming batch archives to S3."""
+
+    def test_archive_streams_to_s3(self, temp_batch_service, sample_batch):
+        """Test archives go straight to the S3 sink and restore from it."""
+        moto = pytest.importorskip("moto")
+        import boto3
+
+        projects_dir = temp_batch_service.storage.projects_dir
+        project_ids = list(sample_batch.project_ids)
+
+        with moto.mock_aws():
+            boto3.client("s3", region_name="us-east-1").create_bucket(Bucket="archive-bucket")
+            service = BatchArchiveService(
+                temp_batch_service,
+                temp_batch_service.storage,
+                archive_sink="s3://archive-bucket/batches",
+            )
+
+            assert service.archive_batch(sample_batch.batch_id) is True
+
+            archived = temp_batch_service.load_batch_metadata(sample_batch.batch_id)
+            key = f"batches/batch_{sample_batch.batch_id}{service.archive_suffix}"
+            assert archived.archive_path == f"s3://archive-bucket/{key}"
+            head = service._get_s3_client().head_object(
+                Bucket="archive-bucket", Key=key, ChecksumMode="ENABLED"
+            )
+            assert archived.archive_size == head["ContentLength"] > 0
+            assert "ChecksumCRC32" in head
+            assert not list(projects_dir.parent.glob("archives/*.tar.*"))
+            assert not (projects_dir / str(project_ids[0])).exists()
+
+            assert service.restore_batch(sample_batch.batch_id) is True
+
+        assert (projects_dir / str(project_ids[1]) / "original.esx").read_bytes() == b"\x01" * 1000
+        assert not list(projects_dir.parent.glob("*.part"))
+
+    def test_failed_producer_removes_object(self, temp_batch_service, sample_batch):
+        """Test a failed archive write does not leave a truncated object behind."""
+        moto = pytest.importorskip("moto")
+        import boto3
+
+        with moto.mock_aws():
+            client = boto3.client("s3", region_name="us-east-1")
+            client.create_bucket(Bucket="archive-bucket")
+            service = BatchArchiveService(
+                temp_batch_service,
+                temp_batch_service.storage,
+                archive_sink="s3://archive-bucket",
+            )
+
+            with patch(
+                "app.services.batch_archive_service.write_tar_stream",
+                side_effect=OSError("disk error"),
+            ):
+                assert service.archive_batch(sample_batch.batch_id) is False
+
+            assert client.list_objects_v2(Bucket="archive-bucket")["KeyCount"] == 0
+            assert temp_batch_service.load_batch_metadata(sample_batch.batch_id).archived is False
+
+    def test_incomplete_upload_keeps_sources(self, temp_batch_service, sample_batch):
+        """Test a stored object shorter than the archive written is deleted, not trusted."""
+        moto = pytest.importorskip("moto")
+        import boto3
+
+        project_dir = temp_batch_service.storage.projects_dir / str(sample_batch.project_ids[0])
+
+        with moto.mock_aws():
+            client = boto3.client("s3", region_name="us-east-1")
+            client.create_bucket(Bucket="archive-bucket")
+            service = BatchArchiveService(
+                temp_batch_service,
+                temp_batch_service.storage,
+                archive_sink="s3://archive-bucket",
+            )
+            s3 = service._get_s3_client()
+            head_object = s3.head_object
+
+            def short_head(**kwargs):
+                head = head_object(**kwargs)
+                head["ContentLength"] -= 1
+                return head
+
+            with patch.object(s3, "head_object", side_effect=short_head):
+                assert service.archive_batch(sample_batch.batch_id) is False
+
+            assert client.list_objects_v2(Bucket="archive-bucket")["KeyCount"] == 0
+            assert temp_batch_service.load_batch_metadata(sample_batch.batch_id).archived is False
+            assert project_dir.exists()
+
+
+def test_get_batch_archive_service_creates_one_instance(temp_batch_service):
+    """Test concurrent first calls share a single service instance."""
+    import threading
+    import time
+
+    from app.services import batch_archive_service
+
+    def slow_service(*args):
+        time.sleep(0.05)  # Widen the window between the None check and the assignment
+        return BatchArchiveService(*args)
+
+    barrier = threading.Barrier(4)
+    results = []
+
+    def get():
+        barrier.wait()
+        results.append(
+            batch_archive_service.get_batch_archive_service(
+                temp_batch_service, temp_batch_service.storage
+            )
+        )
+
+    with (
+        patch.object(batch_archive_service, "_batch_archive_service_instance", None),
+        patch.object(batch_archive_service, "BatchArchiveService", side_effect=slow_service),
+    ):
+        threads = [threading.Thread(target=get) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert len(results) == 4
+    assert all(result is results[0] for result in results)
@@ -0,0 +1,143 @@
+"""Tests for the batch index."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+
+from app.models import BatchStatus
+from app.services.batch_index import BATCH_INDEX_FILE
+from app.services.batch_service import BatchService
+from app.services.storage_service import StorageService
+
+
+@pytest.fixture
+def temp_batch_service(tmp_path):
+    """Create temporary batch service with temp storage."""
+    from app.services.storage.local import LocalStorage
+
+    storage = StorageService()
+    storage.backend = LocalStorage(base_dir=tmp_path / "projects")
+    storage.projects_dir = tmp_path / "projects"
+    return BatchService(storage_service=storage)
+
+
+def _index_path(service):
+    return service.storage.projects_dir.parent / service.batches_dir / BATCH_INDEX_FILE
+
+
+class TestBatchIndex:
+    """Tests for listing batches through the index."""
+
+    def test_index_built_on_first_listing(self, temp_batch_service):
+        """Test batches saved before the index existed are found by rebuilding it."""
+        first = temp_batch_service.create_batch(batch_name="First")
+        second = temp_batch_service.create_batch(batch_name="Second")
+        assert not _index_path(temp_batch_service).exists()
+
+        batches = temp_batch_service.list_batches(sort_by="name", sort_order="asc")
+
+        assert [b.batch_id for b in batches] == [first.batch_id, second.batch_id]
+        assert _index_path(temp_batch_service).exists()
+
+    def test_listing_loads_only_returned_batches(self, temp_batch_service):
+        """Test filters, sorting and the limit run in SQL; only the final slice is loaded."""
+        for i in range(5):
+            temp_batch_service.create_batch(batch_name=f"Batch {i}")
+        temp_batch_service.list_batches()  # Builds the index
+
+        fresh = BatchService(storage_service=temp_batch_service.storage)
+        with patch.object(fresh, "load_batch_metadata", wraps=fresh.load_batch_metadata) as load:
+            batches = fresh.list_batches(sort_by="name", sort_order="desc", limit=2)
+
+        assert [b.batch_name for b in batches] == ["Batch 4", "Batch 3"]
+        assert load.call_count == 2
+
+    def test_updates_and_deletes_follow_saves(self, temp_batch_service):
+        """Test saves update rows and deletions drop them."""
+        batch = temp_batch_service.create_batch(batch_name="Site survey")
+        other = temp_batch_service.create_batch(batch_name="Other")
+        temp_batch_service.list_batches()
+
+        temp_batch_service.add_project_to_batch(batch.batch_id, uuid4(), "warehouse.esx")
+        temp_batch_service.update_batch_tags(batch.batch_id, ["q1"], [])
+
+        found = temp_batch_service.list_batches(search_query="WAREHOUSE", tags=["q1"])
+        assert [b.batch_id for b in found] == [batch.batch_id]
+        assert temp_batch_service.list_batches(min_projects=1)[0].batch_id == batch.batch_id
+
+        assert temp_batch_service.delete_batch(other.batch_id) is True
+        assert [b.batch_id for b in temp_batch_service.list_batches()] == [batch.batch_id]
+
+    def test_other_writers_are_picked_up(self, temp_batch_service):
+        """Test lines appended by another process are read incrementally."""
+        temp_batch_service.create_batch(batch_name="Mine")
+        temp_batch_service.list_batches()
+
+        other_process = BatchService(storage_service=temp_batch_service.storage)
+        other_process.list_batches()
+        created = other_process.create_batch(batch_name="Theirs")
+        other_process.add_project_to_batch(created.batch_id, uuid4(), "a.esx")
+
+        names = {b.batch_name for b in temp_batch_service.list_batches()}
+        assert names == {"Mine", "Theirs"}
+
+    def test_search_without_fts(self, temp_batch_service):
+        """Test substring search without FTS5, and for short queries, is a literal match."""
+        batch = temp_batch_service.create_batch(batch_name="100%_done")
+        temp_batch_service.add_project_to_batch(batch.batch_id, uuid4(), "Floor-2.esx")
+        temp_batch_service.create_batch(batch_name="1000 done")
+        temp_batch_service.list_batches()
+
+        assert [b.batch_id for b in temp_batch_service.list_batches(search_query="%_")] == [
+            batch.batch_id
+        ]
+        index = temp_batch_service._get_batch_index()
+        with patch.object(index, "_fts", False):
+            assert index.query(search_query="FLOOR") == [batch.batch_id]
+
+    def test_stale_rows_dropped(self, temp_batch_service):
+        """Test batches removed without the service are dropped from the index."""
+        import shutil
+
+        batch = temp_batch_service.create_batch()
+        temp_batch_service.list_batches()
+        shutil.rmtree(temp_batch_service._get_batch_dir(batch.batch_id))
+
+        assert temp_batch_service.list_batches() == []
+        assert temp_batch_service._get_batch_index().query() == []
+
+    def test_outdated_schema_rebuilt(self, temp_batch_service):
+        """Test an index with another schema version is rebuilt from the files."""
+        import sqlite3
+
+        batch = temp_batch_service.create_batch(batch_name="Kept")
+        path = _index_path(temp_batch_service)
+        with sqlite3.connect(path) as db:
+            db.execute("CREATE TABLE batches (junk TEXT)")
+            db.execute("PRAGMA user_version = 0")
+
+        assert [b.batch_id for b in temp_batch_service.list_batches()] == [batch.batch_id]
+
+    def test_status_dates_and_success_rate(self, temp_batch_service):
+        """Test status and date filters and success-rate sorting."""
+        from datetime import timedelta
+
+        low = temp_batch_service.create_batch(batch_name="Low")
+        high = temp_batch_service.create_batch(batch_name="High")
+        low.statistics.total_projects, low.statistics.successful_projects = 4, 1
+        high.statistics.total_projects, high.statistics.successful_projects = 2, 2
+        high.status = BatchStatus.COMPLETED
+        temp_batch_service.list_batches()
+        temp_batch_service._save_batch_metadata(low)
+        temp_batch_service._save_batch_metadata(high)
+
+        by_rate = temp_batch_service.list_batches(sort_by="success_rate", sort_order="desc")
+        assert [b.batch_id for b in by_rate] == [high.batch_id, low.batch_id]
+        completed = temp_batch_service.list_batches(status=BatchStatus.COMPLETED)
+        assert [b.batch_id for b in completed] == [high.batch_id]
+        later = high.created_date + timedelta(seconds=1)
+        assert len(temp_batch_service.list_batches(created_before=later)) == 2
+        assert temp_batch_service.list_batches(created_after=later) == []
@@ -5,6 +5,7 @@ from __future__ import annotations
 import json
 from datetime import UTC, datetime
 from pathlib import Path
+from unittest.mock import patch
 from uuid import UUID, uuid4
 
 import pytest
@@ -87,6 +88,12 @@ class TestBatchServiceCreation:
 
         assert batch.batch_name == "My Custom Batch"
 
+    def test_create_batch_default_name_matches_created_date(self, temp_batch_service):
+        """Test the generated batch name uses the batch's own creation timestamp."""
+        batch = temp_batch_service.create_batch()
+
+        assert batch.batch_name == f"Batch {batch.created_date.strftime('%Y-%m-%d %H:%M')}"
+
     def test_create_batch_with_processing_options(
         self, temp_batch_service, sample_processing_request
     ):
@@ -94,9 +101,22 @@ class TestBatchServiceCreation:
         batch = temp_batch_service.create_batch(processing_options=sample_processing_request)
 
         assert batch.processing_options.group_by == "model"
-        assert batch.processing_options.output_formats == ["csv", "excel"]
+        assert batch.processing_options.output_formats == ("csv", "excel")
         assert batch.processing_options.visualize_floor_plans is True
 
+    def test_default_processing_options_shared_and_frozen(self):
+        """Test default processing options are one shared, immutable instance."""
+        from pydantic import ValidationError
+
+        first = BatchMetadata(batch_dir="batches/a")
+        second = BatchMetadata(batch_dir="batches/b")
+        assert first.processing_options is second.processing_options
+
+        with pytest.raises(ValidationError):
+            first.processing_options.group_by = "floor"
+
+        assert ProcessingRequest(output_formats=["csv"]).output_formats == ("csv",)
+
     def test_create_batch_with_parallel_workers(self, temp_batch_service):
         """Test creating batch with parallel workers."""
         batch = temp_batch_service.create_batch(parallel_workers=4)
@@ -153,6 +173,34 @@ class TestBatchServiceMetadata:
         assert loaded.batch_name == "Updated Name"
         assert loaded.status == BatchStatus.PROCESSING
 
+    def test_save_batch_metadata_is_atomic(self, temp_batch_service):
+        """Test metadata is written compactly via a temporary file that is renamed."""
+        batch = temp_batch_service.create_batch(batch_name="Atomic")
+        metadata_path = temp_batch_service._get_batch_metadata_path(batch.batch_id)
+
+        with patch("app.utils.atomic_write.os.replace", side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                temp_batch_service._save_batch_metadata(
+                    batch.model_copy(update={"batch_name": "X"})
+                )
+
+        # Failed write leaves the previous file intact and no temporary file behind
+        assert temp_batch_service.load_batch_metadata(batch.batch_id).batch_name == "Atomic"
+        assert [p.name for p in metadata_path.parent.iterdir()] == ["batch_metadata.json"]
+        assert b"\n" not in metadata_path.read_bytes()
+
+    def test_batch_dir_follows_storage_changes(self, temp_batch_service, tmp_path):
+        """Test the cached batches root is recomputed when storage paths change."""
+        batch_id = uuid4()
+        assert temp_batch_service._get_batch_dir(batch_id) == (tmp_path / "batches" / str(batch_id))
+
+        temp_batch_service.storage.projects_dir = tmp_path / "other" / "projects"
+        assert temp_batch_service._get_batch_dir(batch_id) == (
+            tmp_path / "other" / "batches" / str(batch_id)
+        )
+        temp_batch_service.batches_dir = Path("archived")
+        assert temp_batch_service._get_batch_dir(batch_id).parent == tmp_path / "other" / "archived"
+
 
 class TestBatchServiceProjects:
     """Tests for adding projects to batches."""
@@ -266,6 +314,37 @@ class TestBatchServiceListing:
         batches = temp_batch_service.list_batches(limit=2)
         assert len(batches) == 2
 
+    def test_list_batches_reuses_parsed_metadata(self, temp_batch_service):
+        """Test unchanged batch metadata is parsed once across listings."""
+        first = temp_batch_service.create_batch(batch_name="First")
+        temp_batch_service.create_batch(batch_name="Second")
+
+        with patch.object(
+            BatchMetadata, "model_validate_json", wraps=BatchMetadata.model_validate_json
+        ) as parse:
+            temp_batch_service.list_batches()
+            temp_batch_service.list_batches()
+            assert parse.call_count == 2
+
+            temp_batch_service.update_batch_tags(first.batch_id, ["site"], [])
+            batches = temp_batch_service.list_batches(tags=["site"])
+
+        # update_batch_tags loads once, then only the changed batch is re-parsed
+        assert parse.call_count == 4
+        assert [b.batch_id for b in batches] == [first.batch_id]
+
+    def test_unchanged_tags_not_saved(self, temp_batch_service):
+        """Test tag edits that change nothing skip the metadata write."""
+        batch = temp_batch_service.create_batch()
+        temp_batch_service.update_batch_tags(batch.batch_id, ["b", "a"], [])
+
+        with patch.object(temp_batch_service, "_save_batch_metadata") as save:
+            tags = temp_batch_service.update_batch_tags(batch.batch_id, [" a "], ["c"])
+            assert tags == ["a", "b"]
+            save.assert_not_called()
+            assert temp_batch_service.update_batch_tags(batch.batch_id, [], ["a"]) == ["b"]
+            save.assert_called_once()
+
 
 class TestBatchServiceStatistics:
     """Tests for statistics calculation."""
@@ -322,6 +401,125 @@ class TestBatchServiceStatistics:
         assert stats.total_access_points == 13
         assert stats.total_antennas == 26
 
+    def test_calculate_statistics_aggregates_bom(self, temp_batch_service):
+        """Test BOM quantities from project reports are summed per vendor/model."""
+        batch = temp_batch_service.create_batch()
+        batch.project_statuses = []
+
+        for quantity in (2, 3):
+            project_id = uuid4()
+            reports_dir = temp_batch_service.storage.projects_dir / str(project_id) / "reports"
+            reports_dir.mkdir(parents=True)
+            (reports_dir / "bom_report.json").write_text(
+                json.dumps(
+                    {
+                        "access_points": [
+                            {"vendor": "Cisco", "model": "C9120", "quantity": quantity}
+                        ],
+                        "antennas": [{"model": "AIR-ANT", "quantity": 1}],
+                    }
+                )
+            )
+            batch.project_statuses.append(
+                BatchProjectStatus(
+                    project_id=project_id,
+                    filename=f"project{quantity}.esx",
+                    status=ProcessingStatus.COMPLETED,
+                )
+            )
+
+        stats = temp_batch_service._calculate_statistics(batch)
+
+        assert stats.ap_by_vendor_model == {"Cisco|C9120": 5}
+        assert stats.antenna_by_model == {"AIR-ANT": 2}
+
+        dumped = stats.model_dump()
+        assert type(dumped["ap_by_vendor_model"]) is dict
+        restored = BatchStatistics.model_validate_json(stats.model_dump_json())
+        assert restored.ap_by_vendor_model == stats.ap_by_vendor_model
+
+    def test_calculate_statistics_from_csv_reports(self, temp_batch_service):
+        """Test the CSV fallback streams rows into the BOM counters."""
+        batch = temp_batch_service.create_batch()
+        project_id = uuid4()
+        reports_dir = temp_batch_service.storage.projects_dir / str(project_id) / "reports"
+        reports_dir.mkdir(parents=True)
+        (reports_dir / "site_access_points.csv").write_text(
+            '# Generated report\n"Vendor","Model","Quantity"\n'
+            '"Cisco","C9120","2"\n"Aruba","AP-515","1"\n"Cisco","C9120","3"\n'
+        )
+        (reports_dir / "site_antennas.csv").write_text('"Model","Quantity"\n"AIR-ANT","4"\n')
+        batch.project_statuses = [
+            BatchProjectStatus(
+                project_id=project_id, filename="site.esx", status=ProcessingStatus.COMPLETED
+            )
+        ]
+
+        stats = temp_batch_service._calculate_statistics(batch)
+
+        assert stats.ap_by_vendor_model == {"Cisco|C9120": 5, "Aruba|AP-515": 1}
+        assert stats.antenna_by_model == {"AIR-ANT": 4}
+
+    def test_csv_reports_missing_columns_and_blank_lines(self, temp_batch_service):
+        """Test CSV columns missing from the header fall back to their defaults."""
+        batch = temp_batch_service.create_batch()
+        project_id = uuid4()
+        reports_dir = temp_batch_service.storage.projects_dir / str(project_id) / "reports"
+        reports_dir.mkdir(parents=True)
+        (reports_dir / "site_access_points.csv").write_text(
+            '"Model","Quantity"\n"C9120","2"\n\n"C9120","1"\n'
+        )
+        batch.project_statuses = [
+            BatchProjectStatus(
+                project_id=project_id, filename="site.esx", status=ProcessingStatus.COMPLETED
+            )
+        ]
+
+        stats = temp_batch_service._calculate_statistics(batch)
+
+        assert stats.ap_by_vendor_model == {"Unknown|C9120": 3}
+
+    def test_project_bom_parsed_once_until_changed(self, temp_batch_service):
+        """Test report files are only re-parsed when they change."""
+        import os
+
+        batch = temp_batch_service.create_batch()
+        project_id = uuid4()
+        reports_dir = temp_batch_service.storage.projects_dir / str(project_id) / "reports"
+        reports_dir.mkdir(parents=True)
+        report = reports_dir / "bom_report.json"
+        report.write_text(json.dumps({"access_points": [{"vendor": "Cisco", "model": "C9120"}]}))
+        batch.project_statuses = [
+            BatchProjectStatus(
+                project_id=project_id, filename="site.esx", status=ProcessingStatus.COMPLETED
+            )
+        ]
+
+        from app.services import batch_service
+
+        with patch.object(
+            batch_service, "_load_json_file", wraps=batch_service._load_json_file
+        ) as load:
+            temp_batch_service._calculate_statistics(batch)
+            stats = temp_batch_service._calculate_statistics(batch)
+            assert load.call_count == 1
+            assert stats.ap_by_vendor_model == {"Cisco|C9120": 1}
+
+            report.write_text(json.dumps({"access_points": [{"model": "C9130", "quantity": 2}]}))
+            os.utime(report, ns=(1, 1))
+            stats = temp_batch_service._calculate_statistics(batch)
+            assert load.call_count == 2
+            assert stats.ap_by_vendor_model == {"Unknown|C9130": 2}
+
+    def test_statistics_accumulate(self):
+        """Test accumulate() adds row quantities to the counters."""
+        stats = BatchStatistics()
+        stats.accumulate(ap_rows=[("Cisco", "C9120", 2)], antenna_rows=[("AIR-ANT", 1)])
+        stats.accumulate(ap_rows=iter([("Cisco", "C9120", 1), ("Aruba", "AP-515", 4)]))
+
+        assert stats.ap_by_vendor_model == {"Cisco|C9120": 3, "Aruba|AP-515": 4}
+        assert stats.antenna_by_model == {"AIR-ANT": 1}
+
 
 class TestBatchServiceDeletion:
     """Tests for batch deletion."""
@@ -346,6 +544,26 @@ class TestBatchServiceDeletion:
         result = temp_batch_service.delete_batch(fake_id)
         assert result is False
 
+    def test_delete_batch_removes_files_in_background(self, temp_batch_service):
+        """Test the batch directory is renamed aside and handed to a background delete."""
+        from app.services.archive import STALE_DIR_SUFFIX
+
+        batch = temp_batch_service.create_batch()
+        batch_dir = temp_batch_service._get_batch_dir(batch.batch_id)
+
+        with patch("app.services.batch_service.remove_in_background") as remove:
+            assert temp_batch_service.delete_batch(batch.batch_id) is True
+
+        assert not batch_dir.exists()
+        (stale_dir,) = remove.call_args.args
+        assert stale_dir.name.startswith(batch_dir.name)
+        assert stale_dir.name.endswith(STALE_DIR_SUFFIX)
+        assert temp_batch_service.list_batches() == []
+
+        with patch("app.services.batch_service.remove_in_background") as remove:
+            assert temp_batch_service.remove_stale_dirs() == 1
+        remove.assert_called_once_with(stale_dir)
+
 
 class TestBatchServiceUpdateStatus:
     """Tests for updating project status in batch."""
@@ -390,6 +608,28 @@ class TestBatchServiceUpdateStatus:
         assert batch.project_statuses[0].status == ProcessingStatus.FAILED
         assert batch.project_statuses[0].error_message == "Test error"
 
+    def test_update_project_status_with_status_map(self, temp_batch_service):
+        """Test updates go through a project_id -> status map when one is given."""
+        batch = temp_batch_service.create_batch()
+        project_ids = [uuid4() for _ in range(3)]
+        for project_id in project_ids:
+            temp_batch_service.add_project_to_batch(batch.batch_id, project_id, "test.esx")
+        batch = temp_batch_service.load_batch_metadata(batch.batch_id)
+        statuses = {ps.project_id: ps for ps in batch.project_statuses}
+
+        temp_batch_service._update_project_status(
+            batch, project_ids[2], ProcessingStatus.FAILED, statuses=statuses
+        )
+        temp_batch_service._update_project_status(
+            batch, uuid4(), ProcessingStatus.FAILED, statuses=statuses
+        )
+
+        assert [ps.status for ps in batch.project_statuses] == [
+            ProcessingStatus.PENDING,
+            ProcessingStatus.PENDING,
+            ProcessingStatus.FAILED,
+        ]
+
     def test_update_project_status_loads_counts(self, temp_batch_service, sample_project_metadata):
         """Test that updating status loads AP and antenna counts."""
         batch = temp_batch_service.create_batch()
@@ -408,3 +648,401 @@ class TestBatchServiceUpdateStatus:
         # Verify counts were loaded from project metadata
         assert batch.project_statuses[0].access_points_count == 10
         assert batch.project_statuses[0].antennas_count == 20
+
+
+class TestBatchServiceProcessing:
+    """Tests for processing all projects of a batch."""
+
+    async def test_process_batch_runs_parallel_workers(self, temp_batch_service):
+        """Test up to parallel_workers projects are processed at once."""
+        import asyncio
+        import threading
+        from unittest.mock import AsyncMock
+
+        batch = temp_batch_service.create_batch(parallel_workers=2)
+        project_ids = []
+        for i in range(5):
+            project_id = uuid4()
+            temp_batch_service.storage.save_metadata(
+                project_id,
+                ProjectMetadata(
+                    project_id=project_id,
+                    filename=f"site{i}.esx",
+                    file_size=1024,
+                    original_file=f"projects/{project_id}/original.esx",
+                ),
+            )
+            temp_batch_service.add_project_to_batch(batch.batch_id, project_id, f"site{i}.esx")
+            project_ids.append(project_id)
+        missing = uuid4()
+        temp_batch_service.add_project_to_batch(batch.batch_id, missing, "missing.esx")
+
+        running = 0
+        peak = 0
+        save_threads = []
+        original_save = temp_batch_service._save_batch_metadata
+
+        def recording_save(metadata):
+            save_threads.append(threading.current_thread())
+            original_save(metadata)
+
+        load_threads = []
+        original_load = temp_batch_service.storage.load_metadata
+
+        def recording_load(project_id):
+            load_threads.append(threading.current_thread())
+            return original_load(project_id)
+
+        async def fake_process(project_metadata, options):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return project_metadata.project_id != project_ids[0]
+
+        with (
+            patch.object(temp_batch_service, "_process_single_project", side_effect=fake_process),
+            patch("app.services.batch_service.connection_manager") as manager,
+            patch.object(
+                temp_batch_service, "_save_batch_metadata", side_effect=recording_save
+            ) as save,
+            patch.object(temp_batch_service.storage, "load_metadata", side_effect=recording_load),
+        ):
+            manager.send_project_update = AsyncMock()
+            manager.send_batch_update = AsyncMock()
+            manager.send_batch_progress = AsyncMock()
+            result = await temp_batch_service.process_batch(batch.batch_id)
+
+        # Status updates are buffered: written when processing starts and ends
+        assert save.call_count == 2
+        assert threading.main_thread() not in save_threads  # Off the event loop
+        assert len(load_threads) == 12  # Before processing, then for the counts
+        assert threading.main_thread() not in load_threads
+        saved = temp_batch_service.load_batch_metadata(batch.batch_id)
+        assert saved.status == BatchStatus.PARTIAL
+        assert saved.project_statuses == result.project_statuses
+
+        assert peak == 2
+        assert result.status == BatchStatus.PARTIAL
+        assert result.statistics.successful_projects == 4
+        assert result.statistics.failed_projects == 2
+        statuses = {ps.project_id: ps for ps in result.project_statuses}
+        assert statuses[project_ids[0]].status == ProcessingStatus.FAILED
+        assert "not found" in statuses[missing].error_message
+
+        progress = [call.kwargs["progress"] for call in manager.send_batch_update.call_args_list]
+        assert progress == [0, 100]
+        combined = manager.send_batch_progress.call_args_list
+        assert [call.kwargs["progress"] for call in combined] == [16, 33, 50, 66, 83, 100]
+        assert all(call.kwargs["batch_status"] == "processing" for call in combined)
+        assert manager.send_project_update.call_count == 6  # "started" only
+
+    async def test_process_batch_coalesces_progress(self, temp_batch_service):
+        """Test progress rides along with project results only when it moved."""
+        from unittest.mock import AsyncMock
+
+        batch = temp_batch_service.create_batch(parallel_workers=4)
+        for i in range(150):
+            temp_batch_service.add_project_to_batch(batch.batch_id, uuid4(), f"site{i}.esx")
+
+        with (
+            patch("app.services.batch_service.connection_manager") as manager,
+            patch("app.services.batch_service.time.monotonic", return_value=100.0),
+        ):
+            manager.send_project_update = AsyncMock()
+            manager.send_batch_update = AsyncMock()
+            manager.send_batch_progress = AsyncMock()
+            await temp_batch_service.process_batch(batch.batch_id)
+
+        combined = manager.send_batch_progress.call_args_list
+        assert len(combined) == 150
+        sent = [c.kwargs["progress"] for c in combined if c.kwargs["batch_status"] is not None]
+        assert sent == list(range(1, 101))
+
+    async def test_process_batch_skips_project_broadcasts_without_clients(self, temp_batch_service):
+        """Test per-project messages are not built or sent when nobody listens."""
+        from unittest.mock import AsyncMock
+
+        batch = temp_batch_service.create_batch()
+        for i in range(3):
+            temp_batch_service.add_project_to_batch(batch.batch_id, uuid4(), f"site{i}.esx")
+
+        with patch("app.services.batch_service.connection_manager") as manager:
+            manager.get_connection_count.return_value = 0
+            manager.send_project_update = AsyncMock()
+            manager.send_batch_update = AsyncMock()
+            manager.send_batch_progress = AsyncMock()
+            result = await temp_batch_service.process_batch(batch.batch_id)
+
+        assert result.statistics.failed_projects == 3
+        manager.send_project_update.assert_not_called()
+        manager.send_batch_progress.assert_not_called()
+        assert manager.send_batch_update.call_count == 2  # Started and finished
+
+    def test_processor_shared_until_storage_changes(self, temp_batch_service):
+        """Test one ProcessorService serves every project on the same storage."""
+        processor = temp_batch_service._get_processor()
+        assert temp_batch_service._get_processor() is processor
+        assert processor.storage is temp_batch_service.storage
+
+        temp_batch_service.storage = StorageService()
+        assert temp_batch_service._get_processor().storage is temp_batch_service.storage
+
+    def test_flush_batch_metadata_is_throttled(self, temp_batch_service):
+        """Test buffered updates are written at most once per flush interval."""
+        from app.services import batch_service as batch_service_module
+
+        batch = temp_batch_service.create_batch()
+        project_id = uuid4()
+        temp_batch_service.add_project_to_batch(batch.batch_id, project_id, "test.esx")
+        batch = temp_batch_service.load_batch_metadata(batch.batch_id)
+
+        with (
+            patch.object(
+                temp_batch_service,
+                "_save_batch_metadata",
+                wraps=temp_batch_service._save_batch_metadata,
+            ) as save,
+            patch.object(batch_service_module.time, "monotonic", side_effect=[100.0, 101.0, 106.0]),
+        ):
+            # Nothing buffered yet
+            temp_batch_service._flush_batch_metadata(batch)
+            temp_batch_service._flush_batch_metadata(batch, force=True)  # t=100
+
+            temp_batch_service._update_project_status(batch, project_id, ProcessingStatus.FAILED)
+            temp_batch_service._flush_batch_metadata(batch)  # t=101, too soon
+            assert save.call_count == 1
+            temp_batch_service._flush_batch_metadata(batch)  # t=106
+            assert save.call_count == 2
+
+        saved = temp_batch_service.load_batch_metadata(batch.batch_id)
+        assert saved.project_statuses[0].status == ProcessingStatus.FAILED
+
+
+class TestPackedUUIDs:
+    """Tests for the packed project_ids container on BatchMetadata."""
+
+    def test_list_behaviour(self):
+        """Test PackedUUIDs supports the list operations batches rely on."""
+        from app.models import PackedUUIDs
+
+        ids = [uuid4() for _ in range(3)]
+        packed = PackedUUIDs(ids)
+
+        assert len(packed) == 3
+        assert packed == ids
+        assert list(packed) == ids
+        assert packed[-1] == ids[2]
+        assert ids[1] in packed
+        assert uuid4() not in packed
+        assert packed.index(ids[2]) == 2
+
+        extra = uuid4()
+        packed.append(extra)
+        packed.insert(0, extra)
+        assert packed[0] == packed[4] == extra
+        del packed[0]
+        assert packed == ids + [extra]
+
+    def test_round_trip_through_model(self):
+        """Test project_ids serializes as a UUID list and validates back."""
+        from app.models import PackedUUIDs
+
+        ids = [uuid4(), uuid4()]
+        batch = BatchMetadata(batch_dir="batches/x", project_ids=ids)
+        assert isinstance(batch.project_ids, PackedUUIDs)
+
+        data = json.loads(batch.model_dump_json())
+        assert data["project_ids"] == [str(i) for i in ids]
+
+        restored = BatchMetadata.model_validate_json(batch.model_dump_json())
+        assert restored.project_ids == ids
+
+        copied = BatchMetadata(batch_dir="batches/y", project_ids=batch.project_ids)
+        copied.project_ids.append(uuid4())
+        assert len(batch.project_ids) == 2
+
+
+class TestBatchServiceArchive:
+    """Tests for batch ZIP archives."""
+
+    def test_compressed_files_stored(self, temp_batch_service, sample_project_metadata):
+        """Test already-compressed files are stored and text reports deflated."""
+        import zipfile
+
+        project_id = sample_project_metadata.project_id
+        project_dir = temp_batch_service.storage.projects_dir / str(project_id)
+        (project_dir / "reports" / "visualizations").mkdir(parents=True)
+        (project_dir / "original.esx").write_bytes(b"esx" * 100)
+        (project_dir / "reports" / "bom.csv").write_text("vendor,model\n" * 100)
+        (project_dir / "reports" / "visualizations" / "floor.PNG").write_bytes(b"png" * 100)
+
+        batch = temp_batch_service.create_batch(batch_name="Archive")
+        temp_batch_service.add_project_to_batch(batch.batch_id, project_id, "test.esx")
+
+        zip_path = temp_batch_service.create_batch_archive(batch.batch_id)
+        with zipfile.ZipFile(zip_path) as zipf:
+            types = {i.filename: i.compress_type for i in zipf.infolist()}
+            assert zipf.read("Test Project/reports/bom.csv") == b"vendor,model\n" * 100
+            assert zipf.testzip() is None
+            names = zipf.namelist()
+
+        assert len(names) == len(set(names)) == 4
+        assert types["Test Project/test.esx"] == zipfile.ZIP_STORED
+        assert types["Test Project/reports/visualizations/floor.PNG"] == zipfile.ZIP_STORED
+        assert types["Test Project/reports/bom.csv"] == zipfile.ZIP_DEFLATED
+        assert types["batch_summary.txt"] == zipfile.ZIP_DEFLATED
+
+    def test_projects_with_same_name_kept_apart(self, temp_batch_service, sample_project_metadata):
+        """Test projects sharing a name get separate folders instead of overwriting."""
+        import zipfile
+
+        other = sample_project_metadata.model_copy(update={"project_id": uuid4()})
+        temp_batch_service.storage.save_metadata(other.project_id, other)
+        batch = temp_batch_service.create_batch(batch_name="Archive")
+        for project in (sample_project_metadata, other):
+            project_dir = temp_batch_service.storage.projects_dir / str(project.project_id)
+            project_dir.mkdir(parents=True, exist_ok=True)
+            (project_dir / "original.esx").write_bytes(str(project.project_id).encode())
+            temp_batch_service.add_project_to_batch(batch.batch_id, project.project_id, "test.esx")
+
+        zip_path = temp_batch_service.create_batch_archive(batch.batch_id)
+        with zipfile.ZipFile(zip_path) as zipf:
+            first = zipf.read("Test Project/test.esx")
+            second = zipf.read(f"Test Project_{other.project_id}/test.esx")
+        assert first == str(sample_project_metadata.project_id).encode()
+        assert second == str(other.project_id).encode()
+
+    def test_read_ahead_bounded(self, temp_batch_service, sample_project_metadata):
+        """Test only a window of entries is prepared ahead of the archive writer."""
+        import threading
+        import time
+        import zipfile
+
+        from app.services import batch_service as batch_module
+
+        project_dir = temp_batch_service.storage.projects_dir / str(
+            sample_project_metadata.project_id
+        )
+        (project_dir / "reports").mkdir(parents=True)
+        for i in range(20):
+            (project_dir / "reports" / f"report{i}.csv").write_text("a,b\n" * 10)
+        batch = temp_batch_service.create_batch(batch_name="Archive")
+        temp_batch_service.add_project_to_batch(
+            batch.batch_id, sample_project_metadata.project_id, "test.esx"
+        )
+
+        lock = threading.Lock()
+        counts = {"prepared": 0, "written": 0, "ahead": 0}
+        prepare = batch_module._prepare_archive_file
+        write = batch_module._write_archive_entry
+
+        def counting_prepare(path, arcname):
+            with lock:
+                counts["prepared"] += 1
+                counts["ahead"] = max(counts["ahead"], counts["prepared"] - counts["written"])
+            return prepare(path, arcname)
+
+        def slow_write(*args):
+            time.sleep(0.005)
+            write(*args)
+            with lock:
+                counts["written"] += 1
+
+        with (
+            patch.object(batch_module, "ARCHIVE_READ_AHEAD", 2),
+            patch.object(batch_module, "_prepare_archive_file", side_effect=counting_prepare),
+            patch.object(batch_module, "_write_archive_entry", side_effect=slow_write),
+        ):
+            zip_path = temp_batch_service.create_batch_archive(batch.batch_id)
+
+        with zipfile.ZipFile(zip_path) as zipf:
+            assert zipf.testzip() is None
+            assert len(zipf.namelist()) == 21
+        assert counts["written"] == 20
+        assert counts["ahead"] <= 2
+
+    def test_write_deflated_round_trip(self, tmp_path):
+        """Test pre-deflated entries mix with zipfile's own and read back intact."""
+        import zipfile
+
+        from app.utils.zip_entries import deflate_file, write_deflated
+
+        report = tmp_path / "report.json"
+        report.write_text('{"aps": 10}' * 500)
+        zip_path = tmp_path / "out.zip"
+        with zipfile.ZipFile(zip_path, "w") as zipf:
+            zipf.writestr("first.txt", "first")
+            write_deflated(zipf, *deflate_file(report, "report.json"))
+            zipf.writestr("last.txt", "last")
+
+        with zipfile.ZipFile(zip_path) as zipf:
+            assert zipf.testzip() is None
+            assert zipf.namelist() == ["first.txt", "report.json", "last.txt"]
+            assert zipf.read("report.json") == report.read_bytes()
+            info = zipf.getinfo("report.json")
+            assert info.compress_type == zipfile.ZIP_DEFLATED
+            assert info.compress_size < info.file_size
+
+    @pytest.mark.parametrize("sendfile", [True, False])
+    def test_write_stored_round_trip(self, tmp_path, sendfile):
+        """Test stored entries copied with sendfile (or the fallback) read back intact."""
+        import io
+        import zipfile
+
+        from app.utils import zip_entries
+
+        project = tmp_path / "site.esx"
+        project.write_bytes(bytes(range(256)) * 4096)
+        empty = tmp_path / "empty.png"
+        empty.write_bytes(b"")
+
+        zip_path = tmp_path / "out.zip"
+        with patch.object(zip_entries, "SENDFILE_AVAILABLE", sendfile):
+            with zipfile.ZipFile(zip_path, "w") as zipf:
+                zipf.writestr("first.txt", "first")
+                zip_entries.write_stored(zipf, project, "site.esx")
+                zip_entries.write_stored(zipf, empty, "empty.png")
+                zipf.writestr("last.txt", "last")
+            with zipfile.ZipFile(io.BytesIO(), "w") as in_memory:
+                zip_entries.write_stored(in_memory, project, "site.esx")
+
+        with zipfile.ZipFile(zip_path) as zipf:
+            assert zipf.testzip() is None
+            assert zipf.namelist() == ["first.txt", "site.esx", "empty.png", "last.txt"]
+            assert zipf.read("site.esx") == project.read_bytes()
+            assert zipf.getinfo("site.esx").compress_type == zipfile.ZIP_STORED
+            assert zipf.read("last.txt") == b"last"
+
+    @pytest.mark.parametrize("internals", [True, False])
+    def test_mixed_entries_read_back(self, tmp_path, internals):
+        """Test deflated, stored and writestr entries mix into a valid archive.
+
+        Without the private ZipFile attributes both helpers fall back to the public API.
+        """
+        import zipfile
+
+        from app.utils import zip_entries
+
+        report = tmp_path / "bom.csv"
+        report.write_text("vendor,model\n" * 500)
+        project = tmp_path / "site.esx"
+        project.write_bytes(bytes(range(256)) * 1024)
+
+        names = zip_entries._ZIPFILE_INTERNALS + (() if internals else ("_not_in_zipfile",))
+        zip_path = tmp_path / "out.zip"
+        with patch.object(zip_entries, "_ZIPFILE_INTERNALS", names):
+            with zipfile.ZipFile(zip_path, "w") as zipf:
+                zip_entries.write_deflated(zipf, *zip_entries.deflate_file(report, "bom.csv"))
+                zipf.writestr("batch_summary.txt", "summary")
+                zip_entries.write_stored(zipf, project, "site.esx")
+                zip_entries.write_deflated(zipf, *zip_entries.deflate_file(report, "again.csv"))
+
+        with zipfile.ZipFile(zip_path) as zipf:
+            assert zipf.testzip() is None
+            assert zipf.namelist() == ["bom.csv", "batch_summary.txt", "site.esx", "again.csv"]
+            assert zipf.read("bom.csv") == zipf.read("again.csv") == report.read_bytes()
+            assert zipf.read("site.esx") == project.read_bytes()
+            assert zipf.getinfo("bom.csv").compress_type == zipfile.ZIP_DEFLATED
+            assert zipf.getinfo("site.esx").compress_type == zipfile.ZIP_STORED
@@ -0,0 +1,93 @@
+"""Tests for the API response cache."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+from uuid import uuid4
+
+from app.services.cache import CacheService, ShardedTTLCache, SingleEntryCache
+
+
+class TestShardedTTLCache:
+    """Tests for the sharded per-project cache."""
+
+    def test_entries_spread_over_shards(self):
+        """Test entries land in several shards and are found again."""
+        cache = ShardedTTLCache(maxsize=1600, ttl=60)
+        keys = [str(uuid4()) for _ in range(50)]
+        for key in keys:
+            cache[key] = key.upper()
+
+        assert all(cache.get(key) == key.upper() for key in keys)
+        assert len(cache) == 50
+        assert sum(1 for shard in cache._shards if len(shard)) > 1
+
+        assert cache.pop(keys[0]) == keys[0].upper()
+        assert cache.get(keys[0]) is None
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_read_takes_no_lock(self):
+        """Test reads neither lock nor reorder the shard: the oldest write is evicted."""
+        cache = ShardedTTLCache(maxsize=2, ttl=60, shards=1)
+        cache["a"], cache["b"] = 1, 2
+        with cache._locks[0]:
+            assert cache.get("a") == 1
+        cache["c"] = 3
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+
+    def test_expired_entries_missed(self):
+        """Test an entry past its TTL reads as missing."""
+        cache = ShardedTTLCache(maxsize=10, ttl=0)
+        cache["a"] = 1
+        assert cache.get("a") is None
+
+    def test_maxsize_rounded_up_to_shards(self):
+        """Test the total size is split across shards without shrinking it."""
+        cache = ShardedTTLCache(maxsize=100, ttl=60, shards=16)
+        assert cache.maxsize == 112
+        assert all(shard.maxsize == 7 for shard in cache._shards)
+
+
+class TestSingleEntryCache:
+    """Tests for the lock-free single-entry cache."""
+
+    def test_expires_after_ttl(self):
+        """Test the value is dropped once its TTL has passed."""
+        cache = SingleEntryCache(ttl=300)
+        with patch("app.services.cache.time.monotonic", return_value=1000.0):
+            cache.set(["a"])
+            assert cache.get() == ["a"]
+            assert len(cache) == 1
+        with patch("app.services.cache.time.monotonic", return_value=1300.0):
+            assert cache.get() is None
+            assert len(cache) == 0
+
+    def test_read_takes_no_lock(self):
+        """Test reads go through without the writer's lock."""
+        cache = SingleEntryCache(ttl=300)
+        cache.set({"total": 1})
+        with cache._lock:
+            assert cache.get() == {"total": 1}
+
+
+class TestCacheService:
+    """Tests for CacheService invalidation."""
+
+    def test_invalidate_project(self):
+        """Test invalidating a project drops its entries and the stats."""
+        service = CacheService()
+        project_id, other_id = uuid4(), uuid4()
+        service.set_stats({"total": 2})
+        service.set_project_details(project_id, b"{}")
+        service.set_project_details(other_id, b"{}")
+        service.set_reports(project_id, {"reports": []})
+
+        service.invalidate_project(project_id)
+
+        assert service.get_project_details(project_id) is None
+        assert service.get_reports(project_id) is None
+        assert service.get_stats() is None
+        assert service.get_project_details(other_id) == b"{}"
+        assert service.get_cache_stats()["project_details_cache"]["size"] == 1
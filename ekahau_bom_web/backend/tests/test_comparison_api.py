@@ -42,12 +42,12 @@ def temp_storage(tmp_path, monkeypatch):
     monkeypatch.setattr("app.api.comparison.storage_service", storage)
 
     # Clear index
-    index_service._projects = {}
+    index_service.clear()
 
     yield storage
 
     # Cleanup
-    index_service._projects = {}
+    index_service.clear()
 
 
 @pytest.fixture
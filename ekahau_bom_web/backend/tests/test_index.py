@@ -5,6 +5,7 @@ from __future__ import annotations
 import json
 from datetime import UTC, datetime
 from pathlib import Path
+from unittest.mock import patch
 from uuid import uuid4
 
 import pytest
@@ -156,6 +157,64 @@ def test_list_all_with_limit(temp_index, sample_projects):
     assert len(projects) == 2
 
 
+def test_list_all_json(temp_index, sample_projects):
+    """Test cached list JSON matches list_all() and follows updates."""
+    for project in sample_projects:
+        temp_index.add(project)
+
+    expected = [json.loads(p.model_dump_json()) for p in temp_index.list_all()]
+    assert json.loads(temp_index.list_all_json()) == expected
+
+    completed = json.loads(temp_index.list_all_json(status=ProcessingStatus.COMPLETED, limit=1))
+    assert [p["filename"] for p in completed] == ["office.esx"]
+
+    # Re-adding a changed project refreshes its cached entry
+    updated = sample_projects[2].model_copy(update={"project_name": "Renamed"})
+    temp_index.add(updated)
+    assert json.loads(temp_index.list_all_json())[0]["project_name"] == "Renamed"
+
+    temp_index.remove(updated.project_id)
+    assert len(json.loads(temp_index.list_all_json())) == 2
+
+
+def test_list_all_json_racing_add(temp_index, sample_projects):
+    """Test an add() between listing and caching an entry doesn't leave stale JSON."""
+    from app.services import index as index_module
+
+    project = sample_projects[0]
+    temp_index.add(project)
+    updated = project.model_copy(update={"project_name": "Renamed"})
+    encode = index_module._encode_list_item
+
+    def encode_then_add(metadata):
+        item = encode(metadata)
+        if metadata is project:
+            temp_index.add(updated)  # e.g. a worker thread touching last_accessed
+        return item
+
+    with patch.object(index_module, "_encode_list_item", side_effect=encode_then_add):
+        assert json.loads(temp_index.list_all_json())[0]["project_name"] == project.project_name
+
+    assert json.loads(temp_index.list_all_json())[0]["project_name"] == "Renamed"
+
+
+def test_encode_list_item_matches_pydantic(sample_projects):
+    """Test the specialized list item encoder emits the same bytes as pydantic."""
+    from app.services.index import _encode_list_item, _to_list_item
+
+    projects = sample_projects + [
+        ProjectMetadata(
+            filename='Офис "North"\\wing\n.esx',
+            file_size=1,
+            original_file="projects/4/original.esx",
+            upload_date=datetime(2025, 1, 4, 8, 30, 15, 250),
+            processing_status=ProcessingStatus.FAILED,
+        )
+    ]
+    for project in projects:
+        assert _encode_list_item(project) == _to_list_item(project).model_dump_json().encode()
+
+
 def test_search(temp_index, sample_projects):
     """Test searching projects."""
     # Add all projects
@@ -187,6 +246,27 @@ def test_search_case_insensitive(temp_index, sample_projects):
     assert results[0].project_name == "Office Network"
 
 
+def test_search_follows_renames(temp_index, sample_projects):
+    """Test the trigram search index follows renames and removals, and short queries."""
+    for project in sample_projects:
+        temp_index.add(project)
+
+    office = sample_projects[2]
+    office.project_name = "Warehouse Network"
+    temp_index.add(office)
+
+    assert temp_index.search("office net") == []
+    assert [p.filename for p in temp_index.search("office")] == ["office.esx"]  # Filename
+    assert [p.filename for p in temp_index.search("house")] == ["office.esx"]
+    assert [p.filename for p in temp_index.search("ject ")] == ["project2.esx", "project1.esx"]
+    assert len(temp_index.search("2")) == 1
+    assert len(temp_index.search("")) == 3
+
+    temp_index.remove(office.project_id)
+    assert temp_index.search("house") == []
+    assert "war" not in temp_index._postings
+
+
 def test_count(temp_index, sample_projects):
     """Test counting projects."""
     # Add all projects
@@ -254,6 +334,37 @@ def test_update_project(temp_index, sample_projects):
     assert retrieved.aps_count == 15
 
 
+def test_listings_follow_in_place_updates(temp_index, sample_projects):
+    """Test status, date and removal changes keep listings ordered and counts right."""
+    for project in sample_projects:
+        temp_index.add(project)
+
+    # Mutated in place, as the API routes do, then re-added
+    pending = sample_projects[1]
+    pending.processing_status = ProcessingStatus.COMPLETED
+    pending.upload_date = datetime(2025, 1, 4, tzinfo=UTC)
+    temp_index.add(pending)
+
+    assert temp_index.count(status=ProcessingStatus.PENDING) == 0
+    assert temp_index.count(status=ProcessingStatus.COMPLETED) == 3
+    completed = temp_index.list_all(status=ProcessingStatus.COMPLETED, limit=2)
+    assert [p.filename for p in completed] == ["project2.esx", "office.esx"]
+
+    temp_index.remove(sample_projects[2].project_id)
+    assert [p.filename for p in temp_index.list_all()] == ["project2.esx", "project1.esx"]
+    assert [p.filename for p in temp_index.search("project")] == [
+        "project2.esx",
+        "project1.esx",
+    ]
+
+    temp_index.save_to_disk()
+    loaded = IndexService()
+    loaded.index_file = temp_index.index_file
+    loaded.load_from_disk()
+    assert loaded.list_all_json() == temp_index.list_all_json()
+    assert loaded.count(status=ProcessingStatus.COMPLETED) == 2
+
+
 def test_remove_with_short_link(temp_index, sample_projects):
     """Test removing project with short link."""
     project = sample_projects[2]  # Has short_link
@@ -267,3 +378,131 @@ def test_remove_with_short_link(temp_index, sample_projects):
 
     # Verify short link also removed
     assert temp_index.get_by_short_link("abc123") is None
+
+
+def test_load_legacy_json_index(temp_index, sample_projects):
+    """Test a legacy single-document JSON index is loaded and migrated on save."""
+    data = {"projects": [p.model_dump(mode="json") for p in sample_projects]}
+    temp_index.index_file.write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+    temp_index.load_from_disk()
+    assert temp_index.count() == 3
+    assert temp_index.get_by_short_link("abc123") is not None
+
+    temp_index.save_to_disk()
+    assert not temp_index.index_file.read_bytes().startswith(b"{")
+
+    reloaded = IndexService()
+    reloaded.index_file = temp_index.index_file
+    reloaded.load_from_disk()
+    assert reloaded.count() == 3
+
+
+def test_save_appends_only_changed_projects(temp_index, sample_projects):
+    """Test saving after an update appends a frame instead of rewriting the file."""
+    for project in sample_projects:
+        temp_index.add(project)
+    temp_index.save_to_disk()
+    size_after_full_write = temp_index.index_file.stat().st_size
+
+    # Nothing changed - file untouched
+    temp_index.save_to_disk()
+    assert temp_index.index_file.stat().st_size == size_after_full_write
+
+    project = sample_projects[0]
+    project.aps_count = 42
+    temp_index.add(project)
+    temp_index.save_to_disk()
+
+    assert temp_index.index_file.stat().st_size > size_after_full_write
+
+    reloaded = IndexService()
+    reloaded.index_file = temp_index.index_file
+    reloaded.load_from_disk()
+    assert reloaded.count() == 3
+    assert reloaded.get(project.project_id).aps_count == 42
+
+
+def test_remove_rewrites_index(temp_index, sample_projects):
+    """Test removed projects do not reappear after reload."""
+    for project in sample_projects:
+        temp_index.add(project)
+    temp_index.save_to_disk()
+
+    temp_index.remove(sample_projects[1].project_id)
+    temp_index.save_to_disk()
+
+    reloaded = IndexService()
+    reloaded.index_file = temp_index.index_file
+    reloaded.load_from_disk()
+    assert reloaded.count() == 2
+    assert reloaded.get(sample_projects[1].project_id) is None
+
+
+def test_failed_save_retried_as_rewrite(temp_index, sample_projects):
+    """Test a save that fails keeps its changes for the next save, as a full rewrite."""
+    from unittest.mock import patch
+
+    temp_index.add(sample_projects[0])
+    temp_index.save_to_disk()
+    temp_index.add(sample_projects[1])
+
+    with patch("app.services.index._encode_frame", side_effect=OSError("disk full")):
+        with pytest.raises(OSError):
+            temp_index.save_to_disk()
+    assert temp_index._needs_rewrite
+    assert sample_projects[1].project_id in temp_index._dirty
+
+    temp_index.save_to_disk()
+    reloaded = IndexService()
+    reloaded.index_file = temp_index.index_file
+    reloaded.load_from_disk()
+    assert reloaded.count() == 2
+    assert not temp_index.index_file.with_suffix(".json.tmp").exists()
+
+
+def test_load_ignores_truncated_trailing_frame(temp_index, sample_projects):
+    """Test a partially written trailing frame is skipped on load."""
+    for project in sample_projects:
+        temp_index.add(project)
+    temp_index.save_to_disk()
+
+    with open(temp_index.index_file, "ab") as f:
+        f.write(b'\x00\x00\x10\x00{"project_id"')
+
+    reloaded = IndexService()
+    reloaded.index_file = temp_index.index_file
+    reloaded.load_from_disk()
+    assert reloaded.count() == 3
+
+
+@pytest.mark.asyncio
+async def test_async_save_and_load(temp_index, sample_projects):
+    """Test the thread-offloaded save/load variants round-trip the index."""
+    for project in sample_projects:
+        temp_index.add(project)
+    await temp_index.save_to_disk_async()
+
+    new_index = IndexService()
+    new_index.index_file = temp_index.index_file
+    await new_index.load_from_disk_async()
+
+    assert new_index.count() == 3
+
+
+def test_load_restores_gc_state(temp_index, sample_projects):
+    """Test the garbage collector is re-enabled after loading, even on errors."""
+    import gc
+
+    for project in sample_projects:
+        temp_index.add(project)
+    temp_index.save_to_disk()
+
+    assert gc.isenabled()
+    temp_index.load_from_disk()
+    assert gc.isenabled()
+
+    temp_index.index_file.write_bytes(b"{not json")
+    with pytest.raises(ValueError):
+        temp_index.load_from_disk()
+    assert gc.isenabled()
@@ -141,6 +141,25 @@ class TestEmailTemplates:
         assert "7" in html  # projects_succeeded
         assert "3" in html  # projects_failed
 
+    def test_template_and_subject_by_status(self, notification_service):
+        """Test status lookups, their fallbacks, and that templates compile once."""
+        service = notification_service
+        assert service._get_email_template(ScheduleStatus.FAILED) == "schedule_failed.html"
+        assert service._get_email_template(ScheduleStatus.RUNNING) == "schedule_completed.html"
+        assert service._get_email_subject("Nightly", ScheduleStatus.PARTIAL) == (
+            "⚠️ Schedule 'Nightly' completed with errors"
+        )
+        assert service._get_email_subject("Nightly", ScheduleStatus.RUNNING) == (
+            "Schedule 'Nightly' executed"
+        )
+
+        with patch.object(
+            service.jinja_env, "get_template", wraps=service.jinja_env.get_template
+        ) as get_template:
+            first = service._get_template("schedule_failed.html")
+            assert service._get_template("schedule_failed.html") is first
+        assert get_template.call_count == 1
+
 
 class TestEmailContextBuilder:
     """Tests for email context building."""
@@ -314,6 +333,25 @@ class TestWebhookSending:
 
         assert success is False
 
+    @pytest.mark.asyncio
+    @patch("httpx.AsyncClient.post")
+    async def test_client_reused_until_closed(self, mock_post, notification_service):
+        """Test notifications share one HTTP client, recreated after aclose()."""
+        mock_post.return_value = MagicMock(status_code=200)
+
+        await notification_service.send_webhook("https://example.com/a", {"n": 1})
+        client = notification_service._http
+        await notification_service.send_slack("https://hooks.slack.com/b", "hi")
+
+        assert notification_service._http is client
+        assert mock_post.call_count == 2
+
+        await notification_service.aclose()
+        assert client.is_closed
+        await notification_service.send_webhook("https://example.com/a", {"n": 2})
+        assert notification_service._http is not client
+        await notification_service.aclose()
+
 
 class TestSlackSending:
     """Tests for Slack webhook sending."""
@@ -374,6 +412,20 @@ class TestSlackSending:
         assert success is False
 
 
+class TestSlackFormatting:
+    """Tests for Slack message formatting."""
+
+    def test_status_emoji(
+        self, notification_service, sample_schedule_run_failed, sample_schedule_run_success
+    ):
+        """Test message and header carry the run status emoji."""
+        message = notification_service._format_slack_message("Nightly", sample_schedule_run_failed)
+        blocks = notification_service._format_slack_blocks("Nightly", sample_schedule_run_success)
+
+        assert message.startswith("❌ Schedule 'Nightly' failed")
+        assert blocks[0]["text"]["text"] == "✅ Schedule Execution: Nightly"
+
+
 class TestScheduleNotifications:
     """Tests for complete schedule notification flow."""
 
@@ -488,3 +540,40 @@ class TestScheduleNotifications:
             assert mock_email.called
             assert mock_webhook.called
             assert mock_slack.called
+
+    @pytest.mark.asyncio
+    async def test_channels_sent_concurrently(
+        self, notification_service, sample_schedule, sample_schedule_run_success
+    ):
+        """Test channels go out together, and one raising does not stop the others."""
+        import asyncio
+
+        sample_schedule.notification_config = NotificationConfig(
+            email=["test@example.com"],
+            webhook_url="https://example.com/webhook",
+            slack_webhook="https://hooks.slack.com/services/test",
+            notify_on_success=True,
+        )
+        webhook_started = asyncio.Event()
+
+        async def slow_email(**kwargs):
+            await webhook_started.wait()  # Deadlocks if channels are sent one by one
+            raise RuntimeError("SMTP down")
+
+        async def webhook(url, payload):
+            webhook_started.set()
+            return True
+
+        with (
+            patch.object(notification_service, "send_email", side_effect=slow_email),
+            patch.object(notification_service, "send_webhook", side_effect=webhook),
+            patch.object(notification_service, "send_slack", return_value=True) as mock_slack,
+        ):
+            await asyncio.wait_for(
+                notification_service.notify_schedule_completed(
+                    sample_schedule, sample_schedule_run_success
+                ),
+                timeout=5,
+            )
+
+            assert mock_slack.called
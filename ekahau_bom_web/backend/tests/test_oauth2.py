@@ -151,6 +151,25 @@ class TestStateGeneration:
         assert len(set(states)) == 10  # All unique
 
 
+class TestLazyImport:
+    """Test the OAuth2 provider is exposed lazily from app.auth."""
+
+    def test_package_attribute_resolves_provider(self):
+        """Test app.auth.OAuth2AuthProvider resolves to the oauth2 module class."""
+        import app.auth
+        from app.auth.oauth2 import generate_state
+
+        assert app.auth.OAuth2AuthProvider is OAuth2AuthProvider
+        assert app.auth.generate_state is generate_state
+
+    def test_unknown_attribute_raises(self):
+        """Test unknown package attributes still raise AttributeError."""
+        import app.auth
+
+        with pytest.raises(AttributeError):
+            app.auth.DoesNotExist
+
+
 class TestTokenValidation:
     """Test token validation."""
 
@@ -173,3 +192,114 @@ class TestTokenValidation:
         headers = {"Authorization": "Bearer invalid_token"}
         response = client.delete("/api/projects/some-uuid", headers=headers)
         assert response.status_code == 401
+
+
+class TestJWKSRevalidation:
+    """Test conditional JWKS refresh via ETag."""
+
+    @staticmethod
+    def _mock_client(response):
+        client = MagicMock()
+        client.get = AsyncMock(return_value=response)
+        client.__aenter__ = AsyncMock(return_value=client)
+        client.__aexit__ = AsyncMock(return_value=False)
+        return client
+
+    @pytest.mark.asyncio
+    async def test_refresh_sends_etag_and_keeps_keys_on_304(self):
+        """Test refresh revalidates with If-None-Match and reuses cached keys on 304."""
+        provider = OAuth2AuthProvider(issuer="https://idp.example.com")
+        provider._oidc_config = {"jwks_uri": "https://idp.example.com/jwks"}
+
+        first = MagicMock(status_code=200, headers={"etag": '"v1"'})
+        first.json.return_value = {"keys": [{"kid": "a"}]}
+        with patch("app.auth.oauth2.httpx.AsyncClient", return_value=self._mock_client(first)):
+            jwks = await provider._get_jwks()
+        assert jwks == {"keys": [{"kid": "a"}]}
+        assert provider._jwks_etag == '"v1"'
+
+        not_modified = MagicMock(status_code=304, headers={})
+        client = self._mock_client(not_modified)
+        with patch("app.auth.oauth2.httpx.AsyncClient", return_value=client):
+            jwks = await provider._get_jwks(refresh=True)
+
+        client.get.assert_awaited_once_with(
+            "https://idp.example.com/jwks", headers={"If-None-Match": '"v1"'}
+        )
+        not_modified.json.assert_not_called()
+        assert jwks == {"keys": [{"kid": "a"}]}
+
+    @pytest.mark.asyncio
+    async def test_cached_jwks_not_refetched(self):
+        """Test cached JWKS is returned without a request unless refresh is requested."""
+        provider = OAuth2AuthProvider(issuer="https://idp.example.com")
+        provider._jwks = {"keys": []}
+
+        with patch("app.auth.oauth2.httpx.AsyncClient") as client_cls:
+            assert await provider._get_jwks() == {"keys": []}
+        client_cls.assert_not_called()
+
+
+class TestJWKSRefreshLimit:
+    """Test forced JWKS refreshes are limited."""
+
+    @staticmethod
+    def _rs256_token(kid):
+        from cryptography.hazmat.primitives.asymmetric import rsa
+        import jwt
+
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        return jwt.encode({"sub": "alice"}, key, algorithm="RS256", headers={"kid": kid})
+
+    @pytest.mark.asyncio
+    async def test_tokens_without_kid_skip_jwks(self):
+        """Test internal HS256 tokens and tokens without a kid never reach the IdP."""
+        import jwt
+
+        provider = OAuth2AuthProvider(issuer="https://idp.example.com")
+        provider._get_jwks = AsyncMock(return_value={"keys": []})
+
+        hs256 = jwt.encode({"sub": "alice"}, "other-secret-" + "x" * 32, algorithm="HS256")
+        spoofed = jwt.encode(
+            {"sub": "alice"}, "other-secret-" + "x" * 32, algorithm="HS256", headers={"kid": "k1"}
+        )
+        assert await provider._validate_idp_token(hs256) is None
+        assert await provider._validate_idp_token(spoofed) is None
+        provider._get_jwks.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_unknown_kids_share_one_refresh(self):
+        """Test concurrent and repeated kid misses refresh the key set once per interval."""
+        import asyncio
+
+        provider = OAuth2AuthProvider(issuer="https://idp.example.com")
+        provider._get_jwks = AsyncMock(return_value={"keys": []})
+        tokens = [self._rs256_token(f"random-{i}") for i in range(3)]
+
+        results = await asyncio.gather(*(provider._validate_idp_token(t) for t in tokens))
+        assert results == [None, None, None]
+        assert await provider._validate_idp_token(self._rs256_token("another")) is None
+
+        refreshes = [c for c in provider._get_jwks.await_args_list if c.kwargs.get("refresh")]
+        assert len(refreshes) == 1
+
+        provider._jwks_refreshed_at -= 61
+        await provider._validate_idp_token(tokens[0])
+        refreshes = [c for c in provider._get_jwks.await_args_list if c.kwargs.get("refresh")]
+        assert len(refreshes) == 2
+
+    @pytest.mark.asyncio
+    async def test_idp_outage_not_negatively_cached(self):
+        """Test a JWKS fetch failure rejects the request without remembering the token."""
+        import httpx
+
+        provider = OAuth2AuthProvider(issuer="https://idp.example.com")
+        provider._get_jwks = AsyncMock(side_effect=httpx.ConnectTimeout("timed out"))
+        token = self._rs256_token("k1")
+
+        assert await provider.validate_token(token) is None
+        assert token not in provider._invalid_tokens
+
+        provider._get_jwks = AsyncMock(return_value={"keys": []})
+        assert await provider.validate_token(token) is None
+        assert token in provider._invalid_tokens  # Unknown kid: a real rejection
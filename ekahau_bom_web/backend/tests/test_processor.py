@@ -250,6 +250,39 @@ async def test_extract_project_metadata_no_files(processor, sample_metadata, tem
     assert sample_metadata.floors_count is None
 
 
+@pytest.mark.asyncio
+async def test_extract_report_summary_interns_names(processor, sample_metadata, tmp_path):
+    """Test vendor/floor names are stored as tuples sharing pooled strings."""
+    import json
+
+    reports_dir = tmp_path / "reports"
+    reports_dir.mkdir()
+    (reports_dir / "site_data.json").write_text(
+        json.dumps(
+            {
+                "summary": {"unique_vendors": 2},
+                "access_points": {"bill_of_materials": [{"vendor": "Cisco"}, {"vendor": "Aruba"}]},
+                "floors": [{"name": "Floor 1"}],
+            }
+        )
+    )
+
+    await processor._extract_report_summary(
+        sample_metadata.project_id, reports_dir, sample_metadata
+    )
+
+    assert sample_metadata.vendors == ("Aruba", "Cisco")
+    assert sample_metadata.floors == ("Floor 1",)
+
+    other = ProjectMetadata(
+        filename="other.esx",
+        file_size=1,
+        original_file="projects/other/original.esx",
+        vendors=["".join(["Cis", "co"])],
+    )
+    assert other.vendors[0] is sample_metadata.vendors[1]
+
+
 @pytest.mark.asyncio
 async def test_cancel_processing(processor, sample_metadata, temp_storage):
     """Test cancelling processing."""
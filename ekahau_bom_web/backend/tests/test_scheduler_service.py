@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 import json
+import os
 from datetime import UTC, datetime
 from pathlib import Path
+from unittest.mock import patch
 from uuid import UUID, uuid4
 
 import pytest
@@ -222,6 +224,115 @@ class TestSchedulerServiceRetrieval:
         assert cron_schedules[0].trigger_type == TriggerType.CRON
 
 
+class TestNextRunTime:
+    """Tests for next_run_time bookkeeping."""
+
+    @pytest.mark.asyncio
+    async def test_list_uses_stored_next_run_time(
+        self, temp_scheduler_service, sample_schedule_create_request
+    ):
+        """Test listing reads next_run_time set when the job was scheduled."""
+        created = await temp_scheduler_service.create_schedule(sample_schedule_create_request)
+        job = temp_scheduler_service.scheduler.get_job(str(created.schedule_id))
+        assert created.next_run_time == job.next_run_time
+
+        with patch.object(temp_scheduler_service.scheduler, "get_job") as get_job:
+            items = await temp_scheduler_service.list_schedules()
+        get_job.assert_not_called()
+        assert items[0].next_run_time == job.next_run_time
+
+    @pytest.mark.asyncio
+    async def test_update_cron_refreshes_next_run_time(
+        self, temp_scheduler_service, sample_schedule_create_request
+    ):
+        """Test changing the cron expression recomputes next_run_time."""
+        created = await temp_scheduler_service.create_schedule(sample_schedule_create_request)
+
+        updated = await temp_scheduler_service.update_schedule(
+            created.schedule_id, ScheduleUpdateRequest(cron_expression="30 4 * * *")
+        )
+
+        assert (updated.next_run_time.hour, updated.next_run_time.minute) == (4, 30)
+
+
+class TestDirectoryWatch:
+    """Tests for event-driven directory triggers."""
+
+    @pytest.mark.asyncio
+    async def test_new_file_queues_debounced_run(self, temp_scheduler_service, tmp_path):
+        """Test a new matching file queues a one-off run and removal stops watching."""
+        import asyncio
+
+        watched = tmp_path / "incoming"
+        watched.mkdir()
+        created = await temp_scheduler_service.create_schedule(
+            ScheduleCreateRequest(
+                name="Watched",
+                cron_expression="0 2 * * *",
+                trigger_type=TriggerType.DIRECTORY,
+                trigger_config=TriggerConfig(directory=str(watched)),
+            )
+        )
+        assert created.schedule_id in temp_scheduler_service._watches
+
+        (watched / "ignored.txt").write_bytes(b"")
+        (watched / "site.esx").write_bytes(b"")
+
+        watch_job_id = f"{created.schedule_id}:watch"
+        for _ in range(50):
+            if temp_scheduler_service.scheduler.get_job(watch_job_id):
+                break
+            await asyncio.sleep(0.05)
+        assert temp_scheduler_service.scheduler.get_job(watch_job_id) is not None
+
+        await temp_scheduler_service.delete_schedule(created.schedule_id)
+        assert created.schedule_id not in temp_scheduler_service._watches
+        assert temp_scheduler_service.scheduler.get_job(watch_job_id) is None
+
+
+class TestS3Trigger:
+    """Tests for S3 trigger listing."""
+
+    def test_list_s3_keys(self):
+        """Test listing paginates, normalizes the prefix and applies the pattern."""
+        boto3 = pytest.importorskip("boto3")
+        moto = pytest.importorskip("moto")
+
+        from app.services import scheduler_service as scheduler_module
+        from app.services.scheduler_service import _list_s3_keys
+
+        with moto.mock_aws():
+            client = boto3.client("s3", region_name="us-east-1")
+            client.create_bucket(Bucket="surveys")
+            for key in [
+                "incoming/a.esx",
+                "incoming/notes.txt",
+                "incoming/site2/b.esx",
+                "incoming/site2/deep/d.esx",
+                "incoming/site3/e.esx",
+                "incoming-old/c.esx",
+            ]:
+                client.put_object(Bucket="surveys", Key=key, Body=b"")
+
+            pattern = TriggerConfig().pattern_regex
+            assert _list_s3_keys(client, "surveys", "incoming", pattern, recursive=True) == [
+                "incoming/a.esx",
+                "incoming/site2/b.esx",
+                "incoming/site2/deep/d.esx",
+                "incoming/site3/e.esx",
+            ]
+            assert _list_s3_keys(client, "surveys", "incoming/", pattern, recursive=False) == [
+                "incoming/a.esx"
+            ]
+
+            # Non-recursive listings only request the delimited top level
+            with patch.object(
+                scheduler_module, "_list_s3_page_keys", wraps=scheduler_module._list_s3_page_keys
+            ) as list_pages:
+                _list_s3_keys(client, "surveys", "incoming", pattern, recursive=False)
+            list_pages.assert_called_once_with(client, "surveys", "incoming/", delimiter="/")
+
+
 class TestSchedulerServiceUpdate:
     """Tests for schedule updates."""
 
@@ -318,6 +429,47 @@ class TestSchedulerServiceDeletion:
 
         assert success is False
 
+    def test_find_matching_files(self, tmp_path):
+        """Test directory scanning honours the pattern and recursive flag."""
+        from app.services.scheduler_service import _find_matching_files
+
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "a.esx").write_bytes(b"")
+        (tmp_path / "notes.txt").write_bytes(b"")
+        (tmp_path / "sub" / "b.esx").write_bytes(b"")
+        (tmp_path / "dir.esx").mkdir()
+
+        config = TriggerConfig(pattern="*.esx")
+        assert config.pattern_regex is TriggerConfig(pattern="*.esx").pattern_regex
+
+        found = _find_matching_files(tmp_path, config.pattern_regex, recursive=True)
+        assert found == [tmp_path / "a.esx", tmp_path / "sub" / "b.esx"]
+
+        found = _find_matching_files(tmp_path, config.pattern_regex, recursive=False)
+        assert found == [tmp_path / "a.esx"]
+
+    def test_find_matching_files_skips_unreadable_subdirectory(self, tmp_path):
+        """Test an unreadable subdirectory is skipped but an unreadable root raises."""
+        from app.services.scheduler_service import _find_matching_files
+
+        (tmp_path / "locked").mkdir()
+        (tmp_path / "locked" / "b.esx").write_bytes(b"")
+        (tmp_path / "a.esx").write_bytes(b"")
+        pattern = TriggerConfig(pattern="*.esx").pattern_regex
+        real_scandir = os.scandir
+
+        def scandir(path):
+            if os.path.basename(path) == "locked":
+                raise PermissionError(13, "Permission denied", path)
+            return real_scandir(path)
+
+        with patch("app.utils.scan.os.scandir", side_effect=scandir):
+            found = _find_matching_files(tmp_path, pattern, recursive=True)
+            assert found == [tmp_path / "a.esx"]
+
+            with pytest.raises(PermissionError):
+                _find_matching_files(tmp_path / "locked", pattern, recursive=True)
+
 
 class TestSchedulerServiceExecution:
     """Tests for schedule execution."""
@@ -341,6 +493,31 @@ class TestSchedulerServiceExecution:
         history = await temp_scheduler_service.get_schedule_history(created.schedule_id, limit=1)
         assert len(history) >= 0  # Execution may be async
 
+    @pytest.mark.asyncio
+    async def test_runs_of_one_schedule_are_serialized(self, temp_scheduler_service):
+        """Test a cron run and a directory-watch run of one schedule never overlap."""
+        import asyncio
+
+        schedule_id = uuid4()
+        active = []
+        overlaps = []
+
+        async def run_schedule(run_id):
+            if run_id in active:
+                overlaps.append(run_id)
+            active.append(run_id)
+            await asyncio.sleep(0.01)
+            active.remove(run_id)
+
+        with patch.object(temp_scheduler_service, "_run_schedule", side_effect=run_schedule):
+            await asyncio.gather(
+                temp_scheduler_service._execute_schedule(schedule_id),
+                temp_scheduler_service._execute_schedule(schedule_id),
+                temp_scheduler_service._execute_schedule(uuid4()),
+            )
+
+        assert overlaps == []
+
     @pytest.mark.asyncio
     async def test_execute_nonexistent_schedule(self, temp_scheduler_service):
         """Test executing non-existent schedule."""
@@ -495,3 +672,14 @@ class TestCronValidation:
             )
             with pytest.raises((ValueError, Exception)):
                 await temp_scheduler_service.create_schedule(request)
+
+    def test_parse_cron_is_cached(self):
+        """Test identical expressions share one parsed trigger."""
+        from app.services.scheduler_service import parse_cron
+
+        trigger = parse_cron("*/5 * * * *")
+        assert isinstance(trigger, CronTrigger)
+        assert parse_cron("*/5 * * * *") is trigger
+
+        with pytest.raises(ValueError, match="Invalid cron expression"):
+            parse_cron("61 * * * *")
@@ -9,6 +9,7 @@ import { retryWhen, tap, delayWhen, catchError } from 'rxjs/operators';
 export type WebSocketMessageType =
   | 'batch_update'
   | 'project_update'
+  | 'batch_progress'
   | 'batch_created'
   | 'batch_deleted'
   | 'connection_established'
@@ -42,6 +43,14 @@ export interface ProjectUpdateData {
   message?: string;
 }
 
+/**
+ * Batch progress data: a project update and, when it moved, the batch progress
+ */
+export interface BatchProgressData {
+  project: ProjectUpdateData;
+  batch: BatchUpdateData | null;
+}
+
 /**
  * Batch created data
  */
@@ -181,6 +190,16 @@ export class WebSocketService {
             console.log('[WebSocket] Connection established, client ID:', this.clientId);
           }
 
+          // Split combined progress messages into their project and batch updates
+          if (message.type === 'batch_progress') {
+            const data = message.data as BatchProgressData;
+            this.messagesSubject$.next({ type: 'project_update', data: data.project });
+            if (data.batch) {
+              this.messagesSubject$.next({ type: 'batch_update', data: data.batch });
+            }
+            return;
+          }
+
           // Forward all messages to subject
           this.messagesSubject$.next(message);
         }),